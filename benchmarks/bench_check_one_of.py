@@ -0,0 +1,48 @@
+"""Compare the precompiled `check_one_of` with the generic implementation
+
+run: python -m benchmarks.bench_check_one_of
+"""
+import timeit
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel, create_model, root_validator
+
+from protobuf_to_pydantic.customer_validator import check_one_of
+
+
+def generic_check_one_of(cls: Any, values: tuple) -> tuple:
+    """The implementation before the rules were precompiled"""
+    for one_of_name, one_of_dict in getattr(cls, "_one_of_dict", {}).items():
+        have_value_name = sum([1 for one_of_field_name in one_of_dict["fields"] if one_of_field_name in values])
+        if have_value_name >= 2:
+            raise ValueError(f"OneOf:{one_of_name} has {have_value_name} value")
+        if one_of_dict.get("required", False) and have_value_name == 0:
+            raise ValueError(f"OneOf:{one_of_name} must set value")
+    return values
+
+
+def gen_model(one_of_cnt: int, field_cnt: int, validator: Any) -> Type[BaseModel]:
+    field_dict: Dict[str, Any] = {}
+    one_of_dict: Dict[str, Any] = {}
+    for i in range(one_of_cnt):
+        fields = {f"o{i}_f{j}" for j in range(field_cnt)}
+        one_of_dict[f"demo.Demo.o{i}"] = {"fields": fields, "required": i % 2 == 0}
+        field_dict.update({name: (str, "") for name in fields})
+    model: Any = create_model(  # type: ignore
+        "Demo", __validators__={"_check_one_of": root_validator(pre=True, allow_reuse=True)(validator)}, **field_dict
+    )
+    setattr(model, "_one_of_dict", one_of_dict)
+    return model
+
+
+def main(one_of_cnt: int = 20, field_cnt: int = 5, number: int = 20000) -> None:
+    # The values of root validator are a dict (`check_one_of` annotates them as tuple)
+    values: Any = {f"o{i}_f0": "a" for i in range(one_of_cnt)}
+    for name, validator in (("generic check_one_of", generic_check_one_of), ("precompiled check_one_of", check_one_of)):
+        model = gen_model(one_of_cnt, field_cnt, validator)
+        cost = min(timeit.repeat(lambda: validator(model, values), number=number, repeat=3)) / number
+        print(f"{name:<32}{cost * 1000 * 1000:>10.3f} us/op")
+
+
+if __name__ == "__main__":
+    main()
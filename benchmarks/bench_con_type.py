@@ -0,0 +1,65 @@
+"""Compare the constrained types created with and without `get_con_type` when building the models of a large schema,
+each case is run in a new process so that the max RSS of the case can be measured
+
+run: python -m benchmarks.bench_con_type
+"""
+import gc
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from google.protobuf.descriptor_pb2 import FieldDescriptorProto, FileDescriptorSet
+from pydantic import ConstrainedStr
+
+from protobuf_to_pydantic import gen_model, pool_to_pydantic_models
+
+
+def gen_file_descriptor_set(message_cnt: int, field_cnt: int) -> FileDescriptorSet:
+    """Each string field has the same rule(like the id field of most messages)"""
+    file_descriptor_set: FileDescriptorSet = FileDescriptorSet()
+    fd = file_descriptor_set.file.add(name="bench_con_type.proto", package="bench_con_type", syntax="proto3")
+    for message_index in range(message_cnt):
+        message = fd.message_type.add(name=f"Message{message_index}")
+        for field_index in range(field_cnt):
+            message.field.add(name=f"id_{field_index}", number=field_index + 1, type=FieldDescriptorProto.TYPE_STRING)
+            location = fd.source_code_info.location.add(path=[4, message_index, 2, field_index])
+            location.leading_comments = ' p2p: {"type": "p2p@import|pydantic|constr", "max_length": 64}'
+    return file_descriptor_set
+
+
+def run_case(case: str, message_cnt: int, field_cnt: int) -> None:
+    if case == "con_func(**param)":
+        # The implementation before the constrained types were interned
+        setattr(gen_model, "get_con_type", lambda con_func, *args, **kwargs: con_func(*args, **kwargs))
+    file_descriptor_set: FileDescriptorSet = gen_file_descriptor_set(message_cnt, field_cnt)
+    start: float = time.perf_counter()
+    model_registry = pool_to_pydantic_models(file_descriptor_set, parse_msg_desc_method=file_descriptor_set)
+    cost: float = time.perf_counter() - start
+    gc.collect()
+    class_cnt: int = len(ConstrainedStr.__subclasses__())
+    # ru_maxrss is KB in linux
+    max_rss: float = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{case:<24}{len(model_registry)} models, {message_cnt * field_cnt} fields"
+        f"{cost:>10.3f} s{class_cnt:>10} classes{max_rss:>10.1f} MB max rss"
+    )
+
+
+def main(message_cnt: int = 200, field_cnt: int = 20) -> None:
+    env: dict = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([os.getcwd(), env.get("PYTHONPATH", "")])
+    for case in ("con_func(**param)", "get_con_type"):
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_con_type", case, str(message_cnt), str(field_cnt)],
+            env=env,
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_case(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,82 @@
+"""Compare the validators that parse the constraint once per field with the generic implementation
+
+run: python -m benchmarks.bench_customer_validator
+"""
+import timeit
+from datetime import datetime
+from typing import Any, Callable, List, Tuple
+
+from pydantic import BaseModel, Field
+from pydantic.fields import ModelField
+
+from protobuf_to_pydantic import customer_validator
+from protobuf_to_pydantic.customer_con_type import contimestamp
+
+
+def generic_get_name_value_from_kwargs(
+    key: str, field: ModelField, enable_timestamp_to_datetime: bool = False
+) -> Tuple[str, Any]:
+    """The implementation before the constraints were parsed once per field"""
+    field_name: str = field.name
+    if field.field_info.extra:
+        field_value: Any = field.field_info.extra.get(key, None)
+    else:
+        field_value = getattr(field.type_, key, None)
+    if enable_timestamp_to_datetime and not isinstance(field_value, datetime):
+        if isinstance(field_value, (list, tuple)):
+            field_value = [datetime.fromtimestamp(i) for i in field_value]
+        else:
+            field_value = datetime.fromtimestamp(field_value)
+    return field_name, field_value
+
+
+def generic_in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
+    field_name, field_value = generic_get_name_value_from_kwargs("in_", kwargs["field"])
+    if field_value is not None and v not in field_value:
+        raise ValueError(f"{field_name}:{v} not in {field_value}")
+    return v
+
+
+def generic_timestamp_in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
+    field_name, field_value = generic_get_name_value_from_kwargs(
+        "timestamp_in", kwargs["field"], enable_timestamp_to_datetime=isinstance(v, datetime)
+    )
+    if field_value is not None and v not in field_value:
+        raise ValueError(f"{field_name} not in {field_value}")
+    return v
+
+
+def main(in_cnt: int = 20, number: int = 200000) -> None:
+    in_list: List[int] = list(range(in_cnt))
+    timestamp_list: List[int] = [1600000000 + i for i in range(in_cnt)]
+
+    class Demo(BaseModel):
+        a: int = Field(in_=in_list)
+        b: contimestamp(timestamp_in=timestamp_list)  # type: ignore
+
+    a_field: ModelField = Demo.__fields__["a"]
+    b_field: ModelField = Demo.__fields__["b"]
+    a_value: int = in_list[-1]
+    b_value: datetime = datetime.fromtimestamp(timestamp_list[-1])
+    # The validator that pydantic gets from `ConstrainedTimestamp.__get_validators__` when the model is built
+    bound_timestamp_in_validator: Callable = b_field.validators[-1]
+
+    case_list: List[Tuple[str, Callable[[], Any]]] = [
+        ("generic in_validator", lambda: generic_in_validator(None, a_value, field=a_field)),
+        ("in_validator", lambda: customer_validator.in_validator(None, a_value, field=a_field)),
+        (
+            "generic timestamp_in_validator",
+            lambda: generic_timestamp_in_validator(None, b_value, field=b_field),
+        ),
+        (
+            "bound timestamp_in_validator",
+            lambda: bound_timestamp_in_validator(None, b_value, {}, b_field, Demo.__config__),
+        ),
+    ]
+    for name, case in case_list:
+        cost = min(timeit.repeat(case, number=number, repeat=3)) / number
+        print(f"{name:<36}{cost * 1000 * 1000:>10.3f} us/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Compare `DescTemplate.handle_template_var` with the cached template values and without cache
+
+run: python -m benchmarks.bench_desc_template
+"""
+import timeit
+from typing import Any, Dict, FrozenSet, List
+
+from protobuf_to_pydantic.gen_model import DescTemplate, clear_template_cache
+
+
+class NoCacheDescTemplate(DescTemplate):
+    cache_template_set: FrozenSet[str] = frozenset()
+
+
+def gen_field_doc_dict_list(field_cnt: int) -> List[Dict[str, Any]]:
+    """Half of the fields use the template (like the rules of p2p_validate), and the other half are plain rules"""
+    field_doc_dict_list: List[Dict[str, Any]] = []
+    for index in range(field_cnt):
+        if index % 2:
+            field_doc_dict_list.append({"max_length": 64, "extra": {"customer_string": "c1"}, "example": "a"})
+        else:
+            field_doc_dict_list.append(
+                {
+                    "default": "p2p@import_instance|google.protobuf.any_pb2|Any"
+                    '|{"type_url": "type.googleapis.com/google.protobuf.Duration"}',
+                    "type": "p2p@import|pydantic|constr",
+                    "default_factory": "p2p@builtin|list",
+                }
+            )
+    return field_doc_dict_list
+
+
+def main(field_cnt: int = 1000, number: int = 10) -> None:
+    field_doc_dict_list = gen_field_doc_dict_list(field_cnt)
+    for name, desc_template_class in (("no cache", NoCacheDescTemplate), ("cache", DescTemplate)):
+        clear_template_cache()
+        desc_template = desc_template_class({}, "p2p")
+        cost = min(
+            timeit.repeat(
+                lambda: [desc_template.handle_template_var(i) for i in field_doc_dict_list], number=number, repeat=3
+            )
+        )
+        print(f"{name:<16}{cost / number * 1000:>10.3f} ms/{field_cnt} fields")
+
+
+if __name__ == "__main__":
+    main()
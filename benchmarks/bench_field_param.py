@@ -0,0 +1,83 @@
+"""Compare the build time of the models of `example/example_proto` validate and p2p_validate schemas
+ with `gen_field_param_dict` and with `MessagePaitModel(**field_doc_dict).dict()`
+
+run: python -m benchmarks.bench_field_param
+"""
+import inspect
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from google.protobuf import __version__
+from google.protobuf.message import Message
+from pydantic import confloat, conint
+from pydantic.fields import FieldInfo
+
+from protobuf_to_pydantic import gen_model, msg_to_pydantic_model
+
+if __version__ > "4.0.0":
+    from example.proto.example.example_proto.p2p_validate import demo_pb2 as p2p_validate_pb2
+    from example.proto.example.example_proto.validate import demo_pb2 as validate_pb2
+else:
+    from example.proto_3_20.example.example_proto.p2p_validate import demo_pb2 as p2p_validate_pb2  # type: ignore
+    from example.proto_3_20.example.example_proto.validate import demo_pb2 as validate_pb2  # type: ignore
+
+
+class CustomerField(FieldInfo):
+    pass
+
+
+local_dict: Dict[str, Any] = {
+    "CustomerField": CustomerField,
+    "confloat": confloat,
+    "conint": conint,
+    "customer_any": lambda: None,
+}
+
+
+def get_message_list(module: Any) -> List[Any]:
+    return [i for i in module.__dict__.values() if inspect.isclass(i) and issubclass(i, Message) and i is not Message]
+
+
+def build_model() -> None:
+    for message in get_message_list(validate_pb2):
+        msg_to_pydantic_model(message, parse_msg_desc_method="PGV", use_cache=False)
+    for message in get_message_list(p2p_validate_pb2):
+        msg_to_pydantic_model(message, local_dict=local_dict, use_cache=False)
+
+
+def get_con_func_param_tuple(field_type: Any) -> Optional[Tuple[str, ...]]:
+    """The implementation before the param names of con func were cached"""
+    field_type_model: Any = inspect.getmodule(field_type)
+    if (
+        not inspect.isclass(field_type)
+        and field_type_model
+        and field_type_model.__name__ in ("pydantic.types", "protobuf_to_pydantic.customer_con_type")
+    ):
+        return tuple(inspect.signature(field_type).parameters.keys())
+    return None
+
+
+def main(number: int = 5) -> None:
+    raw_func_dict: Dict[str, Callable] = {
+        "gen_field_param_dict": gen_model.gen_field_param_dict,
+        "_get_con_func_param_tuple": gen_model._get_con_func_param_tuple,
+    }
+    case_dict: Dict[str, Dict[str, Callable]] = {
+        "MessagePaitModel(**param).dict()": {
+            "gen_field_param_dict": lambda field_doc_dict: gen_model.MessagePaitModel(**field_doc_dict).dict(),
+            "_get_con_func_param_tuple": get_con_func_param_tuple,
+        },
+        "gen_field_param_dict": raw_func_dict,
+    }
+    build_model()  # warm up, e.g. the options of field are cached
+    for name, func_dict in case_dict.items():
+        for func_name, func in func_dict.items():
+            setattr(gen_model, func_name, func)
+        cost = min(timeit.repeat(build_model, number=number, repeat=3)) / number
+        print(f"{name:<36}{cost * 1000:>10.3f} ms/build")
+    for func_name, func in raw_func_dict.items():
+        setattr(gen_model, func_name, func)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Compare formatting many small contents with a new `Formatter` per content and `format_content`(reuse the formatter)
+
+run: python -m benchmarks.bench_format
+"""
+import timeit
+
+from protobuf_to_pydantic.util import Formatter, format_content
+
+content: str = """
+import typing
+from pydantic import BaseModel, Field
+class Demo(BaseModel):
+    a: typing.List[int] = Field(default_factory=list)
+    b: str = Field(default="")
+"""
+
+
+def main(content_cnt: int = 100) -> None:
+    content_list = [content] * content_cnt
+    case_dict = {
+        "new Formatter per content": lambda: [Formatter().format(i) for i in content_list],
+        "format_content": lambda: [format_content(i) for i in content_list],
+    }
+    for name, fn in case_dict.items():
+        cost = min(timeit.repeat(fn, number=3, repeat=3)) / 3
+        print(f"{name:<32}{cost * 1000:>10.3f} ms/{content_cnt} contents")
+
+
+if __name__ == "__main__":
+    main()
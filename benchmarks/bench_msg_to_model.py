@@ -0,0 +1,66 @@
+"""Compare `Model.from_protobuf(message)` with `Model(**MessageToDict(message))`,
+`model.to_protobuf()` with `ParseDict(model.dict(), Message())`
+and `convert_many(messages, Model)` with converting each message by `MessageToDict`
+
+run: python -m benchmarks.bench_msg_to_model
+"""
+import timeit
+from typing import Any
+
+from google.protobuf import __version__
+from google.protobuf.json_format import MessageToDict, ParseDict
+
+from protobuf_to_pydantic import msg_to_pydantic_model
+from protobuf_to_pydantic.convert import convert_many
+
+if __version__ > "4.0.0":
+    from example.proto.example.example_proto.demo import demo_pb2
+else:
+    from example.proto_3_20.example.example_proto.demo import demo_pb2  # type: ignore[no-redef]
+
+
+def gen_repeated_message(user_cnt: int) -> Any:
+    """Each UserMessage has 9 fields (include nested message), 1200 users are about 10k fields"""
+    message = demo_pb2.RepeatedMessage(str_list=[str(i) for i in range(user_cnt)], int_list=list(range(user_cnt)))
+    for i in range(user_cnt):
+        message.user_list.add(
+            uid=str(i),
+            age=i,
+            height=1.0,
+            sex=i % 2,
+            is_adult=True,
+            user_name="so1n",
+            demo_message={"earth": "earth", "mercury": "mercury", "mars": "mars"},
+        )
+    return message
+
+
+def main(user_cnt: int = 1200, number: int = 20) -> None:
+    model: Any = msg_to_pydantic_model(demo_pb2.RepeatedMessage, parse_msg_desc_method="ignore")
+    message = gen_repeated_message(user_cnt)
+    instance = model.from_protobuf(message)
+    user_model: Any = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore")
+    case_dict = {
+        "MessageToDict + Model(**dict)": lambda: model(
+            **MessageToDict(message, preserving_proto_field_name=True, use_integers_for_enums=True)
+        ),
+        "Model.from_protobuf(message)": lambda: model.from_protobuf(message),
+        "Model.from_protobuf(message, validate=False)": lambda: model.from_protobuf(message, validate=False),
+        "ParseDict(model.dict(), Message())": lambda: ParseDict(instance.dict(), demo_pb2.RepeatedMessage()),
+        "model.to_protobuf()": lambda: instance.to_protobuf(),
+        "[Model(**MessageToDict(i)) for i in messages]": lambda: [
+            user_model(**MessageToDict(i, preserving_proto_field_name=True, use_integers_for_enums=True))
+            for i in message.user_list
+        ],
+        "list(convert_many(messages, Model))": lambda: list(convert_many(message.user_list, user_model)),
+        "list(convert_many(..., validate=False))": lambda: list(
+            convert_many(message.user_list, user_model, validate=False)
+        ),
+    }
+    for name, fn in case_dict.items():
+        cost = min(timeit.repeat(fn, number=number, repeat=3)) / number
+        print(f"{name:<48}{cost * 1000:>10.3f} ms/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Time the protoc plugin's `CodeGen` in process over the `example/example_proto` tree
+(the protos of plugin can not be imported together with the protos of example, so this module does not import example)
+
+run: python -m benchmarks.bench_plugin_code_gen
+     python -m benchmarks.bench_plugin_code_gen example <number>  # only print the cost(second) of each run
+     python -m benchmarks.bench_plugin_code_gen - <number> < request.bin  # same as above, but the request is from stdin
+"""
+import contextlib
+import io
+import pathlib
+import subprocess
+import sys
+import tempfile
+import timeit
+from typing import List
+
+from google.protobuf.compiler.plugin_pb2 import CodeGeneratorRequest, CodeGeneratorResponse
+from google.protobuf.descriptor_pb2 import FileDescriptorSet
+from mypy_protobuf.main import Descriptors
+
+from protobuf_to_pydantic.plugin.code_gen import CodeGen
+from protobuf_to_pydantic.plugin.config import ConfigModel
+
+project_path: pathlib.Path = pathlib.Path(__file__).absolute().parent.parent
+example_proto_path: pathlib.Path = project_path / "example" / "example_proto"
+
+
+def gen_example_request(parameter: str = "config_path=example/plugin_config.py") -> CodeGeneratorRequest:
+    """Generate the request of all protos of `example/example_proto` by protoc, like the plugin is called by protoc"""
+    file_name_list: List[str] = sorted(
+        str(path.relative_to(project_path).as_posix()) for path in example_proto_path.glob("**/*.proto")
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        descriptor_set_path: str = str(pathlib.Path(tmp_dir) / "example.desc")
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "grpc_tools.protoc",
+                "-I.",
+                f"--descriptor_set_out={descriptor_set_path}",
+                "--include_imports",
+                "--include_source_info",
+                *file_name_list,
+            ],
+            cwd=str(project_path),
+            check=True,
+        )
+        with open(descriptor_set_path, "rb") as f:
+            file_descriptor_set: FileDescriptorSet = FileDescriptorSet.FromString(f.read())
+    return gen_request(file_descriptor_set, file_name_list, parameter=parameter)
+
+
+def gen_request(
+    file_descriptor_set: FileDescriptorSet, file_to_generate: List[str], parameter: str = ""
+) -> CodeGeneratorRequest:
+    """The files of FileDescriptorSet generated by protoc are sorted in the order of dependencies"""
+    request = CodeGeneratorRequest(parameter=parameter, file_to_generate=file_to_generate)
+    request.proto_file.extend(file_descriptor_set.file)
+    return request
+
+
+def run_code_gen(request: CodeGeneratorRequest) -> CodeGeneratorResponse:
+    response: CodeGeneratorResponse = CodeGeneratorResponse()
+    CodeGen(ConfigModel, request=request).generate_pydantic_model(Descriptors(request), response)
+    return response
+
+
+def bench_code_gen(request: CodeGeneratorRequest, number: int = 5) -> float:
+    """Return the cost(second) of each run, the first run is not counted because it imports the config module"""
+    # The plugin writes the log to stderr
+    with contextlib.redirect_stderr(io.StringIO()):
+        response: CodeGeneratorResponse = run_code_gen(request)
+        cost: float = min(timeit.repeat(lambda: run_code_gen(request), number=number, repeat=3)) / number
+    # The plugin only logs the exception, so check the result
+    if not response.file:
+        raise RuntimeError("The plugin failed to generate files")
+    return cost
+
+
+def main(number: int = 5) -> None:
+    request: CodeGeneratorRequest = gen_example_request()
+    cost: float = bench_code_gen(request, number=number)
+    print(f"{len(request.file_to_generate)} files of example_proto{cost * 1000:>10.3f} ms/run")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        if sys.argv[1] == "-":
+            _request: CodeGeneratorRequest = CodeGeneratorRequest.FromString(sys.stdin.buffer.read())
+        else:
+            _request = gen_example_request()
+        print(bench_code_gen(_request, number=int(sys.argv[2])))
+    else:
+        main()
@@ -0,0 +1,86 @@
+"""Compare the plugin generation time of different `workers` on the example protos scaled up to hundreds of files
+
+run: python -m benchmarks.bench_plugin_workers
+"""
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict
+
+from google.protobuf import __version__
+from google.protobuf.compiler.plugin_pb2 import CodeGeneratorRequest, CodeGeneratorResponse
+from google.protobuf.descriptor_pb2 import FileDescriptorProto
+
+if __version__ > "4.0.0":
+    from example.proto.example.example_proto.demo import demo_pb2
+else:
+    from example.proto_3_20.example.example_proto.demo import demo_pb2  # type: ignore[no-redef]
+
+
+def gen_scaled_request(file_descriptor: Any, file_cnt: int, parameter: str = "") -> CodeGeneratorRequest:
+    """Copy the proto file `file_cnt` times (with different file names and packages) into one request"""
+    fd_dict: Dict[str, FileDescriptorProto] = {}
+
+    def _add_file(_file_descriptor: Any) -> None:
+        if _file_descriptor.name in fd_dict:
+            return
+        for dependency in _file_descriptor.dependencies:
+            _add_file(dependency)
+        fd = FileDescriptorProto()
+        _file_descriptor.CopyToProto(fd)
+        fd_dict[fd.name] = fd
+
+    _add_file(file_descriptor)
+    request = CodeGeneratorRequest(parameter=parameter)
+    template_fd: FileDescriptorProto = fd_dict.pop(file_descriptor.name)
+    request.proto_file.extend(fd_dict.values())
+    for index in range(file_cnt):
+        fd = request.proto_file.add()
+        fd.CopyFrom(template_fd)
+        fd.name = f"scaled/demo_{index}.proto"
+        fd.package = f"scaled_{index}"
+        _replace_type_name_package(fd.message_type, f".{template_fd.package}.", f".{fd.package}.")
+        request.file_to_generate.append(fd.name)
+    return request
+
+
+def _replace_type_name_package(message_list: Any, old_prefix: str, new_prefix: str) -> None:
+    """Make the message reference the types in the new package"""
+    for message in message_list:
+        for field in message.field:
+            if field.type_name.startswith(old_prefix):
+                field.type_name = new_prefix + field.type_name[len(old_prefix) :]
+        _replace_type_name_package(message.nested_type, old_prefix, new_prefix)
+
+
+def run_plugin(request: CodeGeneratorRequest) -> float:
+    env: dict = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([os.getcwd(), env.get("PYTHONPATH", "")])
+    start: float = time.perf_counter()
+    output: bytes = subprocess.run(
+        [sys.executable, "-m", "protobuf_to_pydantic.plugin"],
+        input=request.SerializeToString(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        check=True,
+    ).stdout
+    cost: float = time.perf_counter() - start
+    response: CodeGeneratorResponse = CodeGeneratorResponse()
+    response.ParseFromString(output)
+    # The plugin only logs the exception, so check the result
+    if len(response.file) != len(request.file_to_generate):
+        raise RuntimeError("The plugin failed to generate files")
+    return cost
+
+
+def main(file_cnt: int = 300) -> None:
+    workers_set = {1, 2, os.cpu_count() or 1}
+    for workers in sorted(workers_set):
+        cost = run_plugin(gen_scaled_request(demo_pb2.DESCRIPTOR, file_cnt, parameter=f"workers={workers}"))
+        print(f"{file_cnt} files, workers={workers:<8}{cost:>10.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Compare parsing the protobuf file with a new lark parser per call and with the cached parser & parse result
+
+run: python -m benchmarks.bench_proto_parser
+"""
+import timeit
+
+from lark import Lark
+
+from protobuf_to_pydantic.contrib import proto_parser
+
+proto_file_name: str = "example/example_proto/demo/demo.proto"
+
+
+def main(file_cnt: int = 20) -> None:
+    with open(proto_file_name) as f:
+        data = f.read()
+
+    def _parse_by_new_parser() -> None:
+        for _ in range(file_cnt):
+            Lark(proto_parser.BNF, start="proto", parser="lalr").parse(data)
+
+    case_dict = {
+        "new lark parser per file": _parse_by_new_parser,
+        "parse (parser singleton)": lambda: [proto_parser.parse(data) for _ in range(file_cnt)],
+        "parse_from_file (cached)": lambda: [proto_parser.parse_from_file(proto_file_name) for _ in range(file_cnt)],
+    }
+    for name, fn in case_dict.items():
+        cost = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f"{name:<32}{cost * 1000:>10.3f} ms/{file_cnt} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Scan the large generated pyi files with different numbers of messages, the time should grow linearly
+and the peak memory(excluding the result) should not grow with the file size
+
+run: python -m benchmarks.bench_pyi_scanner
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from protobuf_to_pydantic.get_desc import from_pyi_file
+
+message_template: str = '''
+class UserMessage{index}(google.protobuf.message.Message):
+    """user info"""
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    UID_FIELD_NUMBER: builtins.int
+    AGE_FIELD_NUMBER: builtins.int
+    USER_NAME_FIELD_NUMBER: builtins.int
+    uid: builtins.str
+    """p2p: {{"miss_default": true, "example": "10086", "title": "UID", "description": "user union id"}}"""
+    age: builtins.int
+    """p2p: {{"example": 18, "title": "use age", "ge": 0}}"""
+    user_name: builtins.str
+    """user name
+    p2p: {{"description": "user name"}}
+    p2p: {{"default": "", "min_length": 1, "max_length": "10", "example": "so1n"}}
+    """
+    def __init__(
+        self,
+        *,
+        uid: builtins.str = ...,
+        age: builtins.int = ...,
+        user_name: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["age", b"age", "uid", b"uid"]) -> None: ...
+
+global___UserMessage{index} = UserMessage{index}
+'''
+
+
+def gen_pyi_file(file_path: str, message_cnt: int) -> None:
+    with open(file_path, "w") as f:
+        f.write("import builtins\nimport google.protobuf.descriptor\nimport google.protobuf.message\n")
+        for index in range(message_cnt):
+            f.write(message_template.format(index=index))
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for message_cnt in (2500, 5000, 10000, 20000):
+            file_path: str = os.path.join(tmp_dir, f"demo_{message_cnt}_pb2.pyi")
+            gen_pyi_file(file_path, message_cnt)
+            with open(file_path) as f:
+                start_time = time.perf_counter()
+                from_pyi_file._scan_pyi_line_iter(f, "p2p")
+                cost = time.perf_counter() - start_time
+
+            with open(file_path) as f:
+                tracemalloc.start()
+                result = from_pyi_file._scan_pyi_line_iter(f, "p2p")
+                result_size = tracemalloc.get_traced_memory()[0]
+                peak_size = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            assert len(result) == message_cnt
+            print(
+                f"{message_cnt:>6} messages, {os.path.getsize(file_path) / 1024 / 1024:>6.2f} MB:"
+                f"{cost * 1000:>10.3f} ms,{cost / message_cnt * 1000_000:>8.3f} us/message,"
+                f" peak memory excluding result:{(peak_size - result_size) / 1024:>8.1f} KB"
+            )
+
+
+if __name__ == "__main__":
+    main()
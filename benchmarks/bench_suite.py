@@ -0,0 +1,197 @@
+"""Benchmark suite of each stage: model building(`msg_to_pydantic_model`), code generation(`pydantic_model_to_py_code`),
+the protoc plugin(`CodeGen`, run in process by `benchmarks.bench_plugin_code_gen`) and the validation of the models.
+The stages are measured with the schemas of `example/example_proto`(the validation uses the generated p2p/PGV code),
+then with the synthetic schemas of `benchmarks.schema_scaler` to show how each stage grows with
+message count, nesting depth and rule density.
+
+run: python -m benchmarks.bench_suite
+"""
+import os
+import subprocess
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from uuid import uuid1, uuid4
+
+from google.protobuf import __version__
+from google.protobuf.compiler.plugin_pb2 import CodeGeneratorRequest
+from google.protobuf.descriptor_pool import DescriptorPool
+from pydantic import BaseModel
+
+from benchmarks import schema_scaler
+from benchmarks.bench_field_param import get_message_list
+from example.gen_p2p_code import CustomerField, confloat, conint, customer_any
+from protobuf_to_pydantic import msg_to_pydantic_model, pydantic_model_to_py_code
+
+if __version__ > "4.0.0":
+    from example.proto import demo_gen_code_by_p2p, demo_gen_code_by_pgv
+    from example.proto.example.example_proto.p2p_validate import demo_pb2 as p2p_validate_pb2
+    from example.proto.example.example_proto.validate import demo_pb2 as validate_pb2
+else:
+    from example.proto_3_20 import demo_gen_code_by_p2p, demo_gen_code_by_pgv  # type: ignore[no-redef]
+    from example.proto_3_20.example.example_proto.p2p_validate import demo_pb2 as p2p_validate_pb2  # type: ignore
+    from example.proto_3_20.example.example_proto.validate import demo_pb2 as validate_pb2  # type: ignore
+
+local_dict: Dict[str, Any] = {
+    "CustomerField": CustomerField,
+    "confloat": confloat,
+    "conint": conint,
+    "customer_any": customer_any,
+}
+string_payload: Dict[str, Any] = {
+    "const_test": "aaa",
+    "len_test": "aaa",
+    "s_range_len_test": "aa",
+    "pattern_test": "testaa",
+    "prefix_test": "prefix_testaa",
+    "suffix_test": "aa_suffix",
+    "contains_test": "aaa_contains_test",
+    "not_contains_test": "aaa",
+    "in_test": "a",
+    "not_in_test": "d",
+    "email_test": "example@example.com",
+    "hostname_test": "127.0.0.1",
+    "ip_test": "127.0.0.1",
+    "ipv4_test": "127.0.0.1",
+    "ipv6_test": "::1",
+    "uri_test": "http://127.0.0.1",
+    "uri_ref_test": "http://127.0.0.1/paths",
+    "address_test": "127.0.0.1",
+    "uuid_test": str(uuid4()),
+}
+number_model_name_list: List[str] = [
+    "FloatTest",
+    "DoubleTest",
+    "Int32Test",
+    "Uint32Test",
+    "Sfixed32Test",
+    "Int64Test",
+    "Sint64Test",
+    "Uint64Test",
+    "Sfixed64Test",
+    "Fixed32Test",
+    "Fixed64Test",
+]
+
+
+def get_cost(func: Callable[[], Any], number: int) -> float:
+    """Return the cost(second) of each call"""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def get_validate_case_list(module: Any, parse_msg_desc_method: str) -> List[Tuple[Type[BaseModel], Dict[str, Any]]]:
+    """The valid data of the generated models (same as the tests of validate)"""
+    if parse_msg_desc_method == "PGV":
+        number_payload: Dict[str, Any] = {"in_test": 1}
+        bool_payload: Dict[str, Any] = {"bool_1_test": True, "bool_2_test": False}
+        extra_string_payload: Dict[str, Any] = {}
+    else:
+        number_payload = {"in_test": 1, "miss_default_test": 1.0}
+        bool_payload = {"bool_1_test": True, "bool_2_test": False, "miss_default_test": True}
+        extra_string_payload = {"pydantic_type_test": str(uuid1()), "miss_default_test": "aa"}
+    case_list: List[Tuple[Type[BaseModel], Dict[str, Any]]] = [
+        (getattr(module, name), number_payload) for name in number_model_name_list
+    ]
+    case_list.append((module.BoolTest, bool_payload))
+    case_list.append((module.StringTest, {**string_payload, **extra_string_payload}))
+    return case_list
+
+
+def get_validate_throughput(case_list: List[Tuple[Type[BaseModel], Dict[str, Any]]], number: int) -> float:
+    """Return the number of validations per second"""
+
+    def _validate() -> None:
+        for model_class, payload in case_list:
+            model_class(**payload)
+
+    return len(case_list) / get_cost(_validate, number)
+
+
+def run_plugin_code_gen(request: Optional[CodeGeneratorRequest], number: int) -> float:
+    """Run `CodeGen` in a new process(the protos of plugin can not be imported together with the protos of example)
+    :param request: If None, use the request of `example/example_proto`
+    """
+    env: dict = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([os.getcwd(), env.get("PYTHONPATH", "")])
+    output: bytes = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_plugin_code_gen", "example" if request is None else "-", str(number)],
+        input=b"" if request is None else request.SerializeToString(),
+        stdout=subprocess.PIPE,
+        env=env,
+        check=True,
+    ).stdout
+    return float(output)
+
+
+def build_example_model_list() -> List[Type[BaseModel]]:
+    return [
+        msg_to_pydantic_model(message, parse_msg_desc_method="PGV", use_cache=False)
+        for message in get_message_list(validate_pb2)
+    ] + [
+        msg_to_pydantic_model(message, local_dict=local_dict, use_cache=False)
+        for message in get_message_list(p2p_validate_pb2)
+    ]
+
+
+def build_scaled_model_list(file_descriptor_set: Any) -> List[Type[BaseModel]]:
+    """The descriptor pool is created in each call, so that the parse result of the last call is not used"""
+    pool: DescriptorPool = DescriptorPool()
+    for fd in file_descriptor_set.file:
+        pool.Add(fd)
+    file_descriptor: Any = pool.FindFileByName(schema_scaler.file_name)
+    return [
+        msg_to_pydantic_model(descriptor, parse_msg_desc_method=file_descriptor_set, use_cache=False)
+        for descriptor in file_descriptor.message_types_by_name.values()
+    ]
+
+
+def run_example_suite(number: int) -> None:
+    print("example_proto")
+    model_list: List[Type[BaseModel]] = build_example_model_list()
+    print(f"{'build':<24}{get_cost(build_example_model_list, number) * 1000:>12.3f} ms/{len(model_list)} models")
+    cost: float = get_cost(lambda: pydantic_model_to_py_code(*model_list), number)
+    print(f"{'gen code':<24}{cost * 1000:>12.3f} ms/{len(model_list)} models")
+    print(f"{'plugin':<24}{run_plugin_code_gen(None, number) * 1000:>12.3f} ms/run")
+    for module, parse_msg_desc_method in ((demo_gen_code_by_p2p, "p2p"), (demo_gen_code_by_pgv, "PGV")):
+        case_list = get_validate_case_list(module, parse_msg_desc_method)
+        throughput: float = get_validate_throughput(case_list, number * 100)
+        print(f"{'validate ' + parse_msg_desc_method:<24}{throughput:>12.0f} validations/s")
+
+
+def run_scaled_suite(scale_list: List[Tuple[int, int, float]], number: int, field_cnt: int) -> None:
+    print(f"\nsynthetic schema, {field_cnt} fields per message")
+    print(
+        f"{'messages':>10}{'depth':>8}{'rules':>8}{'build ms':>12}{'gen code ms':>14}{'plugin ms':>12}"
+        f"{'validations/s':>16}"
+    )
+    for message_cnt, depth, rule_density in scale_list:
+        file_descriptor_set = schema_scaler.gen_file_descriptor_set(
+            message_cnt, depth=depth, rule_density=rule_density, field_cnt=field_cnt
+        )
+        model_list: List[Type[BaseModel]] = build_scaled_model_list(file_descriptor_set)
+        build_cost: float = get_cost(lambda: build_scaled_model_list(file_descriptor_set), number)
+        gen_code_cost: float = get_cost(lambda: pydantic_model_to_py_code(*model_list), number)
+        request: CodeGeneratorRequest = CodeGeneratorRequest(file_to_generate=[schema_scaler.file_name])
+        request.proto_file.extend(file_descriptor_set.file)
+        plugin_cost: float = run_plugin_code_gen(request, number)
+        payload: Dict[str, Any] = schema_scaler.gen_payload(depth=depth, field_cnt=field_cnt)
+        throughput: float = get_validate_throughput([(model, payload) for model in model_list], number * 100)
+        print(
+            f"{message_cnt:>10}{depth:>8}{rule_density:>8.2f}{build_cost * 1000:>12.3f}{gen_code_cost * 1000:>14.3f}"
+            f"{plugin_cost * 1000:>12.3f}{throughput:>16.0f}"
+        )
+
+
+def main(number: int = 1, field_cnt: int = 8) -> None:
+    run_example_suite(number)
+    # Each stage is measured by changing one of message count, nesting depth and rule density
+    scale_list: List[Tuple[int, int, float]] = (
+        [(message_cnt, 1, 0.5) for message_cnt in (25, 50, 100, 200)]
+        + [(50, depth, 0.5) for depth in (0, 2, 4)]
+        + [(50, 1, rule_density) for rule_density in (0.0, 0.25, 1.0)]
+    )
+    run_scaled_suite(scale_list, number, field_cnt)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Generate the synthetic schemas of the benchmark suite, so that each stage can be measured
+ with different message count, nesting depth and rule density.
+
+Each message has `field_cnt` scalar fields and a chain of `depth` nested messages (`Nested1`, `Nested2`...),
+ the rules of the fields are p2p text comments in the `SourceCodeInfo` of the FileDescriptorSet.
+"""
+import json
+from typing import Any, Dict, List, Tuple
+
+from google.protobuf.descriptor_pb2 import DescriptorProto, FieldDescriptorProto, FileDescriptorProto, FileDescriptorSet
+
+file_name: str = "bench_scaler/scaled.proto"
+package: str = "bench_scaler"
+
+# field name prefix, field type, p2p rule, valid value
+field_kind_list: List[Tuple[str, int, Dict[str, Any], Any]] = [
+    ("name", FieldDescriptorProto.TYPE_STRING, {"min_length": 1, "max_length": 64}, "protobuf"),
+    ("count", FieldDescriptorProto.TYPE_INT32, {"gt": 0, "lt": 1000}, 42),
+    ("ratio", FieldDescriptorProto.TYPE_DOUBLE, {"ge": 0.0, "le": 1.0}, 0.5),
+    ("code", FieldDescriptorProto.TYPE_STRING, {"regex": "^[a-z]+$"}, "pydantic"),
+]
+
+
+def _has_rule(field_index: int, rule_density: float) -> bool:
+    """Spread the fields with rules evenly, e.g. 0.5 means every other field has rules"""
+    return int((field_index + 1) * rule_density) > int(field_index * rule_density)
+
+
+def _add_message(
+    fd: FileDescriptorProto,
+    message: DescriptorProto,
+    path: List[int],
+    type_name: str,
+    field_cnt: int,
+    depth: int,
+    rule_density: float,
+) -> None:
+    for field_index in range(field_cnt):
+        field_name, field_type, rule, _ = field_kind_list[field_index % len(field_kind_list)]
+        message.field.add(name=f"{field_name}_{field_index}", number=field_index + 1, type=field_type)
+        if _has_rule(field_index, rule_density):
+            location = fd.source_code_info.location.add(path=path + [2, field_index])
+            location.leading_comments = f" p2p: {json.dumps(rule)}"
+    if depth <= 0:
+        return
+    nested_name: str = f"Nested{len(path) // 2}"
+    message.field.add(
+        name="nested",
+        number=field_cnt + 1,
+        type=FieldDescriptorProto.TYPE_MESSAGE,
+        type_name=f"{type_name}.{nested_name}",
+    )
+    nested_message: DescriptorProto = message.nested_type.add(name=nested_name)
+    _add_message(fd, nested_message, path + [3, 0], f"{type_name}.{nested_name}", field_cnt, depth - 1, rule_density)
+
+
+def gen_file_descriptor_set(
+    message_cnt: int, depth: int = 0, rule_density: float = 1.0, field_cnt: int = 8
+) -> FileDescriptorSet:
+    """
+    :param message_cnt: the number of top-level messages
+    :param depth: the nesting depth of each message
+    :param rule_density: the ratio of fields with rules, from 0.0 to 1.0
+    :param field_cnt: the number of scalar fields of each message (and nested message)
+    """
+    file_descriptor_set: FileDescriptorSet = FileDescriptorSet()
+    fd = file_descriptor_set.file.add(name=file_name, package=package, syntax="proto3")
+    for message_index in range(message_cnt):
+        message = fd.message_type.add(name=f"Message{message_index}")
+        _add_message(fd, message, [4, message_index], f".{package}.{message.name}", field_cnt, depth, rule_density)
+    return file_descriptor_set
+
+
+def gen_payload(depth: int = 0, field_cnt: int = 8) -> Dict[str, Any]:
+    """Generate the data that satisfies the rules of any message of the schema with the same `depth` and `field_cnt`"""
+    payload: Dict[str, Any] = {}
+    for field_index in range(field_cnt):
+        field_name, _, _, value = field_kind_list[field_index % len(field_kind_list)]
+        payload[f"{field_name}_{field_index}"] = value
+    if depth > 0:
+        payload["nested"] = gen_payload(depth - 1, field_cnt)
+    return payload
@@ -1,3 +1,4 @@
 from .__version__ import __version__
 from .gen_code import pydantic_model_to_py_code, pydantic_model_to_py_file
-from .gen_model import msg_to_pydantic_model
+from .gen_model import clear_model_cache, msg_to_pydantic_model, pool_to_pydantic_models
+from .get_desc import set_desc_cache_dir
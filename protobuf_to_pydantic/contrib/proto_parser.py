@@ -6,6 +6,7 @@
 # Original project author: khadgarmage
 #
 import json
+import os
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -363,16 +364,37 @@ def _recursive_to_dict(obj: Any) -> Dict[str, Any]:
     return _dict
 
 
+_parser: Optional[Lark] = None
+# file path -> (st_mtime_ns, st_size, parse result)
+_proto_file_cache: Dict[str, Tuple[int, int, Optional[ProtoFile]]] = {}
+
+
+def get_parser() -> Lark:
+    """The grammar is only compiled once per process,
+    and lark caches the parse table in the temp dir, so the next process does not need to rebuild it"""
+    global _parser
+    if _parser is None:
+        _parser = Lark(BNF, start="proto", parser="lalr", cache=True)
+    return _parser
+
+
 def parse_from_file(file: str) -> Optional[ProtoFile]:
+    """Parse the protobuf file, the result is cached until the mtime or size of the file is changed"""
+    file = os.path.abspath(file)
+    stat_result: os.stat_result = os.stat(file)
+    cache_value: Optional[Tuple[int, int, Optional[ProtoFile]]] = _proto_file_cache.get(file, None)
+    if cache_value and cache_value[0] == stat_result.st_mtime_ns and cache_value[1] == stat_result.st_size:
+        return cache_value[2]
+
     with open(file, "r") as f:
         data = f.read()
-    if data:
-        return parse(data)
-    return None
+    proto_file: Optional[ProtoFile] = parse(data) if data else None
+    _proto_file_cache[file] = (stat_result.st_mtime_ns, stat_result.st_size, proto_file)
+    return proto_file
 
 
 def parse(data: str) -> ProtoFile:
-    parser: Lark = Lark(BNF, start="proto", parser="lalr")
+    parser: Lark = get_parser()
     tree: ParseTree = parser.parse(data)
     trans_tree: Tree = ProtoTransformer().transform(tree)
     enums: Dict[str, Enum] = {}
@@ -0,0 +1,494 @@
+import inspect
+from datetime import datetime, timezone
+from enum import IntEnum
+from threading import RLock
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from google.protobuf.message_factory import MessageFactory  # type: ignore
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+
+from protobuf_to_pydantic.grpc_types import (
+    AnyMessage,
+    Descriptor,
+    DescriptorPool,
+    FieldDescriptor,
+    Message,
+    MessageToDict,
+    Timestamp,
+)
+from protobuf_to_pydantic.util import CacheInfo, LRUCache, resolve_lazy_model
+
+try:
+    from google.protobuf.message_factory import GetMessageClass  # type: ignore
+except ImportError:
+    # The old versions of protobuf
+    GetMessageClass = None
+
+if TYPE_CHECKING:
+    from pydantic.main import Model
+
+# (value, validate) -> value
+ConverterType = Callable[[Any, bool], Any]
+# (message, value) -> None
+SetterType = Callable[[Any, Any], None]
+
+# The kind of the field container
+SINGLE, REPEATED, MAP = "single", "repeated", "map"
+# The kind of the field value
+SCALAR, MESSAGE, TIMESTAMP, DURATION, ANY, STRUCT, EMPTY = (
+    "scalar",
+    "message",
+    "timestamp",
+    "duration",
+    "any",
+    "struct",
+    "empty",
+)
+well_known_kind_dict: Dict[str, str] = {
+    "google.protobuf.Timestamp": TIMESTAMP,
+    "google.protobuf.Duration": DURATION,
+    "google.protobuf.Any": ANY,
+    "google.protobuf.Struct": STRUCT,
+    "google.protobuf.Empty": EMPTY,
+}
+
+
+class FieldPlan(NamedTuple):
+    name: str  # protobuf field name
+    key: str  # The key used when initializing the pydantic model(support alias)
+    check_presence: bool  # If True, will use `HasField` to determine whether the field is set
+    converter: Optional[ConverterType]  # If None, the value does not need to be converted
+
+
+def _field_has_presence(field: FieldDescriptor) -> bool:
+    if field.label == FieldDescriptor.LABEL_REPEATED:
+        return False
+    has_presence: Optional[bool] = getattr(field, "has_presence", None)
+    if has_presence is not None:
+        return has_presence
+    # Compatible with old versions of protobuf
+    return (
+        field.type == FieldDescriptor.TYPE_MESSAGE
+        or field.containing_oneof is not None
+        or field.containing_type.file.syntax == "proto2"
+    )
+
+
+def get_field_kind(field: FieldDescriptor) -> Tuple[str, str]:
+    """Get the container kind and value kind of the field, e.g: (repeated, timestamp)"""
+    if field.message_type and field.message_type.GetOptions().map_entry:
+        return MAP, get_field_kind(field.message_type.fields_by_name["value"])[1]
+    container_kind: str = REPEATED if field.label == FieldDescriptor.LABEL_REPEATED else SINGLE
+    if field.type != FieldDescriptor.TYPE_MESSAGE:
+        return container_kind, SCALAR
+    return container_kind, well_known_kind_dict.get(field.message_type.full_name, MESSAGE)
+
+
+def field_check_presence(field: FieldDescriptor) -> bool:
+    """Whether the field is only written to the message when it is explicitly set (in `__fields_set__`).
+
+    Applies to oneof members and scalars with presence (e.g. proto3 optional), other fields are written
+    when the value is not None
+    """
+    if field.containing_oneof is not None:
+        return True
+    return get_field_kind(field) == (SINGLE, SCALAR) and _field_has_presence(field)
+
+
+# id(pool) -> (pool, the MessageFactory of pool), the factory keeps the classes it created
+_message_factory_cache: LRUCache[Tuple[DescriptorPool, MessageFactory]] = LRUCache(maxsize=64)
+
+
+def get_message_class(descriptor: Descriptor) -> Type[Message]:
+    """Get the Message class corresponding to the descriptor"""
+    if GetMessageClass is not None:
+        return GetMessageClass(descriptor)
+    # The class of generated code (or created before) is bound to the descriptor
+    try:
+        message_class: Optional[Type[Message]] = descriptor._concrete_class  # type: ignore[attr-defined]
+    except (AttributeError, TypeError):
+        # The C++ implementation raises TypeError if the descriptor has no class
+        message_class = None
+    if message_class is not None:
+        return message_class
+    pool: DescriptorPool = descriptor.file.pool
+    cache_value: Optional[Tuple[DescriptorPool, MessageFactory]] = _message_factory_cache.get(id(pool))
+    if cache_value is None or cache_value[0] is not pool:
+        cache_value = (pool, MessageFactory(pool))
+        _message_factory_cache.set(id(pool), cache_value)
+    return cache_value[1].GetPrototype(descriptor)
+
+
+# The old versions of protobuf do not support the `tzinfo` param of `Timestamp.ToDatetime`
+_to_datetime_support_tzinfo: bool = "tzinfo" in inspect.signature(Timestamp.ToDatetime).parameters
+
+
+def _timestamp_to_datetime(value: Any, validate: bool) -> datetime:
+    """Same as the datetime parsed by pydantic from the value of `MessageToDict`, it is UTC-aware"""
+    if _to_datetime_support_tzinfo:
+        return value.ToDatetime(tzinfo=timezone.utc)
+    return value.ToDatetime().replace(tzinfo=timezone.utc)
+
+
+def _get_model_field_type(model_field: Optional[ModelField]) -> Any:
+    """Get the type of the field(for List and Dict is the type of the item)"""
+    return model_field.type_ if model_field else None
+
+
+class MessageToModelPlan(object):
+    """Conversion plan compiled from the descriptor of a message and the corresponding pydantic model.
+
+    The plan is compiled only once, after that each conversion only needs to read the fields of message
+    through the precompiled field accessors and converters, instead of `MessageToDict` + `Model(**dict)`.
+    If the model is None, the plan will convert the message to a dict
+    """
+
+    def __init__(self, descriptor: Descriptor, model: Optional[Type[BaseModel]] = None) -> None:
+        self.descriptor: Descriptor = descriptor
+        self.model: Optional[Type[BaseModel]] = model
+        self.field_plan_list: List[FieldPlan] = []
+
+    def compile(self) -> None:
+        if self.model:
+            # The fields of the lazy model are forward refs before it is resolved
+            resolve_lazy_model(self.model)
+        model_field_dict: Dict[str, ModelField] = self.model.__fields__ if self.model else {}
+        for field in self.descriptor.fields:
+            model_field: Optional[ModelField] = model_field_dict.get(field.name, None)
+            if self.model and not model_field:
+                # The field is disabled (e.g. p2p `enable` is false)
+                continue
+            self.field_plan_list.append(
+                FieldPlan(
+                    name=field.name,
+                    key=model_field.alias if model_field else field.name,
+                    check_presence=_field_has_presence(field),
+                    converter=self._gen_field_converter(field, model_field),
+                )
+            )
+
+    def _gen_value_converter(self, field: FieldDescriptor, field_type: Any) -> Optional[ConverterType]:
+        """Generate a converter for a single value(Repeated and Map need to be processed by the caller)"""
+        if field.type == FieldDescriptor.TYPE_ENUM:
+            if not (isinstance(field_type, type) and issubclass(field_type, IntEnum)):
+                return None
+            enum_class: Type[IntEnum] = field_type
+
+            def _enum_converter(value: Any, validate: bool) -> Any:
+                if validate:
+                    return value
+                try:
+                    return enum_class(value)
+                except ValueError:
+                    # Unknown enum value, give it to the user to deal with
+                    return value
+
+            return _enum_converter
+        elif field.type != FieldDescriptor.TYPE_MESSAGE:
+            return None
+
+        message_type: Descriptor = field.message_type
+        if message_type.full_name == "google.protobuf.Timestamp":
+            return _timestamp_to_datetime
+        elif message_type.full_name == "google.protobuf.Duration":
+            return lambda value, validate: value.ToTimedelta()
+        elif message_type.full_name == "google.protobuf.Any":
+
+            def _any_converter(value: Any, validate: bool) -> Any:
+                any_message: AnyMessage = AnyMessage()
+                any_message.CopyFrom(value)
+                return any_message
+
+            return _any_converter
+        elif isinstance(field_type, type) and issubclass(field_type, BaseModel):
+            sub_plan: MessageToModelPlan = get_message_to_model_plan(message_type, field_type)
+
+            def _message_converter(value: Any, validate: bool) -> Any:
+                if validate:
+                    # Leave it to the parent model for validation to avoid repeated validation
+                    return sub_plan.to_dict(value, validate)
+                return sub_plan.build(value, validate)
+
+            return _message_converter
+        elif message_type.full_name == "google.protobuf.Empty":
+            # Empty carries no data, the corresponding model field type is `None`
+            return lambda value, validate: None
+        elif message_type.full_name.startswith("google.protobuf."):
+            # e.g. Struct
+            return lambda value, validate: MessageToDict(value)
+        else:
+            dict_plan: MessageToModelPlan = get_message_to_model_plan(message_type)
+            return lambda value, validate: dict_plan.to_dict(value, validate)
+
+    def _gen_field_converter(
+        self, field: FieldDescriptor, model_field: Optional[ModelField]
+    ) -> Optional[ConverterType]:
+        field_type: Any = _get_model_field_type(model_field)
+        if field.message_type and field.message_type.GetOptions().map_entry:
+            key_field, value_field = field.message_type.fields
+            value_converter: Optional[ConverterType] = self._gen_value_converter(value_field, field_type)
+            if value_converter is None:
+                return lambda value, validate: dict(value)
+            _map_value_converter: ConverterType = value_converter
+            return lambda value, validate: {k: _map_value_converter(v, validate) for k, v in value.items()}
+
+        converter: Optional[ConverterType] = self._gen_value_converter(field, field_type)
+        if field.label != FieldDescriptor.LABEL_REPEATED:
+            return converter
+        elif converter is None:
+            return lambda value, validate: list(value)
+        _item_converter: ConverterType = converter
+        return lambda value, validate: [_item_converter(i, validate) for i in value]
+
+    def to_dict(self, message: Message, validate: bool = True) -> Dict[str, Any]:
+        value_dict: Dict[str, Any] = {}
+        for name, key, check_presence, converter in self.field_plan_list:
+            if check_presence and not message.HasField(name):
+                continue
+            value: Any = getattr(message, name)
+            value_dict[key] = converter(value, validate) if converter else value
+        return value_dict
+
+    def build(self, message: Message, validate: bool = True) -> Any:
+        """Convert message to a model instance, if validate is False, will use `construct` to skip validation"""
+        value_dict: Dict[str, Any] = self.to_dict(message, validate)
+        if not self.model:
+            return value_dict
+        if validate:
+            return self.model(**value_dict)
+        return self.model.construct(**value_dict)
+
+
+class ModelToMessagePlan(object):
+    """Conversion plan compiled from the pydantic model and the descriptor of the corresponding message.
+
+    Each field is assigned straight onto the message (`CopyFrom` for nested, `extend` for repeated,
+    `update` for maps, `FromDatetime`/`FromTimedelta` for well-known types) without `ParseDict`
+    """
+
+    def __init__(self, descriptor: Descriptor, model: Optional[Type[BaseModel]] = None) -> None:
+        self.descriptor: Descriptor = descriptor
+        self.model: Optional[Type[BaseModel]] = model
+        # (field name, check presence, setter)
+        self.field_plan_list: List[Tuple[str, bool, SetterType]] = []
+
+    def compile(self) -> None:
+        if self.model:
+            # The fields of the lazy model are forward refs before it is resolved
+            resolve_lazy_model(self.model)
+        model_field_dict: Dict[str, ModelField] = self.model.__fields__ if self.model else {}
+        for field in self.descriptor.fields:
+            model_field: Optional[ModelField] = model_field_dict.get(field.name, None)
+            if self.model and not model_field:
+                continue
+            setter: Optional[SetterType] = self._gen_field_setter(field, _get_model_field_type(model_field))
+            if setter:
+                self.field_plan_list.append((field.name, field_check_presence(field), setter))
+
+    def _gen_value_setter(self, field: FieldDescriptor, field_type: Any, value_kind: str) -> Optional[SetterType]:
+        """Generate a setter that fills the value into the sub message"""
+        if value_kind == TIMESTAMP:
+            return lambda sub_message, value: sub_message.FromDatetime(value)
+        elif value_kind == DURATION:
+            return lambda sub_message, value: sub_message.FromTimedelta(value)
+        elif value_kind == ANY:
+            return lambda sub_message, value: sub_message.CopyFrom(value)
+        elif value_kind == STRUCT:
+            return lambda sub_message, value: sub_message.update(value)
+        elif value_kind == MESSAGE:
+            model: Optional[Type[BaseModel]] = field_type if isinstance(field_type, type) else None
+            if model and not issubclass(model, BaseModel):
+                model = None
+            sub_plan: ModelToMessagePlan = get_model_to_message_plan(field.message_type, model)
+            return sub_plan.fill
+        return None
+
+    def _gen_field_setter(self, field: FieldDescriptor, field_type: Any) -> Optional[SetterType]:
+        container_kind, value_kind = get_field_kind(field)
+        name: str = field.name
+        if value_kind == EMPTY:
+            return None
+        elif value_kind == SCALAR:
+            if container_kind == SINGLE:
+                return lambda message, value: setattr(message, name, value)
+            elif container_kind == REPEATED:
+                return lambda message, value: getattr(message, name).extend(value)
+            return lambda message, value: getattr(message, name).update(value)
+
+        if container_kind == MAP:
+            value_field: FieldDescriptor = field.message_type.fields_by_name["value"]
+            value_setter: Optional[SetterType] = self._gen_value_setter(value_field, field_type, value_kind)
+        else:
+            value_setter = self._gen_value_setter(field, field_type, value_kind)
+        if not value_setter:
+            return None
+        _value_setter: SetterType = value_setter
+
+        if container_kind == SINGLE:
+            return lambda message, value: _value_setter(getattr(message, name), value)
+        elif container_kind == REPEATED:
+
+            def _repeated_setter(message: Any, value: Any) -> None:
+                container: Any = getattr(message, name)
+                for item in value:
+                    _value_setter(container.add(), item)
+
+            return _repeated_setter
+        else:
+
+            def _map_setter(message: Any, value: Any) -> None:
+                container = getattr(message, name)
+                for k, v in value.items():
+                    _value_setter(container[k], v)
+
+            return _map_setter
+
+    def fill(self, message: Message, value: Any) -> None:
+        """Fill the value of model instance(or dict) into the message"""
+        if isinstance(value, dict):
+            value_dict: Dict[str, Any] = value
+            fields_set: Any = value.keys()
+        else:
+            value_dict = value.__dict__
+            fields_set = value.__fields_set__
+        # Even if there is no field to set, the message needs to be marked as set
+        message.SetInParent()
+        for name, check_presence, setter in self.field_plan_list:
+            if check_presence and name not in fields_set:
+                continue
+            field_value: Any = value_dict.get(name, None)
+            if field_value is None:
+                continue
+            setter(message, field_value)
+
+
+_PlanT = TypeVar("_PlanT", "MessageToModelPlan", "ModelToMessagePlan")
+# (plan class, message full name, id of descriptor pool, model) -> (descriptor, plan)
+# The descriptor is kept in the value, so the pool can not be collected and its id can not be reused while cached
+_plan_cache: LRUCache[Tuple[Descriptor, Any]] = LRUCache(maxsize=2048)
+_compiling_plan_dict: Dict[Tuple[type, str, int, Optional[Type[BaseModel]]], Any] = {}
+_plan_lock: RLock = RLock()
+
+
+def clear_plan_cache() -> None:
+    """Clear the cache of the conversion plans and reset its statistics"""
+    _plan_cache.clear()
+
+
+def get_plan_cache_info() -> CacheInfo:
+    """Get the hits, misses, maxsize and currsize of the cache of the conversion plans"""
+    return _plan_cache.info()
+
+
+def set_plan_cache_size(maxsize: Optional[int]) -> None:
+    """Set the max size of the cache of the conversion plans, None means unlimited"""
+    _plan_cache.set_maxsize(maxsize)
+
+
+def _get_plan(plan_class: Type[_PlanT], descriptor: Descriptor, model: Optional[Type[BaseModel]]) -> _PlanT:
+    """Get the plan of the descriptor and model, the plan will only be compiled once"""
+    key: Tuple[type, str, int, Optional[Type[BaseModel]]] = (
+        plan_class,
+        descriptor.full_name,
+        id(descriptor.file.pool),
+        model,
+    )
+    cache_value: Optional[Tuple[Descriptor, Any]] = _plan_cache.get(key)
+    if cache_value is not None and cache_value[0] is descriptor:
+        return cache_value[1]
+    with _plan_lock:
+        plan: Optional[_PlanT] = _compiling_plan_dict.get(key, None)
+        if plan is not None:
+            return plan
+        # Other threads may have compiled the plan while waiting for the lock
+        cache_value = _plan_cache.get(key) if key in _plan_cache else None
+        if cache_value is not None and cache_value[0] is descriptor:
+            return cache_value[1]
+        is_outermost: bool = not _compiling_plan_dict
+        plan = plan_class(descriptor, model)
+        # Register before compiling to support self-referencing and circular-referencing messages
+        _compiling_plan_dict[key] = plan
+        try:
+            plan.compile()
+            if is_outermost:
+                # Only publish the plans after all the plans they depend on are compiled
+                for compiling_key, compiling_plan in _compiling_plan_dict.items():
+                    _plan_cache.set(compiling_key, (compiling_plan.descriptor, compiling_plan))
+        finally:
+            if is_outermost:
+                _compiling_plan_dict.clear()
+        return plan
+
+
+def get_message_to_model_plan(descriptor: Descriptor, model: Optional[Type[BaseModel]] = None) -> MessageToModelPlan:
+    """Get the conversion plan of the descriptor and model, the plan will only be compiled once"""
+    return _get_plan(MessageToModelPlan, descriptor, model)
+
+
+def get_model_to_message_plan(descriptor: Descriptor, model: Optional[Type[BaseModel]] = None) -> ModelToMessagePlan:
+    """Get the conversion plan of the model and descriptor, the plan will only be compiled once"""
+    return _get_plan(ModelToMessagePlan, descriptor, model)
+
+
+def msg_to_model(message: Message, model: Type["Model"], validate: bool = True) -> "Model":
+    """Convert the protobuf message to the pydantic model instance without `MessageToDict`
+
+    :param message: protobuf message instance
+    :param model: pydantic model, generated by protobuf_to_pydantic (or have the same fields as the message)
+    :param validate: If False, will use `construct` to skip validation (only for trusted data)
+    """
+    return get_message_to_model_plan(message.DESCRIPTOR, model).build(message, validate)
+
+
+def convert_many(
+    messages: Iterable[Message], model: Type["Model"], validate: bool = True
+) -> Generator["Model", None, None]:
+    """Convert messages of the same type (e.g. `RepeatedCompositeContainer`) to model instances one by one.
+
+    The conversion plan is only looked up once for the whole batch
+
+    :param messages: protobuf message instances of the same type
+    :param model: pydantic model, generated by protobuf_to_pydantic (or have the same fields as the message)
+    :param validate: If False, will use `construct` to skip validation (only for trusted data)
+    """
+    build: Optional[Callable[[Message, bool], Any]] = None
+    for message in messages:
+        if build is None:
+            build = get_message_to_model_plan(message.DESCRIPTOR, model).build
+        yield build(message, validate)
+
+
+def from_protobuf(cls: Type["Model"], message: Message, validate: bool = True) -> "Model":
+    """The implementation of the model's `from_protobuf` classmethod"""
+    return msg_to_model(message, cls, validate=validate)
+
+
+def model_to_msg(model: BaseModel, message: Message) -> Message:
+    """Fill the value of the pydantic model instance into the protobuf message without `ParseDict`
+
+    :param model: pydantic model instance, generated by protobuf_to_pydantic (or have the same fields as the message)
+    :param message: protobuf message instance, the value of model will be filled into it
+    """
+    get_model_to_message_plan(message.DESCRIPTOR, model.__class__).fill(message, model)
+    return message
+
+
+def to_protobuf(self: BaseModel, message: Optional[Message] = None) -> Message:
+    """The implementation of the model's `to_protobuf` method, the model class needs to have `_message_descriptor`"""
+    if message is None:
+        message = get_message_class(getattr(self.__class__, "_message_descriptor"))()
+    return model_to_msg(self, message)
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence, Type, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Sequence, Type, Union
 
 from pydantic import (
     ConstrainedBytes,
@@ -18,6 +18,7 @@ from pydantic import (
 from pydantic.types import update_not_none
 
 from protobuf_to_pydantic import customer_validator
+from protobuf_to_pydantic.util import CacheInfo, LRUCache
 
 if TYPE_CHECKING:
     from pydantic.typing import CallableGenerator
@@ -35,6 +36,9 @@ __all__ = [
     "ConstrainedTimestamp",
     "pydantic_con_dict",
     "set_ignore_param_value_tz",
+    "get_con_type",
+    "clear_con_type_cache",
+    "get_con_type_cache_info",
 ]
 
 _ignore_param_value_tz: bool = False
@@ -73,19 +77,21 @@ class ConstrainedTimedelta(timedelta):
     @classmethod
     def __get_validators__(cls) -> "CallableGenerator":
         if cls.duration_const:
-            yield customer_validator.duration_const_validator
+            yield customer_validator.gen_rule_validator(customer_validator.duration_const_validator, cls.duration_const)
         if cls.duration_ge:
-            yield customer_validator.duration_ge_validator
+            yield customer_validator.gen_rule_validator(customer_validator.duration_ge_validator, cls.duration_ge)
         if cls.duration_gt:
-            yield customer_validator.duration_gt_validator
+            yield customer_validator.gen_rule_validator(customer_validator.duration_gt_validator, cls.duration_gt)
         if cls.duration_le:
-            yield customer_validator.duration_le_validator
+            yield customer_validator.gen_rule_validator(customer_validator.duration_le_validator, cls.duration_le)
         if cls.duration_lt:
-            yield customer_validator.duration_lt_validator
+            yield customer_validator.gen_rule_validator(customer_validator.duration_lt_validator, cls.duration_lt)
         if cls.duration_in:
-            yield customer_validator.duration_in_validator
+            yield customer_validator.gen_rule_validator(customer_validator.duration_in_validator, cls.duration_in)
         if cls.duration_not_in:
-            yield customer_validator.duration_not_in_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.duration_not_in_validator, cls.duration_not_in
+            )
 
 
 def contimedelta(
@@ -153,25 +159,45 @@ class ConstrainedTimestamp(datetime):
         if cls.ignore_tz or _ignore_param_value_tz:
             yield cls.ignore_value_tz
         if cls.timestamp_const:
-            yield customer_validator.timestamp_const_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.timestamp_const_validator, cls.timestamp_const, enable_timestamp_to_datetime=True
+            )
         if cls.timestamp_ge:
-            yield customer_validator.timestamp_ge_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.timestamp_ge_validator, cls.timestamp_ge, enable_timestamp_to_datetime=True
+            )
         if cls.timestamp_gt:
-            yield customer_validator.timestamp_gt_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.timestamp_gt_validator, cls.timestamp_gt, enable_timestamp_to_datetime=True
+            )
         if cls.timestamp_gt_now:
-            yield customer_validator.timestamp_gt_now_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.timestamp_gt_now_validator, cls.timestamp_gt_now
+            )
         if cls.timestamp_le:
-            yield customer_validator.timestamp_le_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.timestamp_le_validator, cls.timestamp_le, enable_timestamp_to_datetime=True
+            )
         if cls.timestamp_lt:
-            yield customer_validator.timestamp_lt_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.timestamp_lt_validator, cls.timestamp_lt, enable_timestamp_to_datetime=True
+            )
         if cls.timestamp_lt_now:
-            yield customer_validator.timestamp_lt_now_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.timestamp_lt_now_validator, cls.timestamp_lt_now
+            )
         if cls.timestamp_in:
-            yield customer_validator.timestamp_in_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.timestamp_in_validator, cls.timestamp_in, enable_timestamp_to_datetime=True
+            )
         if cls.timestamp_not_in:
-            yield customer_validator.timestamp_not_in_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.timestamp_not_in_validator, cls.timestamp_not_in, enable_timestamp_to_datetime=True
+            )
         if cls.timestamp_within:
-            yield customer_validator.timestamp_within_validator
+            yield customer_validator.gen_rule_validator(
+                customer_validator.timestamp_within_validator, cls.timestamp_within
+            )
 
     @classmethod
     @validate_arguments
@@ -222,3 +248,46 @@ pydantic_con_dict: Dict[Type, Callable] = {
     ConstrainedTimedelta: contimedelta,
     ConstrainedTimestamp: contimestamp,
 }
+
+
+# (con func, frozen args, frozen kwargs) -> constrained type
+_con_type_cache: LRUCache[Type] = LRUCache(maxsize=4096)
+
+
+def _freeze_con_type_param(value: Any) -> Hashable:
+    """Unlike `util.freeze_value`, the type of value is part of the result (e.g. `1`, `1.0` and `True` are different
+    params), and raise TypeError if the value can not be converted to a hashable value"""
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_freeze_con_type_param(i) for i in value)
+    elif isinstance(value, (set, frozenset)):
+        return type(value), frozenset(_freeze_con_type_param(i) for i in value)
+    elif isinstance(value, dict):
+        return dict, tuple((k, _freeze_con_type_param(v)) for k, v in value.items())
+    hash(value)
+    return type(value), value
+
+
+def get_con_type(con_func: Callable[..., Type], *args: Any, **kwargs: Any) -> Type:
+    """Get the constrained type created by `con_func(*args, **kwargs)`.
+    The constrained type is never changed after it is created,
+     so the same con func with the same params returns the same type instead of creating a new class
+    """
+    try:
+        cache_key: Hashable = (con_func, _freeze_con_type_param(args), _freeze_con_type_param(kwargs))
+    except TypeError:
+        # e.g. the param is unhashable object
+        return con_func(*args, **kwargs)
+    con_type: Optional[Type] = _con_type_cache.get(cache_key)
+    if con_type is None:
+        con_type = _con_type_cache.setdefault(cache_key, con_func(*args, **kwargs))
+    return con_type
+
+
+def clear_con_type_cache() -> None:
+    """Clear the constrained type cache used by `get_con_type` and reset its statistics"""
+    _con_type_cache.clear()
+
+
+def get_con_type_cache_info() -> CacheInfo:
+    """Get the hits, misses, maxsize and currsize of the constrained type cache used by `get_con_type`"""
+    return _con_type_cache.info()
@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import Any, Callable, Dict, Tuple
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from pydantic.fields import ModelField
 
@@ -10,33 +11,126 @@ from protobuf_to_pydantic.types import OneOfTypedDict
 ################
 # requirements #
 ################
-def _get_name_value_from_kwargs(
-    key: str, field: ModelField, enable_timestamp_to_datetime: bool = False
-) -> Tuple[str, Any]:
-    field_name: str = field.name
-    if field.field_info.extra:
-        field_value: Any = field.field_info.extra.get(key, None)
-    else:
-        field_value = getattr(field.type_, key, None)
-    if enable_timestamp_to_datetime and not isinstance(field_value, datetime):
+class FieldRule(NamedTuple):
+    value: Any  # The value of the constraint, used for comparison and error messages
+    container: Any  # The value used for membership test (`frozenset` if possible)
+
+
+# The constraint of the field is fixed after the model is created, so it only needs to be parsed once per field.
+# (field, key, enable_timestamp_to_datetime) -> rule, a plain dict is used so that each validation only costs one
+# lookup, and it is emptied when it is full to bound the number of fields it keeps alive
+_field_rule_cache: Dict[Tuple[ModelField, str, bool], FieldRule] = {}
+_field_rule_cache_maxsize: int = 10240
+
+
+def clear_field_rule_cache() -> None:
+    """Clear the cache of the field constraints parsed by the validators"""
+    _field_rule_cache.clear()
+
+
+def _gen_field_rule(field_value: Any, enable_timestamp_to_datetime: bool = False) -> FieldRule:
+    if enable_timestamp_to_datetime and field_value is not None and not isinstance(field_value, datetime):
         if isinstance(field_value, (list, tuple)):
-            field_value = [datetime.fromtimestamp(i) for i in field_value]
+            field_value = [i if isinstance(i, datetime) else datetime.fromtimestamp(i) for i in field_value]
         else:
             field_value = datetime.fromtimestamp(field_value)
 
-    return field_name, field_value
+    container: Any = field_value
+    if isinstance(field_value, (list, tuple, set)):
+        try:
+            container = frozenset(field_value)
+        except TypeError:
+            # Unhashable value, use the original sequence
+            pass
+    return FieldRule(field_value, container)
+
+
+def _get_field_value(key: str, field: ModelField) -> Any:
+    if field.field_info.extra:
+        return field.field_info.extra.get(key, None)
+    return getattr(field.type_, key, None)
+
+
+def _get_field_rule(key: str, field: ModelField, enable_timestamp_to_datetime: bool = False) -> FieldRule:
+    cache_key: Tuple[ModelField, str, bool] = (field, key, enable_timestamp_to_datetime)
+    rule: Optional[FieldRule] = _field_rule_cache.get(cache_key)
+    if rule is None:
+        rule = _gen_field_rule(_get_field_value(key, field), enable_timestamp_to_datetime)
+        if len(_field_rule_cache) >= _field_rule_cache_maxsize:
+            _field_rule_cache.clear()
+        _field_rule_cache[cache_key] = rule
+    return rule
+
+
+def gen_rule_validator(
+    validator: Callable, field_value: Any, enable_timestamp_to_datetime: bool = False
+) -> Callable[[Any, ModelField], Any]:
+    """Bind the constraint of the constrained type to the validator.
+
+    `__get_validators__` of the constrained type is called once per field when the model is built,
+    so the validator returned by this function does not need to find and convert the constraint in each validation.
+    """
+    try:
+        rule: FieldRule = _gen_field_rule(field_value, enable_timestamp_to_datetime)
+    except (TypeError, ValueError, OverflowError, OSError):
+        # Keep raising the error when validating the value
+        return validator
+
+    def _validator(v: Any, field: ModelField) -> Any:
+        return validator(None, v, field=field, rule=rule)
+
+    return _validator
+
+
+def _contains(rule: FieldRule, v: Any) -> bool:
+    try:
+        return v in rule.container
+    except TypeError:
+        # Unhashable value can not be found in frozenset
+        return v in rule.value
 
 
 #################
 # pre validator #
 #################
+class OneOfRule(NamedTuple):
+    name: str
+    fields: FrozenSet[str]
+    required: bool
+
+
+# model class -> (the `_one_of_dict` used for compilation, compiled rules)
+_one_of_rule_cache: "WeakKeyDictionary[type, Tuple[Dict[str, OneOfTypedDict], Tuple[OneOfRule, ...]]]" = (
+    WeakKeyDictionary()
+)
+
+
+def get_one_of_rule(cls: Any) -> Tuple[OneOfRule, ...]:
+    """Compile the `_one_of_dict` of the model into rules, the rules will only be compiled once per model"""
+    one_of_dict: Dict[str, OneOfTypedDict] = getattr(cls, "_one_of_dict", {})
+    cache_value = _one_of_rule_cache.get(cls, None)
+    if cache_value is not None and cache_value[0] is one_of_dict:
+        return cache_value[1]
+    rule_tuple: Tuple[OneOfRule, ...] = tuple(
+        OneOfRule(name=one_of_name, fields=frozenset(item["fields"]), required=item.get("required", False))
+        for one_of_name, item in one_of_dict.items()
+    )
+    _one_of_rule_cache[cls] = (one_of_dict, rule_tuple)
+    return rule_tuple
+
+
 def check_one_of(cls: Any, values: tuple) -> tuple:
     """validatorValidator for supporting protobuf one_of"""
-    for one_of_name, one_of_dict in getattr(cls, "_one_of_dict", {}).items():  # type: str, OneOfTypedDict
-        have_value_name = sum([1 for one_of_field_name in one_of_dict["fields"] if one_of_field_name in values])
-        if have_value_name >= 2:
-            raise ValueError(f"OneOf:{one_of_name} has {have_value_name} value")
-        if one_of_dict.get("required", False) and have_value_name == 0:
+    for one_of_name, fields, required in get_one_of_rule(cls):
+        have_value: bool = False
+        for one_of_field_name in fields:
+            if one_of_field_name not in values:
+                continue
+            if have_value:
+                have_value_name = sum(1 for i in fields if i in values)
+                raise ValueError(f"OneOf:{one_of_name} has {have_value_name} value")
+            have_value = True
+        if required and not have_value:
             raise ValueError(f"OneOf:{one_of_name} must set value")
     return values
 
@@ -45,65 +139,65 @@ def check_one_of(cls: Any, values: tuple) -> tuple:
 # data validator #
 ##################
 def in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("in_", kwargs["field"])
-    if field_value is not None and v not in field_value:
-        raise ValueError(f"{field_name}:{v} not in {field_value}")
+    rule: FieldRule = _get_field_rule("in_", kwargs["field"])
+    if rule.value is not None and not _contains(rule, v):
+        raise ValueError(f"{kwargs['field'].name}:{v} not in {rule.value}")
     return v
 
 
 def not_in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("not_in", kwargs["field"])
-    if field_value is not None and v in field_value:
-        raise ValueError(f"{field_name}:{v} in {field_value}")
+    rule: FieldRule = _get_field_rule("not_in", kwargs["field"])
+    if rule.value is not None and _contains(rule, v):
+        raise ValueError(f"{kwargs['field'].name}:{v} in {rule.value}")
     return v
 
 
 def any_in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("any_in", kwargs["field"])
-    if field_value is not None and isinstance(v, AnyMessage) and not (v.type_url in field_value or v in field_value):
-        raise ValueError(f"{field_name}.type_url:{v.type_url} not in {field_value}")
+    rule: FieldRule = _get_field_rule("any_in", kwargs["field"])
+    if rule.value is not None and isinstance(v, AnyMessage) and not (_contains(rule, v.type_url) or _contains(rule, v)):
+        raise ValueError(f"{kwargs['field'].name}.type_url:{v.type_url} not in {rule.value}")
     return v
 
 
 def any_not_in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("any_not_in", kwargs["field"])
-    if field_value is not None and isinstance(v, AnyMessage) and (v.type_url in field_value or v in field_value):
-        raise ValueError(f"{field_name}.type_url:{v.type_url} in {field_value}")
+    rule: FieldRule = _get_field_rule("any_not_in", kwargs["field"])
+    if rule.value is not None and isinstance(v, AnyMessage) and (_contains(rule, v.type_url) or _contains(rule, v)):
+        raise ValueError(f"{kwargs['field'].name}.type_url:{v.type_url} in {rule.value}")
     return v
 
 
 def len_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("len", kwargs["field"])
+    field_value: Any = _get_field_value("len", kwargs["field"])
     if field_value is not None and len(v) != field_value:
-        raise ValueError(f"{field_name} length does not equal {field_value}")
+        raise ValueError(f"{kwargs['field'].name} length does not equal {field_value}")
     return v
 
 
 def prefix_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("prefix", kwargs["field"])
+    field_value: Any = _get_field_value("prefix", kwargs["field"])
     if field_value is not None and not v.startswith(field_value):
-        raise ValueError(f"{field_name} does not start with prefix {field_value}")
+        raise ValueError(f"{kwargs['field'].name} does not start with prefix {field_value}")
     return v
 
 
 def suffix_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("suffix", kwargs["field"])
+    field_value: Any = _get_field_value("suffix", kwargs["field"])
     if field_value is not None and not v.endswith(field_value):
-        raise ValueError(f"{field_name} does not end with suffix {field_value}")
+        raise ValueError(f"{kwargs['field'].name} does not end with suffix {field_value}")
     return v
 
 
 def contains_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("contains", kwargs["field"])
+    field_value: Any = _get_field_value("contains", kwargs["field"])
     if field_value is not None and field_value not in v:
-        raise ValueError(f"{field_name} value:{v} must contain {field_value}")
+        raise ValueError(f"{kwargs['field'].name} value:{v} must contain {field_value}")
     return v
 
 
 def not_contains_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("not_contains", kwargs["field"])
+    field_value: Any = _get_field_value("not_contains", kwargs["field"])
     if field_value is not None and field_value in v:
-        raise ValueError(f"{field_name} value :{v} must not contain {field_value}")
+        raise ValueError(f"{kwargs['field'].name} value :{v} must not contain {field_value}")
     return v
 
 
@@ -111,51 +205,51 @@ def not_contains_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
 # duration support #
 ####################
 def duration_lt_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("duration_lt", kwargs["field"])
+    field_value: Any = (kwargs.get("rule") or _get_field_rule("duration_lt", kwargs["field"])).value
     if field_value is not None and not (v < field_value):
-        raise ValueError(f"{field_name} must < {field_value}, not {v}")
+        raise ValueError(f"{kwargs['field'].name} must < {field_value}, not {v}")
     return v
 
 
 def duration_le_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("duration_le", kwargs["field"])
+    field_value: Any = (kwargs.get("rule") or _get_field_rule("duration_le", kwargs["field"])).value
     if field_value is not None and not (v <= field_value):
-        raise ValueError(f"{field_name} must <= {field_value}, not {v}")
+        raise ValueError(f"{kwargs['field'].name} must <= {field_value}, not {v}")
     return v
 
 
 def duration_gt_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("duration_gt", kwargs["field"])
+    field_value: Any = (kwargs.get("rule") or _get_field_rule("duration_gt", kwargs["field"])).value
     if field_value is not None and not (v > field_value):
-        raise ValueError(f"{field_name} must > {field_value}, not {v}")
+        raise ValueError(f"{kwargs['field'].name} must > {field_value}, not {v}")
     return v
 
 
 def duration_ge_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("duration_ge", kwargs["field"])
+    field_value: Any = (kwargs.get("rule") or _get_field_rule("duration_ge", kwargs["field"])).value
     if field_value is not None and not (v >= field_value):
-        raise ValueError(f"{field_name} must >= {field_value}, not {v}")
+        raise ValueError(f"{kwargs['field'].name} must >= {field_value}, not {v}")
     return v
 
 
 def duration_const_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("duration_const", kwargs["field"])
+    field_value: Any = (kwargs.get("rule") or _get_field_rule("duration_const", kwargs["field"])).value
     if field_value is not None and v != field_value:
-        raise ValueError(f"{field_name} must {field_value}, not {v}")
+        raise ValueError(f"{kwargs['field'].name} must {field_value}, not {v}")
     return v
 
 
 def duration_in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("duration_in", kwargs["field"])
-    if field_value is not None and v not in field_value:
-        raise ValueError(f"{field_name} not in {field_value}")
+    rule: FieldRule = kwargs.get("rule") or _get_field_rule("duration_in", kwargs["field"])
+    if rule.value is not None and not _contains(rule, v):
+        raise ValueError(f"{kwargs['field'].name} not in {rule.value}")
     return v
 
 
 def duration_not_in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("duration_not_in", kwargs["field"])
-    if field_value is not None and v in field_value:
-        raise ValueError(f"{field_name} in {field_value}")
+    rule: FieldRule = kwargs.get("rule") or _get_field_rule("duration_not_in", kwargs["field"])
+    if rule.value is not None and _contains(rule, v):
+        raise ValueError(f"{kwargs['field'].name} in {rule.value}")
     return v
 
 
@@ -170,102 +264,94 @@ def set_now_default_factory(now_default_factory: Callable[[], datetime]) -> None
     _now_default_factory = now_default_factory
 
 
+def _get_timestamp_rule(key: str, v: Any, field: ModelField) -> FieldRule:
+    return _get_field_rule(key, field, enable_timestamp_to_datetime=isinstance(v, datetime))
+
+
 def timestamp_lt_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs(
-        "timestamp_lt", kwargs["field"], enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
+    field_value: Any = (kwargs.get("rule") or _get_timestamp_rule("timestamp_lt", v, kwargs["field"])).value
     if field_value is not None and not (v < field_value):
-        raise ValueError(f"{field_name} must < {field_value}, not {v}")
+        raise ValueError(f"{kwargs['field'].name} must < {field_value}, not {v}")
     return v
 
 
 def timestamp_lt_now_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("timestamp_lt_now", kwargs["field"])
+    field_value: Any = (kwargs.get("rule") or _get_field_rule("timestamp_lt_now", kwargs["field"])).value
     if field_value is not None:
         if hasattr(field_value, "__call__"):
             now_time: datetime = field_value()
         else:
             now_time = _now_default_factory()
         if not v < now_time:
-            raise ValueError(f"{field_name} must < {now_time}, not {v}")
+            raise ValueError(f"{kwargs['field'].name} must < {now_time}, not {v}")
     return v
 
 
 def timestamp_le_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs(
-        "timestamp_le", kwargs["field"], enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
+    field_value: Any = (kwargs.get("rule") or _get_timestamp_rule("timestamp_le", v, kwargs["field"])).value
     if field_value is not None and not (v <= field_value):
-        raise ValueError(f"{field_name} must <= {field_value}, not {v}")
+        raise ValueError(f"{kwargs['field'].name} must <= {field_value}, not {v}")
     return v
 
 
 def timestamp_gt_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs(
-        "timestamp_gt", kwargs["field"], enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
+    field_value: Any = (kwargs.get("rule") or _get_timestamp_rule("timestamp_gt", v, kwargs["field"])).value
     if field_value is not None and not (v > field_value):
-        raise ValueError(f"{field_name} must > {field_value}, not {v}")
+        raise ValueError(f"{kwargs['field'].name} must > {field_value}, not {v}")
     return v
 
 
 def timestamp_gt_now_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("timestamp_gt_now", kwargs["field"])
+    field_value: Any = (kwargs.get("rule") or _get_field_rule("timestamp_gt_now", kwargs["field"])).value
     if field_value is not None:
         if hasattr(field_value, "__call__"):
             now_time: datetime = field_value()
         else:
             now_time = _now_default_factory()
         if not v > now_time:
-            raise ValueError(f"{field_name} must > {now_time}, not {v}")
+            raise ValueError(f"{kwargs['field'].name} must > {now_time}, not {v}")
     return v
 
 
 def timestamp_within_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("timestamp_within", kwargs["field"])
+    field_value: Any = (kwargs.get("rule") or _get_field_rule("timestamp_within", kwargs["field"])).value
     if field_value is not None:
         if hasattr(field_value, "__call__"):
             now_time: datetime = field_value()
         else:
             now_time = _now_default_factory()
         if not ((now_time - field_value) <= v <= (now_time + field_value)):
-            raise ValueError(f"{field_name} must between {now_time -field_value} and {now_time + field_value}, not {v}")
+            raise ValueError(
+                f"{kwargs['field'].name} must between {now_time -field_value} and {now_time + field_value}, not {v}"
+            )
     return v
 
 
 def timestamp_ge_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs(
-        "timestamp_ge", kwargs["field"], enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
+    field_value: Any = (kwargs.get("rule") or _get_timestamp_rule("timestamp_ge", v, kwargs["field"])).value
     if field_value is not None and not (v >= field_value):
-        raise ValueError(f"{field_name} must >= {field_value}, not {v}")
+        raise ValueError(f"{kwargs['field'].name} must >= {field_value}, not {v}")
     return v
 
 
 def timestamp_const_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs(
-        "timestamp_const", kwargs["field"], enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
+    field_value: Any = (kwargs.get("rule") or _get_timestamp_rule("timestamp_const", v, kwargs["field"])).value
     if field_value is not None and v != field_value:
-        raise ValueError(f"{field_name} must {field_value}, not {v}")
+        raise ValueError(f"{kwargs['field'].name} must {field_value}, not {v}")
     return v
 
 
 def timestamp_in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs(
-        "timestamp_in", kwargs["field"], enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
-    if field_value is not None and v not in field_value:
-        raise ValueError(f"{field_name} not in {field_value}")
+    rule: FieldRule = kwargs.get("rule") or _get_timestamp_rule("timestamp_in", v, kwargs["field"])
+    if rule.value is not None and not _contains(rule, v):
+        raise ValueError(f"{kwargs['field'].name} not in {rule.value}")
     return v
 
 
 def timestamp_not_in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs(
-        "timestamp_not_in", kwargs["field"], enable_timestamp_to_datetime=isinstance(v, datetime)
-    )
-    if field_value is not None and v in field_value:
-        raise ValueError(f"{field_name} in {field_value}")
+    rule: FieldRule = kwargs.get("rule") or _get_timestamp_rule("timestamp_not_in", v, kwargs["field"])
+    if rule.value is not None and _contains(rule, v):
+        raise ValueError(f"{kwargs['field'].name} in {rule.value}")
     return v
 
 
@@ -273,16 +359,16 @@ def timestamp_not_in_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
 # map support #
 ###############
 def map_min_pairs_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("map_min_pairs", kwargs["field"])
+    field_value: Any = _get_field_value("map_min_pairs", kwargs["field"])
     if field_value is not None and len(v) < field_value:
-        raise ValueError(f"{field_name} length must >= {field_value}")
+        raise ValueError(f"{kwargs['field'].name} length must >= {field_value}")
     return v
 
 
 def map_max_pairs_validator(cls: Any, v: Any, **kwargs: Any) -> Any:
-    field_name, field_value = _get_name_value_from_kwargs("map_max_pairs", kwargs["field"])
+    field_value: Any = _get_field_value("map_max_pairs", kwargs["field"])
     if field_value is not None and len(v) > field_value:
-        raise ValueError(f"{field_name} length must <= {field_value}")
+        raise ValueError(f"{kwargs['field'].name} length must <= {field_value}")
     return v
 
 
@@ -14,6 +14,7 @@ from typing import (  # type: ignore
     List,
     Optional,
     Set,
+    Tuple,
     Type,
     Union,
     _GenericAlias,
@@ -23,11 +24,14 @@ from typing import (  # type: ignore
 from pydantic import BaseConfig, BaseModel
 from pydantic.fields import FieldInfo
 
-from protobuf_to_pydantic import customer_validator, gen_model
+from protobuf_to_pydantic import convert, customer_validator, gen_model
 from protobuf_to_pydantic.__version__ import __version__
 from protobuf_to_pydantic.customer_con_type import pydantic_con_dict
-from protobuf_to_pydantic.grpc_types import RepeatedCompositeContainer, RepeatedScalarContainer
-from protobuf_to_pydantic.util import format_content, replace_protobuf_type_to_python_type
+from protobuf_to_pydantic.grpc_types import Descriptor, RepeatedCompositeContainer, RepeatedScalarContainer
+from protobuf_to_pydantic.util import LRUCache, format_content, replace_protobuf_type_to_python_type
+
+# The FileDescriptor -> the name of the imported `_pb2` module
+_pb2_module_name_cache: LRUCache[str] = LRUCache(maxsize=1024)
 
 
 class BaseP2C(object):
@@ -49,12 +53,14 @@ class BaseP2C(object):
         module_path: str = "",
         code_indent: Optional[int] = None,
         pyproject_file_path: str = "",
+        gen_protobuf_method: bool = False,
     ):
         self._import_set: Set[str] = customer_import_set or set()
         self._content_deque: Deque = customer_deque or deque()
         self._create_set: Set[Type[BaseModel]] = set()
         self.code_indent: int = code_indent or 4
         self.pyproject_file_path: str = pyproject_file_path
+        self.gen_protobuf_method: bool = gen_protobuf_method
 
         # init module_path
         if module_path:
@@ -216,6 +222,8 @@ class BaseP2C(object):
 
     def _model_field_handle(self, model: Type[BaseModel], indent: int = 0) -> str:
         field_str: str = ""
+        # The enum class is shared by all models that use it, only the nested enum of the current model is ignored
+        nested_type_list: List[Any] = list(getattr(model, "_nested_message_dict", {}).values())
         for key, value in model.__fields__.items():
             value_outer_type = value.outer_type_
             value_type_name: str = getattr(value_outer_type, "__name__", "None")
@@ -225,7 +233,11 @@ class BaseP2C(object):
                 if inspect.isclass(value.type_) and issubclass(value.type_, IntEnum):
                     # Parse protobuf enum
                     self._import_set.add("from enum import IntEnum")
-                    enum_code: str = self._gen_enum_py_code(value.type_, indent=indent - self.code_indent)
+                    enum_code: str = self._gen_enum_py_code(
+                        value.type_,
+                        indent=indent - self.code_indent,
+                        ignore_nested_model=value.type_ in nested_type_list,
+                    )
                     if enum_code:
                         self._content_deque.append(enum_code)
                 else:
@@ -331,7 +343,20 @@ class BaseP2C(object):
         validator_str: str = self._model_validator_handle(model, indent=indent + self.code_indent)
         if validator_str:
             class_str += f"{validator_str}\n"
-        if not any([model.__doc__, config_class, nested_class_str, attribute_str, field_str, validator_str]):
+        protobuf_method_str: str = self._model_protobuf_method_handle(model, indent=indent + self.code_indent)
+        if protobuf_method_str:
+            class_str += f"{protobuf_method_str}\n"
+        if not any(
+            [
+                model.__doc__,
+                config_class,
+                nested_class_str,
+                attribute_str,
+                field_str,
+                validator_str,
+                protobuf_method_str,
+            ]
+        ):
             class_str += " " * (indent + self.code_indent) + "pass\n"
 
         if class_str.endswith("\n\n"):
@@ -463,6 +488,133 @@ class BaseP2C(object):
                 )
         return validator_str
 
+    def _gen_protobuf_method_code(
+        self, class_name: str, message_type_str: str, field_list: List[Tuple[str, str, str, bool]], indent: int = 0
+    ) -> str:
+        """Generate the `from_protobuf` and `to_protobuf` methods of the model
+
+        :param class_name: model class name
+        :param message_type_str: The code of protobuf message class, e.g: demo_pb2.UserMessage
+        :param field_list: (field name, container kind, value kind, check presence), see `convert.get_field_kind`
+        :param indent: method indent
+        """
+        self._add_import_code("google.protobuf.message", "Message")
+        self._add_import_code("protobuf_to_pydantic.convert", "msg_to_model")
+        body_indent: str = " " * (indent + self.code_indent)
+        statement_list: List[str] = []
+        for name, container_kind, value_kind, check_presence in field_list:
+            statement_list.extend(
+                self._gen_to_protobuf_field_code(name, container_kind, value_kind, check_presence, body_indent)
+            )
+
+        return (
+            f"{' ' * indent}@classmethod\n"
+            f'{" " * indent}def from_protobuf(cls, message: Message, validate: bool = True) -> "{class_name}":\n'
+            f"{body_indent}return msg_to_model(message, cls, validate=validate)\n\n"
+            f"{' ' * indent}def to_protobuf(self) -> {message_type_str}:\n"
+            f"{body_indent}message = {message_type_str}()\n"
+            + "".join(f"{line}\n" for line in statement_list)
+            + f"{body_indent}return message\n"
+        )
+
+    def _gen_to_protobuf_field_code(
+        self, name: str, container_kind: str, value_kind: str, check_presence: bool, indent: str
+    ) -> List[str]:
+        """Generate the code that assigns the model field to the message field"""
+        sub_indent: str = " " * self.code_indent
+
+        def _fill_code(target: str, value: str) -> str:
+            if value_kind == convert.MESSAGE:
+                return f"{target}.CopyFrom({value}.to_protobuf())"
+            elif value_kind == convert.ANY:
+                return f"{target}.CopyFrom({value})"
+            elif value_kind == convert.TIMESTAMP:
+                return f"{target}.FromDatetime({value})"
+            elif value_kind == convert.DURATION:
+                return f"{target}.FromTimedelta({value})"
+            else:
+                # Struct
+                return f"{target}.update({value})"
+
+        if value_kind == convert.EMPTY:
+            return []
+        elif container_kind == convert.SINGLE:
+            if value_kind == convert.SCALAR:
+                code_list: List[str] = [f"message.{name} = self.{name}"]
+            else:
+                code_list = [_fill_code(f"message.{name}", f"self.{name}")]
+        elif container_kind == convert.REPEATED:
+            if value_kind in (convert.SCALAR, convert.ANY):
+                code_list = [f"message.{name}.extend(self.{name})"]
+            elif value_kind == convert.MESSAGE:
+                code_list = [f"message.{name}.extend([item.to_protobuf() for item in self.{name}])"]
+            else:
+                code_list = [f"for item in self.{name}:", sub_indent + _fill_code(f"message.{name}.add()", "item")]
+        else:
+            if value_kind == convert.SCALAR:
+                code_list = [f"message.{name}.update(self.{name})"]
+            else:
+                code_list = [
+                    f"for key, value in self.{name}.items():",
+                    sub_indent + _fill_code(f"message.{name}[key]", "value"),
+                ]
+
+        # Same as `convert.model_to_msg`, the None value is not assigned (protobuf does not accept None)
+        if check_presence:
+            code_list = [f'if "{name}" in self.__fields_set__ and self.{name} is not None:'] + [
+                sub_indent + i for i in code_list
+            ]
+        elif container_kind == convert.SINGLE:
+            code_list = [f"if self.{name} is not None:"] + [sub_indent + i for i in code_list]
+        return [indent + i for i in code_list]
+
+    @staticmethod
+    def _get_pb2_module_name(descriptor: Descriptor) -> str:
+        """Get the name of the imported `_pb2` module to which the message belongs
+
+        The `__module__` of the message class is generated from the proto file path,
+        which may be different from the actual import path, so the imported modules are searched once per file
+        """
+        file_descriptor: Any = descriptor.file
+        module_name: Optional[str] = _pb2_module_name_cache.get(file_descriptor)
+        if module_name is not None:
+            return module_name
+        module_name = convert.get_message_class(descriptor).__module__
+        if getattr(sys.modules.get(module_name, None), "DESCRIPTOR", None) is not file_descriptor:
+            for name, module in list(sys.modules.items()):
+                if name.endswith("_pb2") and getattr(module, "DESCRIPTOR", None) is file_descriptor:
+                    module_name = name
+                    break
+            else:
+                # The module may be imported later, so the result is not cached
+                return module_name
+        _pb2_module_name_cache.set(file_descriptor, module_name)
+        return module_name
+
+    def _model_protobuf_method_handle(self, model: Type[BaseModel], indent: int = 0) -> str:
+        """Generate the `from_protobuf` and `to_protobuf` methods for the model generated by `msg_to_pydantic_model`"""
+        descriptor: Optional[Descriptor] = getattr(model, "_message_descriptor", None)
+        if not self.gen_protobuf_method or descriptor is None:
+            return ""
+        message_module_name: str = self._get_pb2_module_name(descriptor)
+        if "." in message_module_name:
+            package_name, message_module_name = message_module_name.rsplit(".", 1)
+            self._add_import_code(package_name, message_module_name)
+        else:
+            self._add_import_code(message_module_name)
+        message_path: str = descriptor.full_name
+        if descriptor.file.package:
+            message_path = message_path[len(descriptor.file.package) + 1 :]
+
+        field_list: List[Tuple[str, str, str, bool]] = []
+        for field in descriptor.fields:
+            if field.name not in model.__fields__:
+                continue
+            field_list.append((field.name, *convert.get_field_kind(field), convert.field_check_presence(field)))
+        return self._gen_protobuf_method_code(
+            model.__name__, f"{message_module_name}.{message_path}", field_list, indent=indent
+        )
+
 
 class P2C(BaseP2C):
     """
@@ -478,6 +630,7 @@ class P2C(BaseP2C):
         module_path: str = "",
         code_indent: Optional[int] = None,
         pyproject_file_path: str = "",
+        gen_protobuf_method: bool = False,
     ):
         super().__init__(
             customer_import_set=customer_import_set,
@@ -485,6 +638,7 @@ class P2C(BaseP2C):
             module_path=module_path,
             code_indent=code_indent,
             pyproject_file_path=pyproject_file_path,
+            gen_protobuf_method=gen_protobuf_method,
         )
         for _module in model:
             self._gen_pydantic_model_py_code_to_content_deque(_module)
@@ -498,6 +652,7 @@ def pydantic_model_to_py_code(
     code_indent: Optional[int] = None,
     p2c_class: Type[P2C] = P2C,
     pyproject_file_path: str = "",
+    gen_protobuf_method: bool = False,
 ) -> str:
     """
     :param model:  the model(s) to generate code for
@@ -507,6 +662,7 @@ def pydantic_model_to_py_code(
     :param code_indent: Code indentation, default is 4
     :param pyproject_file_path: pyproject.toml path
     :param p2c_class:  The class that actually executes
+    :param gen_protobuf_method: If True, generate the `from_protobuf` and `to_protobuf` methods for each model
     :return:
     """
     return p2c_class(
@@ -516,6 +672,7 @@ def pydantic_model_to_py_code(
         module_path=module_path,
         code_indent=code_indent,
         pyproject_file_path=pyproject_file_path,
+        gen_protobuf_method=gen_protobuf_method,
     ).content
 
 
@@ -529,6 +686,7 @@ def pydantic_model_to_py_file(
     code_indent: Optional[int] = None,
     pyproject_file_path: str = "",
     p2c_class: Type[P2C] = P2C,
+    gen_protobuf_method: bool = False,
 ) -> None:
     py_code_content: str = pydantic_model_to_py_code(
         *model,
@@ -538,6 +696,7 @@ def pydantic_model_to_py_file(
         code_indent=code_indent,
         pyproject_file_path=pyproject_file_path,
         p2c_class=p2c_class,
+        gen_protobuf_method=gen_protobuf_method,
     )
     with open(filename, mode=open_mode) as f:
         f.write(py_code_content)
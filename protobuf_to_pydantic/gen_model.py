@@ -3,17 +3,37 @@ import inspect
 import json
 from dataclasses import MISSING
 from enum import IntEnum
+from functools import partial
 from importlib import import_module
 from pathlib import Path
 from types import ModuleType
-from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, List, Optional, Tuple, Type, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 from pydantic import BaseModel, Field, root_validator
 from pydantic.fields import FieldInfo, Undefined
 from pydantic.typing import NoArgAnyCallable
 
-from protobuf_to_pydantic.customer_validator import check_one_of
+from protobuf_to_pydantic.convert import from_protobuf, to_protobuf
+from protobuf_to_pydantic.customer_con_type import get_con_type
+from protobuf_to_pydantic.customer_validator import check_one_of, get_one_of_rule
 from protobuf_to_pydantic.get_desc import (
+    get_desc_from_file_descriptor_proto,
     get_desc_from_p2p,
     get_desc_from_pgv,
     get_desc_from_proto_file,
@@ -22,12 +42,25 @@ from protobuf_to_pydantic.get_desc import (
 from protobuf_to_pydantic.grpc_types import (
     AnyMessage,
     Descriptor,
+    DescriptorPool,
+    EnumDescriptor,
     FieldDescriptor,
+    FileDescriptorProto,
+    FileDescriptorSet,
     Message,
     RepeatedCompositeContainer,
     RepeatedScalarContainer,
+    get_default_descriptor_pool,
+)
+from protobuf_to_pydantic.util import (
+    CacheInfo,
+    LRUCache,
+    Timedelta,
+    create_pydantic_model,
+    freeze_value,
+    resolve_lazy_model,
+    set_lazy_model_resolver,
 )
-from protobuf_to_pydantic.util import Timedelta, create_pydantic_model
 
 if TYPE_CHECKING:
     from protobuf_to_pydantic.types import DescFromOptionTypedDict, FieldInfoTypedDict, OneOfTypedDict
@@ -71,6 +104,8 @@ _message_default_factory_dict_by_type_name: Dict[str, Any] = {
     "Duration": Timedelta,
     "Any": AnyMessage,
 }
+# The enum classes created by M2P, key is (EnumDescriptor, whether the enum is used by the message of other file)
+EnumCacheType = Union[Dict[Tuple[EnumDescriptor, bool], Type[IntEnum]], LRUCache[Type[IntEnum]]]
 
 
 def check_dict_one_of(desc_dict: dict, key_list: List[str]) -> bool:
@@ -98,6 +133,30 @@ def replace_file_name_to_class_name(filename: str) -> str:
     return prefix
 
 
+# con func -> the param names of con func, None means the func is not a con func
+_con_func_param_cache: LRUCache[Optional[Tuple[str, ...]]] = LRUCache(maxsize=256)
+
+
+def _get_con_func_param_tuple(field_type: Any) -> Optional[Tuple[str, ...]]:
+    """If field_type is the func that creates constrained type(e.g. `pydantic.constr`), return its param names,
+    the result of each func is only reflected once"""
+    if inspect.isclass(field_type):
+        return None
+    try:
+        if field_type in _con_func_param_cache:
+            return _con_func_param_cache.get(field_type)
+    except TypeError:
+        # unhashable object is not a func
+        return None
+
+    field_type_model: Optional[ModuleType] = inspect.getmodule(field_type)
+    con_func_param_tuple: Optional[Tuple[str, ...]] = None
+    if field_type_model and field_type_model.__name__ in ("pydantic.types", "protobuf_to_pydantic.customer_con_type"):
+        con_func_param_tuple = tuple(inspect.signature(field_type).parameters.keys())
+    _con_func_param_cache.set(field_type, con_func_param_tuple)
+    return con_func_param_tuple
+
+
 def field_param_dict_handle(field_param_dict: dict, default: Any, default_factory: Optional[NoArgAnyCallable]) -> None:
     """Convert the data of field param to the data that pydantic.Base Model can receive"""
     # Handle complex relationships with different defaults
@@ -138,29 +197,24 @@ def field_param_dict_handle(field_param_dict: dict, default: Any, default_factor
         field_param_dict.update(extra)
 
     # type handle
-    field_type = field_param_dict.get("type_")
+    field_type: Any = field_param_dict.get("type_")
     sub_field_param_dict: Optional[dict] = field_param_dict.pop("sub", None)
-    field_type_model: Optional[ModuleType] = inspect.getmodule(field_type)
+    con_func_param_tuple: Optional[Tuple[str, ...]] = _get_con_func_param_tuple(field_type) if field_type else None
 
-    if (
-        field_type
-        and not inspect.isclass(field_type)
-        and field_type_model
-        and field_type_model.__name__ in ("pydantic.types", "protobuf_to_pydantic.customer_con_type")
-    ):
+    if con_func_param_tuple is not None:
         # support https://pydantic-docs.helpmanual.io/usage/types/#constrained-types
         # Parameters needed to extract `constrained-types`
         type_param_dict: dict = {}
-        for key in inspect.signature(field_type).parameters.keys():
+        for key in con_func_param_tuple:
             if key in field_param_dict:
                 type_param_dict[key] = field_param_dict.pop(key)
 
         if sub_field_param_dict and "type_" in sub_field_param_dict:
             # If a nested type is found, use the same treatment
             field_param_dict_handle(sub_field_param_dict, default, default_factory)
-            field_param_dict["type_"] = field_type(sub_field_param_dict["type_"], **type_param_dict)
+            field_param_dict["type_"] = get_con_type(field_type, sub_field_param_dict["type_"], **type_param_dict)
         else:
-            field_param_dict["type_"] = field_type(**type_param_dict)
+            field_param_dict["type_"] = get_con_type(field_type, **type_param_dict)
 
 
 class JsonAndDict(dict):
@@ -210,10 +264,154 @@ class MessagePaitModel(BaseModel):
     map_type: Optional[Dict[str, type]] = Field(None)
 
 
+class _ParamNotNormalizedError(Exception):
+    """The param can not be normalized by `gen_field_param_dict`, need to be validated by `MessagePaitModel`"""
+
+
+def _copy_value(value: Any) -> Any:
+    """Same as `BaseModel.dict()`, the containers are copied"""
+    if isinstance(value, dict):
+        return {k: _copy_value(v) for k, v in value.items()}
+    elif value.__class__ in (list, tuple, set, frozenset):
+        return value.__class__(_copy_value(i) for i in value)
+    elif isinstance(value, BaseModel) or (isinstance(value, (list, tuple)) and value.__class__ not in (list, tuple)):
+        # e.g. namedtuple
+        raise _ParamNotNormalizedError()
+    return value
+
+
+def _gen_param_normalizer(check: Callable[[Any], bool]) -> Callable[[Any], Any]:
+    def _normalizer(value: Any) -> Any:
+        if value is None or check(value):
+            return value
+        raise _ParamNotNormalizedError()
+
+    return _normalizer
+
+
+def _int_param_normalizer(value: Any) -> Any:
+    """Same as `Optional[int]` and `Union[int, float, None]` of pydantic v1,
+    the int validator is tried first, so the float is converted to int(e.g. 1.5 -> 1)"""
+    if value is None or (value.__class__ is int):
+        return value
+    elif value.__class__ is float and value == value and value not in (float("inf"), float("-inf")):
+        return int(value)
+    raise _ParamNotNormalizedError()
+
+
+def _dict_param_normalizer(check_value: Callable[[Any], bool]) -> Callable[[Any], Any]:
+    def _normalizer(value: Any) -> Any:
+        if value is None:
+            return value
+        if value.__class__ is dict and all(k.__class__ is str and check_value(v) for k, v in value.items()):
+            return _copy_value(value)
+        raise _ParamNotNormalizedError()
+
+    return _normalizer
+
+
+def _extra_param_normalizer(value: Any) -> Any:
+    """Same as `JsonAndDict`"""
+    if value.__class__ is str:
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            raise _ParamNotNormalizedError()
+    if value.__class__ is dict:
+        return _copy_value(value)
+    raise _ParamNotNormalizedError()
+
+
+def _sub_param_normalizer(value: Any) -> Any:
+    if value is None:
+        return value
+    if value.__class__ is dict:
+        return _gen_field_param_dict(value)
+    raise _ParamNotNormalizedError()
+
+
+_is_bool: Callable[[Any], bool] = lambda v: v.__class__ is bool  # noqa: E731
+_is_str: Callable[[Any], bool] = lambda v: v.__class__ is str  # noqa: E731
+# The normalizer of each field of MessagePaitModel, raise _ParamNotNormalizedError if the value needs to be validated
+_field_param_normalizer_dict: Dict[str, Callable[[Any], Any]] = {
+    "field": _gen_param_normalizer(lambda v: inspect.isclass(v) and issubclass(v, FieldInfo)),
+    "enable": _gen_param_normalizer(_is_bool),
+    "miss_default": _gen_param_normalizer(_is_bool),
+    "default": _copy_value,
+    "default_factory": _gen_param_normalizer(callable),
+    "example": _copy_value,
+    "example_factory": _gen_param_normalizer(callable),
+    "alias": _gen_param_normalizer(_is_str),
+    "title": _gen_param_normalizer(_is_str),
+    "description": _gen_param_normalizer(_is_str),
+    "const": _copy_value,
+    "gt": _int_param_normalizer,
+    "ge": _int_param_normalizer,
+    "lt": _int_param_normalizer,
+    "le": _int_param_normalizer,
+    "min_length": _int_param_normalizer,
+    "max_length": _int_param_normalizer,
+    "min_items": _int_param_normalizer,
+    "max_items": _int_param_normalizer,
+    "unique_items": _gen_param_normalizer(_is_bool),
+    "multiple_of": _int_param_normalizer,
+    "regex": _gen_param_normalizer(_is_str),
+    "extra": _extra_param_normalizer,
+    "type_": _copy_value,
+    "validator": _dict_param_normalizer(lambda v: True),
+    "sub": _sub_param_normalizer,
+    "map_type": _dict_param_normalizer(inspect.isclass),
+}
+# (key of param, field name, default, default factory) in the order of MessagePaitModel fields
+_field_param_list: List[Tuple[str, str, Any, Optional[Callable]]] = [
+    (model_field.alias, name, model_field.default, model_field.default_factory)
+    for name, model_field in MessagePaitModel.__fields__.items()
+]
+
+
+def _gen_field_param_dict(field_doc_dict: dict) -> dict:
+    field_param_dict: dict = {}
+    for key, name, default, default_factory in _field_param_list:
+        if key in field_doc_dict:
+            field_param_dict[name] = _field_param_normalizer_dict[name](field_doc_dict[key])
+        else:
+            field_param_dict[name] = default_factory() if default_factory else default
+    return field_param_dict
+
+
+def gen_field_param_dict(field_doc_dict: dict) -> dict:
+    """Same as `MessagePaitModel(**field_doc_dict).dict()`, but the params that are already valid are not validated
+    by pydantic, only the params that need to be converted (or invalid) are handed over to `MessagePaitModel`"""
+    try:
+        return _gen_field_param_dict(field_doc_dict)
+    except _ParamNotNormalizedError:
+        return MessagePaitModel(**field_doc_dict).dict()
+
+
+# (DescTemplate class, template str, id of local_dict) -> (local_dict, template value)
+_template_cache: LRUCache[Tuple[Optional[dict], Any]] = LRUCache(maxsize=4096)
+
+
+def clear_template_cache() -> None:
+    """Clear the resolved template values of `DescTemplate` and reset its statistics"""
+    _template_cache.clear()
+
+
+def get_template_cache_info() -> CacheInfo:
+    """Get the hits, misses, maxsize and currsize of the resolved template values of `DescTemplate`"""
+    return _template_cache.info()
+
+
 class DescTemplate(object):
+    # The value of these templates is cached by template str and local_dict (the local_dict should not be changed
+    #  after used), the templates of subclass are not cached unless they are added to it, e.g.
+    #  `cache_template_set = DescTemplate.cache_template_set | {"demo"}`
+    cache_template_set: FrozenSet[str] = frozenset({"import", "import_instance", "local", "builtin"})
+
     def __init__(self, local_dict: dict, comment_prefix: str) -> None:
         self._local_dict: dict = local_dict
         self._comment_prefix: str = comment_prefix
+        self._template_prefix: str = f"{comment_prefix}@"
         self._support_template_list: List[str] = [i for i in dir(self) if i.startswith("template")]
 
     def template_import_instance(self, module_str: str, var_str: str, json_param: str) -> Any:
@@ -245,20 +443,42 @@ class DescTemplate(object):
             template_fn: Optional[Callable] = getattr(self, f"template_{template_rule}", None)
             if not template_fn:
                 raise ValueError(f"Only support {' ,'.join(self._support_template_list)}. not {template_str}")
-            return template_fn(*template_var_list)
+            if template_rule not in self.cache_template_set:
+                return template_fn(*template_var_list)
+
+            # The empty local_dict are the same
+            local_dict: Optional[dict] = self._local_dict or None
+            # The local_dict is kept by the cache value, so its id will not be reused by other dict
+            cache_key: Tuple[type, str, int] = (self.__class__, template_str, id(local_dict))
+            cache_value: Optional[Tuple[Optional[dict], Any]] = _template_cache.get(cache_key)
+            if cache_value is None:
+                cache_value = _template_cache.setdefault(cache_key, (local_dict, template_fn(*template_var_list)))
+            return cache_value[1]
         except Exception as e:
             raise ValueError(f"parse {template_str} error: {e}") from e
 
+    def _has_template_var(self, container: Any) -> bool:
+        if isinstance(container, str):
+            return container.startswith(self._template_prefix)
+        elif isinstance(container, dict):
+            return any(self._has_template_var(i) for i in container.values())
+        elif isinstance(container, list):
+            return any(self._has_template_var(i) for i in container)
+        # The protobuf container needs to be converted to list
+        return isinstance(container, (RepeatedCompositeContainer, RepeatedScalarContainer))
+
     def handle_template_var(self, container: Any) -> Any:
-        if isinstance(container, (list, RepeatedCompositeContainer, RepeatedScalarContainer)):
+        """Replace the template var in the container with the value of template,
+        the container that does not contain template var is returned as is instead of being rebuilt"""
+        if not self._has_template_var(container):
+            return container
+        elif isinstance(container, (list, RepeatedCompositeContainer, RepeatedScalarContainer)):
             return [self.handle_template_var(i) for i in container]
         elif isinstance(container, dict):
             return {k: self.handle_template_var(v) for k, v in container.items()}
-        elif isinstance(container, str) and container.startswith(f"{self._comment_prefix}@"):
-            container = container.replace(f"{self._comment_prefix}@", "")
-            return self._template_str_handler(container)
         else:
-            return container
+            container = container.replace(self._template_prefix, "")
+            return self._template_str_handler(container)
 
 
 class M2P(object):
@@ -274,9 +494,17 @@ class M2P(object):
         desc_template: Optional[Type[DescTemplate]] = None,
         message_type_dict_by_type_name: Optional[Dict[str, Any]] = None,
         message_default_factory_dict_by_type_name: Optional[Dict[str, Any]] = None,
+        lazy: bool = False,
+        creat_cache: Optional[Dict[Descriptor, Type[BaseModel]]] = None,
+        enum_cache: "Optional[EnumCacheType]" = None,
+        file_desc_cache: "Optional[Dict[str, Dict[str, DescFromOptionTypedDict]]]" = None,
     ):
-        proto_file_name = msg.DESCRIPTOR.file.name  # type: ignore
+        descriptor: Descriptor = msg if isinstance(msg, Descriptor) else msg.DESCRIPTOR
+        proto_file_name = descriptor.file.name
         message_field_dict: Dict[str, "DescFromOptionTypedDict"] = {}
+        # The desc parsed from the Options of message is keyed by the full name of message,
+        # the desc parsed from the comments of file is keyed by the name of message in the file
+        self._desc_key_by_full_name: bool = False
 
         if proto_file_name.endswith("empty.proto") or parse_msg_desc_method == "ignore":
             pass
@@ -292,22 +520,38 @@ class M2P(object):
             if not Path(pyi_file_name).exists():
                 raise RuntimeError(f"Can not found {msg} pyi file")
             message_field_dict = get_desc_from_pyi_file(pyi_file_name, comment_prefix)
+        elif isinstance(parse_msg_desc_method, (FileDescriptorSet, FileDescriptorProto)):
+            # The desc of the file can be shared by multiple M2P through the same file_desc_cache,
+            # so that the `SourceCodeInfo` of the file is only parsed once
+            if file_desc_cache is not None and proto_file_name in file_desc_cache:
+                message_field_dict = file_desc_cache[proto_file_name]
+            else:
+                message_field_dict = get_desc_from_file_descriptor_proto(
+                    self._get_file_descriptor_proto(parse_msg_desc_method, proto_file_name), comment_prefix
+                )
+                if file_desc_cache is not None:
+                    file_desc_cache[proto_file_name] = message_field_dict
         elif parse_msg_desc_method == "PGV":
             message_field_dict = get_desc_from_pgv(message=msg)  # type: ignore
+            self._desc_key_by_full_name = True
         elif parse_msg_desc_method is not None:
             import os
 
             raise ValueError(
-                f"parse_msg_desc_method param must be exist path, `ignore` or `PGV`,"
+                f"parse_msg_desc_method param must be exist path, module, FileDescriptorSet, `ignore` or `PGV`,"
                 f" not {parse_msg_desc_method}), now path:{os.getcwd()}"
             )
         else:
             message_field_dict = get_desc_from_p2p(message=msg)  # type: ignore
+            self._desc_key_by_full_name = True
         self._parse_msg_desc_method: Optional[str] = parse_msg_desc_method
         self._field_doc_dict: Dict[str, DescFromOptionTypedDict] = message_field_dict
         self._default_field = default_field
         self._comment_prefix = comment_prefix
-        self._creat_cache: Dict[Union[Type[Message], Descriptor], Type[BaseModel]] = {}
+        # The models can be shared by multiple M2P through the same creat_cache
+        self._creat_cache: Dict[Descriptor, Type[BaseModel]] = {} if creat_cache is None else creat_cache
+        # Each protobuf enum maps to exactly one enum class, the enum classes can be shared by the same enum_cache
+        self._enum_cache: EnumCacheType = {} if enum_cache is None else enum_cache
         self._pydantic_base: Type["BaseModel"] = pydantic_base or BaseModel
         self._pydantic_module: str = pydantic_module or __name__
         self._desc_template: DescTemplate = (desc_template or DescTemplate)(local_dict or {}, self._comment_prefix)
@@ -317,17 +561,31 @@ class M2P(object):
         self._message_default_factory_dict_by_type_name: Dict[str, Any] = (
             message_default_factory_dict_by_type_name or _message_default_factory_dict_by_type_name
         )
+        self._lazy: bool = lazy
 
-        self._gen_model: Type[BaseModel] = self._parse_msg_to_pydantic_model(
-            descriptor=msg if isinstance(msg, Descriptor) else msg.DESCRIPTOR,
-        )
+        self._gen_model: Type[BaseModel] = self._parse_msg_to_pydantic_model(descriptor=descriptor)
+
+    @staticmethod
+    def _get_file_descriptor_proto(
+        file_descriptor: Union[FileDescriptorSet, FileDescriptorProto], proto_file_name: str
+    ) -> FileDescriptorProto:
+        if isinstance(file_descriptor, FileDescriptorProto):
+            if file_descriptor.name != proto_file_name:
+                raise ValueError(f"Not the FileDescriptorProto corresponding to {proto_file_name}")
+            return file_descriptor
+        for fd in file_descriptor.file:
+            if fd.name == proto_file_name:
+                return fd
+        raise ValueError(f"Can not found {proto_file_name} in FileDescriptorSet")
 
     @property
     def model(self) -> Type[BaseModel]:
         return self._gen_model
 
     def _one_of_handle(self, descriptor: Descriptor) -> Dict[str, "OneOfTypedDict"]:
-        desc_dict: "DescFromOptionTypedDict" = self._field_doc_dict.get(descriptor.name, {})  # type: ignore
+        desc_dict: "DescFromOptionTypedDict" = self._field_doc_dict.get(
+            descriptor.full_name if self._desc_key_by_full_name else descriptor.name, {}  # type: ignore
+        )
         one_of_dict: Dict[str, "OneOfTypedDict"] = {}
         for one_of in descriptor.oneofs:
             column_name: str = one_of.full_name
@@ -366,8 +624,11 @@ class M2P(object):
 
         # nested support
         nested_message_dict: Dict[str, Type[Union[BaseModel, IntEnum]]] = {}
+        # In lazy mode, the referenced message model is created when the model is resolved,
+        # key is the forward ref name, value is the function that creates the model
+        lazy_ref_dict: Dict[str, Callable[[], Type[BaseModel]]] = {}
         for message in descriptor.nested_types:
-            if message.name.endswith("Entry"):
+            if message.name.endswith("Entry") or self._lazy:
                 continue
             nested_type: Any = self._parse_msg_to_pydantic_model(descriptor=message)
             nested_message_dict[message.full_name] = nested_type
@@ -375,9 +636,7 @@ class M2P(object):
             setattr(nested_type, "_is_nested", True)
 
         for enum_type in descriptor.enum_types:
-            class_dict: dict = {v.name: v.number for v in enum_type.values}
-            class_dict["__doc__"] = ""
-            nested_type = IntEnum(enum_type.name, class_dict)  # type: ignore
+            nested_type = self._get_enum_model(descriptor, enum_type)
             nested_message_dict[enum_type.full_name] = nested_type
             # Facilitate the analysis of `gen code`
             setattr(nested_type, "_is_nested", True)
@@ -405,6 +664,12 @@ class M2P(object):
                             k_v_type: Any = type_dict[k_v_field.type]
                         elif k_v_field.message_type.name in self._message_type_dict_by_type_name:
                             k_v_type = self._message_type_dict_by_type_name[k_v_field.message_type.name]
+                        elif self._lazy:
+                            k_v_type = self._add_lazy_ref(
+                                lazy_ref_dict,
+                                k_v_field.message_type,
+                                partial(self._parse_msg_to_pydantic_model, descriptor=k_v_field.message_type),
+                            )
                         else:
                             k_v_type = self._parse_msg_to_pydantic_model(descriptor=k_v_field.message_type)
                         dict_type_param_list.append(k_v_type)
@@ -415,44 +680,24 @@ class M2P(object):
                     # support google.protobuf.Message
                     if column.message_type.full_name in nested_message_dict:
                         type_ = nested_message_dict[column.message_type.full_name]
+                    elif self._lazy:
+                        type_ = self._add_lazy_ref(
+                            lazy_ref_dict,
+                            column.message_type,
+                            partial(self._get_message_model, descriptor, column.message_type),
+                        )
+                    elif column.message_type.full_name == descriptor.full_name:
+                        # if self-referencing, need use Python type hints postponed annotations
+                        type_ = f'"{column.message_type.name}"'
                     else:
-                        is_same_pkg: bool = descriptor.file.name == column.message_type.file.name
-                        _class_name: str = column.message_type.name
-                        if not is_same_pkg:
-                            _class_name = replace_file_name_to_class_name(column.message_type.file.name) + _class_name
-                            type_ = self._parse_msg_to_pydantic_model(
-                                descriptor=column.message_type, class_name=_class_name
-                            )
-                            _class_doc: str = (
-                                "Note: The current class does not belong to the package\n"
-                                f"{_class_name} protobuf path:{column.message_type.file.name}"
-                            )
-                            setattr(type_, "__doc__", _class_doc)
-                        else:
-                            if column.message_type.full_name == descriptor.full_name:
-                                # if self-referencing, need use Python type hints postponed annotations
-                                type_ = f'"{_class_name}"'
-                            else:
-                                type_ = self._parse_msg_to_pydantic_model(
-                                    descriptor=column.message_type, class_name=_class_name
-                                )
+                        type_ = self._get_message_model(descriptor, column.message_type)
             elif column.type == FieldDescriptor.TYPE_ENUM:
                 # support google.protobuf.Enum
                 default = 0
                 if column.enum_type.full_name in nested_message_dict:
                     type_ = nested_message_dict[column.enum_type.full_name]
                 else:
-                    enum_class_dict = {v.name: v.number for v in column.enum_type.values}
-                    _class_name = column.enum_type.name
-                    _class_doc = ""
-                    if descriptor.file.name != column.enum_type.file.name:
-                        _class_name = replace_file_name_to_class_name(column.enum_type.file.name) + _class_name
-                        _class_doc = (
-                            "Note: The current class does not belong to the package\n"
-                            f"{_class_name} protobuf path:{column.enum_type.file.name}"
-                        )
-                    enum_class_dict["__doc__"] = _class_doc
-                    type_ = IntEnum(_class_name, enum_class_dict)  # type: ignore
+                    type_ = self._get_enum_model(descriptor, column.enum_type)
             else:
                 if column.label == FieldDescriptor.LABEL_REQUIRED:
                     default = Undefined
@@ -476,7 +721,7 @@ class M2P(object):
                     # pgv method not support template var
                     field_doc_dict = self._desc_template.handle_template_var(field_doc_dict)
 
-                field_param_dict: dict = MessagePaitModel(**field_doc_dict).dict()  # type: ignore
+                field_param_dict: dict = gen_field_param_dict(field_doc_dict)  # type: ignore
                 # Nested types do not include the `enable`, `field` and `validator`  attributes
                 if not field_param_dict.pop("enable"):
                     continue
@@ -521,12 +766,73 @@ class M2P(object):
             pydantic_base=self._get_pydantic_base(pydantic_model_config_dict),
         )
         setattr(pydantic_model, "_one_of_dict", one_of_dict)
+        if one_of_dict:
+            # Compile the one_of rules in advance
+            get_one_of_rule(pydantic_model)
         setattr(pydantic_model, "_base_model", self._pydantic_base)
+        setattr(pydantic_model, "_message_descriptor", descriptor)
+        # Support `Model.from_protobuf(message)` and `model.to_protobuf()`
+        setattr(pydantic_model, "from_protobuf", classmethod(from_protobuf))
+        setattr(pydantic_model, "to_protobuf", to_protobuf)
         # Facilitate the analysis of `gen code`
         setattr(pydantic_model, "_nested_message_dict", nested_message_dict)
+        if lazy_ref_dict:
+            set_lazy_model_resolver(pydantic_model, partial(self._resolve_lazy_ref, pydantic_model, lazy_ref_dict))
         self._creat_cache[descriptor] = pydantic_model
         return pydantic_model
 
+    def _get_message_model(self, descriptor: Descriptor, message_descriptor: Descriptor) -> Type[BaseModel]:
+        """Get the model of the message referenced by the field of descriptor"""
+        if descriptor.file.name == message_descriptor.file.name or message_descriptor in self._creat_cache:
+            return self._parse_msg_to_pydantic_model(descriptor=message_descriptor, class_name=message_descriptor.name)
+
+        class_name: str = replace_file_name_to_class_name(message_descriptor.file.name) + message_descriptor.name
+        model: Type[BaseModel] = self._parse_msg_to_pydantic_model(descriptor=message_descriptor, class_name=class_name)
+        class_doc: str = (
+            "Note: The current class does not belong to the package\n"
+            f"{class_name} protobuf path:{message_descriptor.file.name}"
+        )
+        setattr(model, "__doc__", class_doc)
+        return model
+
+    def _get_enum_model(self, descriptor: Descriptor, enum_descriptor: EnumDescriptor) -> Type[IntEnum]:
+        """Get the enum class of the enum used by descriptor, the enum class is only created on first use.
+        Note: The class name and doc only depend on the enum and whether it is defined in the file of descriptor
+         (the enum of other file is named with its file name), not on which message uses the enum first"""
+        is_other_file: bool = descriptor.file.name != enum_descriptor.file.name
+        cache_key: Tuple[EnumDescriptor, bool] = (enum_descriptor, is_other_file)
+        enum_model: Optional[Type[IntEnum]] = self._enum_cache.get(cache_key)
+        if enum_model is not None:
+            return enum_model
+
+        class_dict: dict = {v.name: v.number for v in enum_descriptor.values}
+        class_name: str = enum_descriptor.name
+        class_doc: str = ""
+        if is_other_file:
+            class_name = replace_file_name_to_class_name(enum_descriptor.file.name) + class_name
+            class_doc = (
+                "Note: The current class does not belong to the package\n"
+                f"{class_name} protobuf path:{enum_descriptor.file.name}"
+            )
+        class_dict["__doc__"] = class_doc
+        # If the enum class is created by other threads at the same time, use the first one
+        return self._enum_cache.setdefault(cache_key, IntEnum(class_name, class_dict))  # type: ignore
+
+    @staticmethod
+    def _add_lazy_ref(
+        lazy_ref_dict: Dict[str, Callable[[], Type[BaseModel]]],
+        message_descriptor: Descriptor,
+        gen_model: Callable[[], Type[BaseModel]],
+    ) -> str:
+        """Use the forward ref instead of the model of message, return the forward ref name"""
+        ref_name: str = "_P2PLazyRef__" + message_descriptor.full_name.replace(".", "__")
+        lazy_ref_dict.setdefault(ref_name, gen_model)
+        return ref_name
+
+    @staticmethod
+    def _resolve_lazy_ref(model: Type[BaseModel], lazy_ref_dict: Dict[str, Callable[[], Type[BaseModel]]]) -> None:
+        model.update_forward_refs(**{ref_name: gen_model() for ref_name, gen_model in lazy_ref_dict.items()})
+
     def _gen_dict_from_desc_str(self, desc: str) -> dict:
         pait_dict: dict = {}
         for line in desc.split("\n"):
@@ -538,6 +844,12 @@ class M2P(object):
         return pait_dict
 
     def _get_field_info_dict_by_full_name(self, full_name: str) -> Optional["FieldInfoTypedDict"]:
+        if self._desc_key_by_full_name:
+            message_full_name, field_name = full_name.rsplit(".", 1)
+            if message_full_name not in self._field_doc_dict:
+                return None
+            return self._field_doc_dict[message_full_name]["message"].get(field_name)
+
         message_name, *key_list = full_name.split(".")[1:]  # ignore package name
         if message_name not in self._field_doc_dict:
             return None
@@ -553,6 +865,36 @@ class M2P(object):
         return None
 
 
+_model_cache: LRUCache[Type[BaseModel]] = LRUCache(maxsize=1024)
+# The enum classes shared by all models of `msg_to_pydantic_model`, key is the same as `EnumCacheType`,
+# it is bounded like the model cache so that the enum descriptors(and their pools) that are no longer used can be freed
+_enum_cache: LRUCache[Type[IntEnum]] = LRUCache(maxsize=1024)
+
+
+def clear_model_cache() -> None:
+    """Clear the model cache(and the enum classes) used by `msg_to_pydantic_model` and reset its statistics"""
+    _model_cache.clear()
+    _enum_cache.clear()
+
+
+def get_model_cache_info() -> CacheInfo:
+    """Get the hits, misses, maxsize and currsize of the model cache used by `msg_to_pydantic_model`"""
+    return _model_cache.info()
+
+
+def set_model_cache_size(maxsize: Optional[int]) -> None:
+    """Set the max size of the model cache, None means unlimited, 0 means disable cache"""
+    _model_cache.set_maxsize(maxsize)
+
+
+def _gen_model_cache_key(msg: Union[Type[Message], Descriptor], **kwargs: Any) -> Any:
+    descriptor: Descriptor = msg if isinstance(msg, Descriptor) else msg.DESCRIPTOR
+    file_descriptor: Any = descriptor.file
+    # The same full_name may come from different versions of the protobuf file (e.g. different descriptor pool)
+    file_key: Any = (file_descriptor.name, hash(file_descriptor.serialized_pb))
+    return descriptor.full_name, file_key, freeze_value(kwargs)
+
+
 def msg_to_pydantic_model(
     msg: Union[Type[Message], Descriptor],
     default_field: Type[FieldInfo] = FieldInfo,
@@ -564,6 +906,8 @@ def msg_to_pydantic_model(
     desc_template: Optional[Type[DescTemplate]] = None,
     message_type_dict_by_type_name: Optional[Dict[str, Any]] = None,
     message_default_factory_dict_by_type_name: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True,
+    lazy: bool = False,
 ) -> Type[BaseModel]:
     """
     Parse a message to a pydantic model
@@ -581,15 +925,25 @@ def msg_to_pydantic_model(
          Note: The extracted content is a text comment in the Protobuf file
         4.If the value is PGV, the corresponding PGV information is extracted from the Message object
         5.If the value is None (default), the P2P information is extracted from the Message)
+        6.If the value is a FileDescriptorSet (or FileDescriptorProto) with `SourceCodeInfo`
+         (e.g. generated by `protoc --include_source_info --descriptor_set_out`),
+         it is extracted from the comments in the `SourceCodeInfo`, no need to parse the Protobuf file
+         Note: The extracted content is a text comment in the Protobuf file
     :param local_dict: The variables corresponding to the p2p@local template
     :param pydantic_base: custom pydantic.BaseModel
     :param pydantic_module: custom create model's module name
     :param desc_template: DescTemplate object, which can extend and modify template adaptation rules through inheritance
     :param message_type_dict_by_type_name: Define the Python type mapping corresponding to each Protobuf Type
     :param message_default_factory_dict_by_type_name: Define the default_factory corresponding to each Protobuf Type
+    :param use_cache: If True, the same message with the same parameters will return the same model from
+        the process-wide model cache (see `clear_model_cache` and `set_model_cache_size`),
+        the model is not cached if the params contain unhashable value (e.g. a bytearray value of `local_dict`)
+    :param lazy: If True, the models of the nested and referenced messages are not created in advance,
+        they are created on the first validation(or conversion) of the model that uses them
+        (or call `protobuf_to_pydantic.util.resolve_lazy_model`).
+        Note: The lazy model is only for runtime use, can not be used to generate code
     """
-    return M2P(
-        msg=msg,
+    param_dict: Dict[str, Any] = dict(
         default_field=default_field,
         comment_prefix=comment_prefix,
         parse_msg_desc_method=parse_msg_desc_method,
@@ -599,4 +953,220 @@ def msg_to_pydantic_model(
         desc_template=desc_template,
         message_type_dict_by_type_name=message_type_dict_by_type_name,
         message_default_factory_dict_by_type_name=message_default_factory_dict_by_type_name,
-    ).model
+        lazy=lazy,
+    )
+    if not use_cache:
+        return M2P(msg=msg, **param_dict).model
+    try:
+        cache_key: Any = _gen_model_cache_key(msg, **param_dict)
+    except TypeError:
+        # The params contain unhashable value, can not be cached
+        return M2P(msg=msg, **param_dict).model
+
+    model: Optional[Type[BaseModel]] = _model_cache.get(cache_key)
+    if model is None:
+        # If other threads have already built the model, use theirs so that identical messages share one class
+        model = _model_cache.setdefault(cache_key, M2P(msg=msg, enum_cache=_enum_cache, **param_dict).model)
+    return model
+
+
+class ModelRegistry(Mapping[str, Type[BaseModel]]):
+    """The models generated by `pool_to_pydantic_models`, key is the full name of Message"""
+
+    def __init__(self, model_dict: Dict[str, Type[BaseModel]], pool: DescriptorPool) -> None:
+        self._model_dict: Dict[str, Type[BaseModel]] = model_dict
+        self.pool: DescriptorPool = pool
+
+    def __getitem__(self, full_name: str) -> Type[BaseModel]:
+        return self._model_dict[full_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._model_dict)
+
+    def __len__(self) -> int:
+        return len(self._model_dict)
+
+
+def _gen_pool_from_file_descriptor_set(file_descriptor_set: FileDescriptorSet) -> DescriptorPool:
+    """Add the files of FileDescriptorSet to a new descriptor pool in the order of their dependencies"""
+    pool: DescriptorPool = DescriptorPool()
+    file_descriptor_proto_dict: Dict[str, FileDescriptorProto] = {
+        file_descriptor_proto.name: file_descriptor_proto for file_descriptor_proto in file_descriptor_set.file
+    }
+    added_file_name_set: Set[str] = set()
+
+    def _add_file(file_name: str) -> None:
+        if file_name in added_file_name_set:
+            return
+        added_file_name_set.add(file_name)
+        file_descriptor_proto: Optional[FileDescriptorProto] = file_descriptor_proto_dict.get(file_name, None)
+        if file_descriptor_proto is None:
+            # The dependency not in the FileDescriptorSet (e.g. google/protobuf/timestamp.proto)
+            file_descriptor_proto = FileDescriptorProto()
+            get_default_descriptor_pool().FindFileByName(file_name).CopyToProto(file_descriptor_proto)
+        for dependency in file_descriptor_proto.dependency:
+            _add_file(dependency)
+        pool.Add(file_descriptor_proto)
+
+    for file_name in file_descriptor_proto_dict:
+        _add_file(file_name)
+    return pool
+
+
+def _get_message_dependency_list(
+    descriptor: Descriptor, message_type_dict_by_type_name: Dict[str, Any]
+) -> List[Descriptor]:
+    """Get the messages that need to be created before the model of descriptor is created(same as M2P)"""
+    dependency_list: List[Descriptor] = [i for i in descriptor.nested_types if not i.name.endswith("Entry")]
+    for field in descriptor.fields:
+        message_type: Optional[Descriptor] = field.message_type
+        if message_type is None or message_type.name in message_type_dict_by_type_name:
+            continue
+        if message_type.name.endswith("Entry"):
+            dependency_list.extend(
+                k_v_field.message_type
+                for k_v_field in message_type.fields
+                if k_v_field.message_type and k_v_field.message_type.name not in message_type_dict_by_type_name
+            )
+        elif message_type.full_name != descriptor.full_name:
+            # self-referencing is supported by M2P
+            dependency_list.append(message_type)
+    return dependency_list
+
+
+def _get_strongly_connected_component_list(
+    descriptor_list: List[Descriptor], get_dependency_list: Callable[[Descriptor], List[Descriptor]]
+) -> List[List[Descriptor]]:
+    """Tarjan's algorithm(non-recursive), the component is after all the components it depends on"""
+    index_dict: Dict[str, int] = {}
+    low_link_dict: Dict[str, int] = {}
+    stack: List[Descriptor] = []
+    on_stack_set: Set[str] = set()
+    component_list: List[List[Descriptor]] = []
+
+    def _visit(descriptor: Descriptor) -> None:
+        index_dict[descriptor.full_name] = low_link_dict[descriptor.full_name] = len(index_dict)
+        stack.append(descriptor)
+        on_stack_set.add(descriptor.full_name)
+
+    for root in descriptor_list:
+        if root.full_name in index_dict:
+            continue
+        _visit(root)
+        work_list: List[Tuple[Descriptor, Iterator[Descriptor]]] = [(root, iter(get_dependency_list(root)))]
+        while work_list:
+            descriptor, dependency_iter = work_list[-1]
+            name: str = descriptor.full_name
+            for dependency in dependency_iter:
+                if dependency.full_name not in index_dict:
+                    _visit(dependency)
+                    work_list.append((dependency, iter(get_dependency_list(dependency))))
+                    break
+                elif dependency.full_name in on_stack_set:
+                    low_link_dict[name] = min(low_link_dict[name], index_dict[dependency.full_name])
+            else:
+                work_list.pop()
+                if work_list:
+                    parent_name: str = work_list[-1][0].full_name
+                    low_link_dict[parent_name] = min(low_link_dict[parent_name], low_link_dict[name])
+                if low_link_dict[name] == index_dict[name]:
+                    component: List[Descriptor] = []
+                    while True:
+                        item: Descriptor = stack.pop()
+                        on_stack_set.remove(item.full_name)
+                        component.append(item)
+                        if item.full_name == name:
+                            break
+                    component_list.append(component)
+    return component_list
+
+
+def _iter_message_descriptor(descriptor_iterable: Iterable[Descriptor]) -> Generator[Descriptor, None, None]:
+    for descriptor in descriptor_iterable:
+        if descriptor.name.endswith("Entry"):
+            continue
+        yield descriptor
+        yield from _iter_message_descriptor(descriptor.nested_types)
+
+
+def pool_to_pydantic_models(
+    pool_or_fds: Union[DescriptorPool, FileDescriptorSet],
+    packages: Optional[Iterable[str]] = None,
+    file_names: Optional[Iterable[str]] = None,
+    default_field: Type[FieldInfo] = FieldInfo,
+    comment_prefix: str = "p2p",
+    parse_msg_desc_method: Any = None,
+    local_dict: Optional[Dict[str, Any]] = None,
+    pydantic_base: Optional[Type["BaseModel"]] = None,
+    pydantic_module: Optional[str] = None,
+    desc_template: Optional[Type[DescTemplate]] = None,
+    message_type_dict_by_type_name: Optional[Dict[str, Any]] = None,
+    message_default_factory_dict_by_type_name: Optional[Dict[str, Any]] = None,
+) -> ModelRegistry:
+    """
+    Parse all messages of the descriptor pool (or FileDescriptorSet) to pydantic models.
+    The dependency graph of messages is computed once, then the models are created in the order of dependencies
+     and share one cache, so each model is only created once. The mutually referencing messages use forward refs.
+    :param pool_or_fds: DescriptorPool or FileDescriptorSet (e.g. generated by `protoc --descriptor_set_out`)
+    :param packages: Only parse the messages of these packages(include the sub packages), default is all packages.
+        Note: The referenced messages of other packages are also parsed
+    :param file_names: The files to be parsed, the DescriptorPool can not list its files, so it must be provided
+        when `pool_or_fds` is a DescriptorPool, default is all files of the FileDescriptorSet
+    :param parse_msg_desc_method: same as `msg_to_pydantic_model`, but the module of Message is not supported
+    Other params are the same as `msg_to_pydantic_model`
+    """
+    if isinstance(pool_or_fds, FileDescriptorSet):
+        pool: DescriptorPool = _gen_pool_from_file_descriptor_set(pool_or_fds)
+        if file_names is None:
+            file_names = [file_descriptor_proto.name for file_descriptor_proto in pool_or_fds.file]
+    else:
+        pool = pool_or_fds
+        if file_names is None:
+            raise ValueError("file_names param must be provided when pool_or_fds is DescriptorPool")
+
+    package_tuple: Tuple[str, ...] = tuple(packages or ())
+    descriptor_list: List[Descriptor] = []
+    for file_name in file_names:
+        file_descriptor: Any = pool.FindFileByName(file_name)
+        package: str = file_descriptor.package
+        if package_tuple and not any(package == i or package.startswith(i + ".") for i in package_tuple):
+            continue
+        descriptor_list.extend(_iter_message_descriptor(file_descriptor.message_types_by_name.values()))
+
+    component_list: List[List[Descriptor]] = _get_strongly_connected_component_list(
+        descriptor_list,
+        partial(
+            _get_message_dependency_list,
+            message_type_dict_by_type_name=message_type_dict_by_type_name or _message_type_dict_by_type_name,
+        ),
+    )
+    creat_cache: Dict[Descriptor, Type[BaseModel]] = {}
+    enum_cache: EnumCacheType = {}
+    file_desc_cache: Dict[str, Dict[str, "DescFromOptionTypedDict"]] = {}
+    model_dict: Dict[str, Type[BaseModel]] = {}
+    for component in component_list:
+        # The mutually referencing messages use forward refs, and then resolve them after all created
+        is_circular: bool = len(component) > 1
+        for descriptor in component:
+            if descriptor not in creat_cache:
+                M2P(
+                    msg=descriptor,
+                    default_field=default_field,
+                    comment_prefix=comment_prefix,
+                    parse_msg_desc_method=parse_msg_desc_method,
+                    local_dict=local_dict,
+                    pydantic_base=pydantic_base,
+                    pydantic_module=pydantic_module,
+                    desc_template=desc_template,
+                    message_type_dict_by_type_name=message_type_dict_by_type_name,
+                    message_default_factory_dict_by_type_name=message_default_factory_dict_by_type_name,
+                    lazy=is_circular,
+                    creat_cache=creat_cache,
+                    enum_cache=enum_cache,
+                    file_desc_cache=file_desc_cache,
+                )
+            model_dict[descriptor.full_name] = creat_cache[descriptor]
+        if is_circular:
+            for descriptor in component:
+                resolve_lazy_model(creat_cache[descriptor])
+    return ModelRegistry(model_dict, pool)
@@ -1,3 +1,11 @@
-from .from_pb_option import get_desc_from_p2p, get_desc_from_pgv
-from .from_proto_file import get_desc_from_proto_file
+from .desc_cache import save_desc_cache, set_desc_cache_dir
+from .from_pb_option import (
+    clear_option_desc_cache,
+    get_desc_from_p2p,
+    get_desc_from_pgv,
+    get_option_desc_cache_info,
+    set_option_desc_cache_size,
+)
+from .from_proto_file import get_desc_from_proto_file, preload_proto_dir
 from .from_pyi_file import get_desc_from_pyi_file
+from .from_source_code_info import get_desc_from_file_descriptor_proto
@@ -0,0 +1,114 @@
+"""Persistent cache of the field description parsed from the protobuf file and pyi file.
+
+The cache is a single pickle file in the cache directory, it is loaded lazily on first use and saved when the process
+exits, so that the short-lived process can skip parsing the unchanged file.
+The cache directory is set by `set_desc_cache_dir` or the environment variable `PROTOBUF_TO_PYDANTIC_DESC_CACHE_DIR`,
+the cache is disabled by default.
+"""
+import atexit
+import logging
+import os
+import pickle
+from typing import TYPE_CHECKING, Dict, Optional, Set, Tuple
+
+from protobuf_to_pydantic.__version__ import __version__
+
+if TYPE_CHECKING:
+    from protobuf_to_pydantic.types import DescFromOptionTypedDict
+
+__all__ = ["set_desc_cache_dir", "get_desc_from_cache", "set_desc_to_cache", "save_desc_cache"]
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+_desc_cache_file_name: str = "desc_cache.pickle"
+_desc_cache_dir: str = os.environ.get("PROTOBUF_TO_PYDANTIC_DESC_CACHE_DIR", "")
+# (source type, file path, comment_prefix) -> (st_mtime_ns, st_size, message desc dict)
+_CacheKeyType = Tuple[str, str, str]
+_CacheValueType = Tuple[int, int, Dict[str, "DescFromOptionTypedDict"]]
+_desc_cache_dict: Optional[Dict[_CacheKeyType, _CacheValueType]] = None
+_dirty_key_set: Set[_CacheKeyType] = set()
+_is_register_atexit: bool = False
+
+
+def set_desc_cache_dir(cache_dir: str) -> None:
+    """Set the directory of the persistent cache, empty string means disable the cache"""
+    global _desc_cache_dir, _desc_cache_dict
+    if _dirty_key_set:
+        save_desc_cache()
+    _desc_cache_dir = cache_dir
+    _desc_cache_dict = None
+
+
+def _load_desc_cache_dict() -> Dict[_CacheKeyType, _CacheValueType]:
+    cache_file_path: str = os.path.join(_desc_cache_dir, _desc_cache_file_name)
+    try:
+        with open(cache_file_path, "rb") as f:
+            version, cache_dict = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Can not load desc cache from {cache_file_path}, error:{e}")
+        return {}
+    # The parse result may be different in different versions
+    return cache_dict if version == __version__ else {}
+
+
+def _get_desc_cache_dict() -> Dict[_CacheKeyType, _CacheValueType]:
+    global _desc_cache_dict
+    if _desc_cache_dict is None:
+        _desc_cache_dict = _load_desc_cache_dict()
+    return _desc_cache_dict
+
+
+def get_desc_from_cache(
+    source_type: str, filename: str, stat_result: os.stat_result, comment_prefix: str
+) -> Optional[Dict[str, "DescFromOptionTypedDict"]]:
+    """Get the message desc dict of file from persistent cache, return None if miss cache or file is changed"""
+    if not _desc_cache_dir:
+        return None
+    cache_value = _get_desc_cache_dict().get((source_type, os.path.abspath(filename), comment_prefix), None)
+    if cache_value and cache_value[0] == stat_result.st_mtime_ns and cache_value[1] == stat_result.st_size:
+        return cache_value[2]
+    return None
+
+
+def set_desc_to_cache(
+    source_type: str,
+    filename: str,
+    stat_result: os.stat_result,
+    comment_prefix: str,
+    desc_dict: Dict[str, "DescFromOptionTypedDict"],
+) -> None:
+    """Set the message desc dict of file to persistent cache, it will be saved when the process exits"""
+    global _is_register_atexit
+    if not _desc_cache_dir:
+        return
+    cache_key: _CacheKeyType = (source_type, os.path.abspath(filename), comment_prefix)
+    _get_desc_cache_dict()[cache_key] = (stat_result.st_mtime_ns, stat_result.st_size, desc_dict)
+    _dirty_key_set.add(cache_key)
+    if not _is_register_atexit:
+        atexit.register(save_desc_cache)
+        _is_register_atexit = True
+
+
+def save_desc_cache() -> None:
+    """Save the new cache data to the cache file.
+    In order not to overwrite the data written by other processes, the cache file will be reloaded before saving"""
+    if not _desc_cache_dir or not _dirty_key_set or _desc_cache_dict is None:
+        return
+    cache_dict: Dict[_CacheKeyType, _CacheValueType] = _load_desc_cache_dict()
+    for cache_key in _dirty_key_set:
+        cache_dict[cache_key] = _desc_cache_dict[cache_key]
+
+    os.makedirs(_desc_cache_dir, exist_ok=True)
+    cache_file_path: str = os.path.join(_desc_cache_dir, _desc_cache_file_name)
+    # Write to a temporary file first to prevent other processes from reading incomplete content
+    tmp_file_path: str = f"{cache_file_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file_path, "wb") as f:
+            pickle.dump((__version__, cache_dict), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file_path, cache_file_path)
+    except OSError as e:
+        logger.warning(f"Can not save desc cache to {cache_file_path}, error:{e}")
+        return
+    _dirty_key_set.clear()
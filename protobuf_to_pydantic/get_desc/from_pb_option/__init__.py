@@ -1,4 +1,11 @@
+from .base import clear_option_desc_cache, get_option_desc_cache_info, set_option_desc_cache_size
 from .from_p2p import get_desc_from_p2p
 from .from_pgv import get_desc_from_pgv
 
-__all__ = ["get_desc_from_pgv", "get_desc_from_p2p"]
+__all__ = [
+    "get_desc_from_pgv",
+    "get_desc_from_p2p",
+    "clear_option_desc_cache",
+    "get_option_desc_cache_info",
+    "set_option_desc_cache_size",
+]
@@ -1,6 +1,6 @@
 import inspect
 import logging
-from typing import Any, Callable, Dict, List, Optional, Set, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union
 
 from protobuf_to_pydantic.customer_con_type import (
     conbytes,
@@ -10,12 +10,13 @@ from protobuf_to_pydantic.customer_con_type import (
     constr,
     contimedelta,
     contimestamp,
+    get_con_type,
     validator,
 )
 from protobuf_to_pydantic.customer_validator import validate_validator_dict
 from protobuf_to_pydantic.grpc_types import Descriptor, FieldDescriptor, FieldDescriptorProto, Message
 from protobuf_to_pydantic.types import DescFromOptionTypedDict, FieldInfoTypedDict
-from protobuf_to_pydantic.util import replace_protobuf_type_to_python_type
+from protobuf_to_pydantic.util import CacheInfo, LRUCache, replace_protobuf_type_to_python_type
 
 from .types import column_pydantic_type_dict
 
@@ -187,7 +188,7 @@ def option_descriptor_to_desc_dict(
                     if sub_dict["extra"].get(_key, None) is not None:
                         con_type_param_dict[_key] = sub_dict["extra"][_key]
 
-            desc_dict["map_type"][column] = con_type(**con_type_param_dict)
+            desc_dict["map_type"][column] = get_con_type(con_type, **con_type_param_dict)
             continue
         elif column == "items":
             # Process array data
@@ -208,21 +209,57 @@ def option_descriptor_to_desc_dict(
         desc_dict[column] = value  # type: ignore
 
 
+# (type_name, full_name, field name, field type, protobuf_pkg, serialized options) -> field info dict
+_field_option_cache: LRUCache[FieldInfoTypedDict] = LRUCache(maxsize=10240)
+
+
 def field_option_handle(
     type_name: str,
     full_name: str,
     field: Union[FieldDescriptor, FieldDescriptorProto],
     protobuf_pkg: str = "",
 ) -> FieldInfoTypedDict:
-    """Parse the information for each filed"""
-    field_dict: FieldInfoTypedDict = {"extra": {}, "skip": False}
-    miss_default: bool = False
+    """Parse the information for each filed.
+
+    The result is cached by the field and its options, so the options of the same field (e.g. the field of a common
+    Message referenced by multiple Messages) are only parsed once, and the validators are created once and shared.
+    """
     if isinstance(field, FieldDescriptor):
-        field_list = field.GetOptions().ListFields()
+        options: Any = field.GetOptions()
     elif isinstance(field, FieldDescriptorProto):
-        field_list = field.options.ListFields()
+        options = field.options
     else:
         raise RuntimeError(f"Not support type:{field.type}")
+    cache_key: tuple = (
+        type_name,
+        full_name,
+        field.name,
+        field.type,
+        protobuf_pkg,
+        options.SerializeToString(deterministic=True),
+    )
+    field_dict: Optional[FieldInfoTypedDict] = _field_option_cache.get(cache_key)
+    if field_dict is None:
+        field_dict = _field_option_cache.setdefault(
+            cache_key, _field_option_handle(type_name, full_name, field, options.ListFields(), protobuf_pkg)
+        )
+    # The caller may modify the dict, so return a copy of the cached dict
+    # (the value of `extra` may be a json string set by the `extra` option)
+    copy_field_dict: dict = dict(field_dict)
+    if isinstance(copy_field_dict["extra"], dict):
+        copy_field_dict["extra"] = dict(copy_field_dict["extra"])
+    return copy_field_dict  # type: ignore
+
+
+def _field_option_handle(
+    type_name: str,
+    full_name: str,
+    field: Union[FieldDescriptor, FieldDescriptorProto],
+    field_list: List[Tuple[FieldDescriptor, Any]],
+    protobuf_pkg: str = "",
+) -> FieldInfoTypedDict:
+    field_dict: FieldInfoTypedDict = {"extra": {}, "skip": False}
+    miss_default: bool = False
     for option_descriptor, option_value in field_list:
         # filter unwanted Option
         if protobuf_pkg:
@@ -248,34 +285,72 @@ def field_option_handle(
     return field_dict
 
 
-_global_desc_dict: Dict[str, Dict[str, DescFromOptionTypedDict]] = {}
+# (protobuf_pkg, message full name, id of descriptor pool) -> (descriptor, desc dict)
+# The descriptor is kept in the value, so the pool can not be collected and its id can not be reused while cached
+_message_desc_cache: LRUCache[Tuple[Descriptor, DescFromOptionTypedDict]] = LRUCache(maxsize=1024)
+
+
+def clear_option_desc_cache() -> None:
+    """Clear the cache of the desc parsed from the Options of Message and reset its statistics"""
+    _message_desc_cache.clear()
+
+
+def get_option_desc_cache_info() -> CacheInfo:
+    """Get the hits, misses, maxsize and currsize of the cache of the desc parsed from the Options of Message"""
+    return _message_desc_cache.info()
+
+
+def set_option_desc_cache_size(maxsize: Optional[int]) -> None:
+    """Set the max size of the cache of the desc parsed from the Options of Message, None means unlimited"""
+    _message_desc_cache.set_maxsize(maxsize)
 
 
 class ParseFromPbOption(object):
     protobuf_pkg: str  # Extend the package name of protobuf
 
-    def __init__(self, message: Type[Message]):
+    def __init__(self, message: Union[Type[Message], Descriptor]):
         self.message = message
+        # The desc of the message and all messages it references, key is the full name of message
+        # (the messages with the same name in different packages can be referenced at the same time)
         self._msg_desc_dict: Dict[str, DescFromOptionTypedDict] = {}
-        if self.protobuf_pkg not in _global_desc_dict:
-            _global_desc_dict[self.protobuf_pkg] = self._msg_desc_dict
-        else:
-            self._msg_desc_dict = _global_desc_dict[self.protobuf_pkg]
 
     def parse(self) -> Dict[str, DescFromOptionTypedDict]:
-        descriptor: Descriptor = self.message.DESCRIPTOR
-        if descriptor.name in self._msg_desc_dict:
-            return self._msg_desc_dict
-
-        self._msg_desc_dict[descriptor.name] = self.get_desc_from_options(descriptor)
+        descriptor: Descriptor = self.message if isinstance(self.message, Descriptor) else self.message.DESCRIPTOR
+        self._msg_desc_dict[descriptor.full_name] = self.get_desc_from_options(descriptor)
         return self._msg_desc_dict
 
+    def _get_cache_key(self, descriptor: Descriptor) -> Tuple[str, str, int]:
+        return self.protobuf_pkg, descriptor.full_name, id(descriptor.file.pool)
+
+    def _add_msg_desc_dict(self, full_name: str, desc_dict: DescFromOptionTypedDict) -> None:
+        """Add the cached desc and the desc of the messages it references"""
+        if full_name in self._msg_desc_dict:
+            return
+        self._msg_desc_dict[full_name] = desc_dict
+        for nested_full_name, nested_desc_dict in desc_dict["nested"].items():
+            self._add_msg_desc_dict(nested_full_name, nested_desc_dict)
+
     def get_desc_from_options(self, descriptor: Descriptor) -> DescFromOptionTypedDict:
         """Extract the information of each field through the Options of Protobuf Message"""
-        if descriptor.name in self._msg_desc_dict:
-            return self._msg_desc_dict[descriptor.name]
+        if descriptor.full_name in self._msg_desc_dict:
+            return self._msg_desc_dict[descriptor.full_name]
+        cache_key: Tuple[str, str, int] = self._get_cache_key(descriptor)
+        cache_value = _message_desc_cache.get(cache_key)
+        if cache_value is not None and cache_value[0] is descriptor:
+            self._add_msg_desc_dict(descriptor.full_name, cache_value[1])
+            return cache_value[1]
+
         message_field_dict: DescFromOptionTypedDict = {"message": {}, "one_of": {}, "nested": {}}
+        # Mark the message as being parsed before parsing the messages it references,
+        # so that the mutually referencing messages get the same (filling) desc instead of recursing forever
+        self._msg_desc_dict[descriptor.full_name] = message_field_dict
+        self._parse_desc_from_options(descriptor, message_field_dict)
+        _message_desc_cache.set(cache_key, (descriptor, message_field_dict))
+        return message_field_dict
 
+    def _parse_desc_from_options(
+        self, descriptor: Descriptor, message_field_dict: DescFromOptionTypedDict
+    ) -> DescFromOptionTypedDict:
         # Options for processing Messages
         for option_descriptor, option_value in descriptor.GetOptions().ListFields():
             # If parsing is disabled, Options will not continue to be parsed, and empty information will be set
@@ -323,14 +398,15 @@ class ParseFromPbOption(object):
                 continue
             message_field_dict["message"][field.name] = field_dict
             if type_name == "message":
-                message_field_dict["nested"][field.message_type.name] = self.get_desc_from_options(field.message_type)
+                message_field_dict["nested"][field.message_type.full_name] = self.get_desc_from_options(
+                    field.message_type
+                )
             elif type_name == "map":
                 for sub_field in field.message_type.fields:
                     if not sub_field.message_type:
                         continue
                     # keys and values
-                    message_field_dict["nested"][sub_field.message_type.name] = self.get_desc_from_options(
+                    message_field_dict["nested"][sub_field.message_type.full_name] = self.get_desc_from_options(
                         sub_field.message_type
                     )
-        self._msg_desc_dict[descriptor.name] = message_field_dict
         return message_field_dict
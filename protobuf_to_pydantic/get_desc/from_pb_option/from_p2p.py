@@ -1,6 +1,6 @@
-from typing import Dict, Type
+from typing import Dict, Type, Union
 
-from protobuf_to_pydantic.grpc_types import Message
+from protobuf_to_pydantic.grpc_types import Descriptor, Message
 
 from .base import DescFromOptionTypedDict, ParseFromPbOption
 
@@ -9,7 +9,7 @@ class _ParseFromPbOption(ParseFromPbOption):
     protobuf_pkg = "p2p_validate"
 
 
-def get_desc_from_p2p(message: Type[Message]) -> Dict[str, DescFromOptionTypedDict]:
+def get_desc_from_p2p(message: Union[Type[Message], Descriptor]) -> Dict[str, DescFromOptionTypedDict]:
     """Parse data through Message and return info dict
     Note: The returned dict includes the data of one of
     """
@@ -1,6 +1,6 @@
-from typing import Dict, Type
+from typing import Dict, Type, Union
 
-from protobuf_to_pydantic.grpc_types import Message
+from protobuf_to_pydantic.grpc_types import Descriptor, Message
 
 from .base import DescFromOptionTypedDict, ParseFromPbOption
 
@@ -9,5 +9,5 @@ class _ParseFromPbOption(ParseFromPbOption):
     protobuf_pkg = "validate"
 
 
-def get_desc_from_pgv(message: Type[Message]) -> Dict[str, DescFromOptionTypedDict]:
+def get_desc_from_pgv(message: Union[Type[Message], Descriptor]) -> Dict[str, DescFromOptionTypedDict]:
     return _ParseFromPbOption(message).parse()
@@ -1,12 +1,19 @@
-from typing import TYPE_CHECKING, Dict, Optional
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
+from protobuf_to_pydantic.get_desc.desc_cache import get_desc_from_cache, set_desc_to_cache
 from protobuf_to_pydantic.util import gen_dict_from_desc_str
 
 if TYPE_CHECKING:
     from protobuf_to_pydantic.contrib.proto_parser import Message, ProtoFile
     from protobuf_to_pydantic.types import DescFromOptionTypedDict
 
-_filename_desc_dict: Dict[str, Dict[str, "DescFromOptionTypedDict"]] = {}
+logger: logging.Logger = logging.getLogger(__name__)
+# (filename, comment_prefix) -> (st_mtime_ns, st_size, message desc dict)
+_filename_desc_dict: Dict[Tuple[str, str], Tuple[int, int, Dict[str, "DescFromOptionTypedDict"]]] = {}
 
 
 def _parse_message_result_dict(
@@ -34,6 +41,47 @@ def _parse_message_result_dict(
             _parse_message_result_dict(sub_message, parse_result, container[message_name]["nested"], comment_prefix)
 
 
+def _get_desc_from_cache(
+    filename: str, comment_prefix: str, stat_result: os.stat_result
+) -> Optional[Dict[str, "DescFromOptionTypedDict"]]:
+    cache_key: Tuple[str, str] = (filename, comment_prefix)
+    cache_value = _filename_desc_dict.get(cache_key, None)
+    if cache_value and cache_value[0] == stat_result.st_mtime_ns and cache_value[1] == stat_result.st_size:
+        # get protobuf message info by cache
+        return cache_value[2]
+    cache_desc_dict = get_desc_from_cache("proto", filename, stat_result, comment_prefix)
+    if cache_desc_dict is not None:
+        # get protobuf message info by persistent cache, not need to parse the protobuf file
+        _filename_desc_dict[cache_key] = (stat_result.st_mtime_ns, stat_result.st_size, cache_desc_dict)
+    return cache_desc_dict
+
+
+def _set_desc_to_cache(
+    filename: str,
+    comment_prefix: str,
+    stat_result: os.stat_result,
+    message_field_dict: Dict[str, "DescFromOptionTypedDict"],
+) -> None:
+    _filename_desc_dict[(filename, comment_prefix)] = (stat_result.st_mtime_ns, stat_result.st_size, message_field_dict)
+    set_desc_to_cache("proto", filename, stat_result, comment_prefix, message_field_dict)
+
+
+def _parse_proto_file(filename: str, comment_prefix: str) -> Dict[str, "DescFromOptionTypedDict"]:
+    try:
+        from protobuf_to_pydantic.contrib.proto_parser import ProtoFile, parse_from_file
+    except ImportError:
+        raise RuntimeError("Can not parse protobuf file, please install lark")
+
+    message_field_dict: Dict[str, "DescFromOptionTypedDict"] = {}
+    _proto_file: Optional[ProtoFile] = parse_from_file(filename)
+    if _proto_file:
+        # Currently only used protobuf file message
+        proto_file: ProtoFile = _proto_file
+        for _, protobuf_msg in proto_file.messages.items():
+            _parse_message_result_dict(protobuf_msg, proto_file, message_field_dict, comment_prefix)
+    return message_field_dict
+
+
 def get_desc_from_proto_file(filename: str, comment_prefix: str) -> Dict[str, "DescFromOptionTypedDict"]:
     """Obtain corresponding information through protobuf file
 
@@ -63,27 +111,74 @@ def get_desc_from_proto_file(filename: str, comment_prefix: str) -> Dict[str, "D
         }
     }
     """
-    if filename in _filename_desc_dict:
-        # get protobuf message info by cache
-        return _filename_desc_dict[filename]
+    stat_result: os.stat_result = os.stat(filename)
+    message_field_dict: Optional[Dict[str, "DescFromOptionTypedDict"]] = _get_desc_from_cache(
+        filename, comment_prefix, stat_result
+    )
+    if message_field_dict is None:
+        message_field_dict = _parse_proto_file(filename, comment_prefix)
+        # cache data and return(Even if there is no data, it should be cached)
+        _set_desc_to_cache(filename, comment_prefix, stat_result, message_field_dict)
+    return message_field_dict
+
 
+def _parse_proto_file_in_worker(
+    filename: str, comment_prefix: str
+) -> Tuple[str, os.stat_result, Dict[str, "DescFromOptionTypedDict"]]:
+    # The stat is obtained before parsing, if the file is changed during parsing, the cache will be invalid
+    stat_result: os.stat_result = os.stat(filename)
     try:
-        from protobuf_to_pydantic.contrib.proto_parser import ProtoFile, parse_from_file
-    except ImportError:
-        raise RuntimeError("Can not parse protobuf file, please install lark")
+        return filename, stat_result, _parse_proto_file(filename, comment_prefix)
+    except Exception as e:
+        # The exception of lark may not be pickled, so it cannot be passed back to the parent process
+        raise RuntimeError(f"{e.__class__.__name__}: {e}") from None
 
-    message_field_dict: Dict[str, "DescFromOptionTypedDict"] = {}
-    _proto_file: Optional[ProtoFile] = parse_from_file(filename)
-    if not _proto_file:
-        # Even if there is no data, it should be cached, and it will take time to parse the protobuf file
-        _filename_desc_dict[filename] = message_field_dict
-        return message_field_dict
-
-    # Currently only used protobuf file message
-    proto_file: ProtoFile = _proto_file
-    for _, protobuf_msg in proto_file.messages.items():
-        _parse_message_result_dict(protobuf_msg, proto_file, message_field_dict, comment_prefix)
-
-    # cache data and return
-    _filename_desc_dict[filename] = message_field_dict
-    return message_field_dict
+
+def preload_proto_dir(
+    path: str, comment_prefix: str = "p2p", workers: int = 1
+) -> Dict[str, Dict[str, "DescFromOptionTypedDict"]]:
+    """Parse all protobuf files in the directory (the value of `parse_msg_desc_method`) up front and cache the result,
+    `workers` > 1 will parse the files through multiple processes.
+
+    The file that fails to parse is skipped (the error will be raised when its Message is converted),
+    return the desc of the files that have been loaded, the key is the same as the filename used by `M2P`
+    """
+    file_str: str = path if path.endswith("/") else path + "/"
+    filename_list: List[str] = []
+    for dir_path, _, file_name_list in os.walk(path):
+        for file_name in file_name_list:
+            if file_name.endswith(".proto"):
+                relative_path: str = os.path.relpath(os.path.join(dir_path, file_name), path)
+                filename_list.append(file_str + relative_path.replace(os.sep, "/"))
+    filename_list.sort()
+
+    result_dict: Dict[str, Dict[str, "DescFromOptionTypedDict"]] = {}
+    pending_filename_list: List[str] = []
+    for filename in filename_list:
+        message_field_dict = _get_desc_from_cache(filename, comment_prefix, os.stat(filename))
+        if message_field_dict is None:
+            pending_filename_list.append(filename)
+        else:
+            result_dict[filename] = message_field_dict
+
+    def _handle_result(_filename: str, _future_or_func: Callable[[], Any]) -> None:
+        try:
+            _, _stat_result, _message_field_dict = _future_or_func()
+        except Exception as e:
+            logger.warning(f"Can not parse protobuf file:{_filename}, error:{e}")
+            return
+        _set_desc_to_cache(_filename, comment_prefix, _stat_result, _message_field_dict)
+        result_dict[_filename] = _message_field_dict
+
+    if workers > 1 and len(pending_filename_list) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending_filename_list))) as executor:
+            future_list = [
+                executor.submit(_parse_proto_file_in_worker, filename, comment_prefix)
+                for filename in pending_filename_list
+            ]
+            for filename, future in zip(pending_filename_list, future_list):
+                _handle_result(filename, future.result)
+    else:
+        for filename in pending_filename_list:
+            _handle_result(filename, partial(_parse_proto_file_in_worker, filename, comment_prefix))
+    return result_dict
@@ -1,12 +1,88 @@
+import os
 import re
-from typing import TYPE_CHECKING, Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Pattern, Tuple
 
+from protobuf_to_pydantic.get_desc.desc_cache import get_desc_from_cache, set_desc_to_cache
 from protobuf_to_pydantic.util import gen_dict_from_desc_str
 
 if TYPE_CHECKING:
     from protobuf_to_pydantic.types import DescFromOptionTypedDict, FieldInfoTypedDict
 
-_filename_desc_dict: Dict[str, Dict[str, "DescFromOptionTypedDict"]] = {}
+# (filename, comment_prefix) -> (st_mtime_ns, st_size, message desc dict)
+_filename_desc_dict: Dict[Tuple[str, str], Tuple[int, int, Dict[str, "DescFromOptionTypedDict"]]] = {}
+
+
+_message_class_re: Pattern = re.compile(r"class (.+)\(google.protobuf.message.Message")
+
+
+def _scan_pyi_line_iter(line_iter: Iterable[str], comment_prefix: str) -> Dict[str, "DescFromOptionTypedDict"]:
+    """Scan the lines of the pyi file one by one, only the docstring lines that contain the comment prefix are kept"""
+    comment_line_prefix: str = f"{comment_prefix}:"
+    _comment_model: bool = False  # Whether to enable parsing comment mode
+    _doc_line_list: List[str] = []  # The lines of docstring that contain the comment prefix
+    _field_name: str = ""
+    pre_line: str = ""
+    message_str_stack: List[Tuple[str, int, DescFromOptionTypedDict]] = []
+    indent: int = 0
+
+    global_message_field_dict: Dict[str, "DescFromOptionTypedDict"] = {}
+
+    def _add_doc_line(_line: str) -> None:
+        _line = _line.replace('"""', "").strip()
+        if _line.startswith(comment_line_prefix):
+            _doc_line_list.append(_line)
+
+    for line in line_iter:
+        line = line.rstrip("\n")
+        if not _comment_model and line.lstrip().startswith("class "):
+            match = _message_class_re.search(line) if line.endswith("google.protobuf.message.Message):") else None
+            if not match:
+                pre_line = line
+                continue
+            message_str: str = match.group(1)
+            new_indent: int = line.index("class")
+            if message_str_stack and message_str != message_str_stack[-1][0] and new_indent <= indent:
+                # When you encounter the same indentation of different classes,
+                # need to pop off the previous one and insert the current one
+                message_str_stack.pop()
+            message_field_dict: Dict[str, FieldInfoTypedDict] = {}
+            global_message_field_dict[message_str] = {
+                "message": message_field_dict,
+                "one_of": {},
+                "nested": {},  # type: ignore
+            }
+            if message_str_stack:
+                parent_message_field_dict = message_str_stack[-1][2]
+                parent_message_field_dict["nested"][message_str] = global_message_field_dict[message_str]
+
+            indent = new_indent
+            message_str_stack.append((message_str, indent, global_message_field_dict[message_str]))
+        elif indent:
+            if line and message_str_stack and line[indent : indent + 1] != " ":
+                # The current class has been scanned, go back to the previous class
+                message_str_stack.pop()
+
+        if message_str_stack:
+            message_str, indent, desc_dict = message_str_stack[-1]
+            strip_line: str = line.strip()
+            if _comment_model:
+                _add_doc_line(strip_line)
+
+            if not _comment_model and strip_line.startswith('"""') and not pre_line.startswith("class"):
+                # start add doc
+                if "def" in pre_line:
+                    _field_name = pre_line.split("(")[0].replace("def", "").strip()
+                else:
+                    _field_name = pre_line.split(":")[0].strip()
+                _comment_model = True
+                _doc_line_list = []
+                _add_doc_line(strip_line)
+            if strip_line.endswith('"""') and _comment_model:
+                # end add doc
+                _comment_model = False
+                desc_dict["message"][_field_name] = gen_dict_from_desc_str(comment_prefix, "\n".join(_doc_line_list))
+        pre_line = line
+    return global_message_field_dict
 
 
 def get_desc_from_pyi_file(filename: str, comment_prefix: str) -> Dict[str, "DescFromOptionTypedDict"]:
@@ -62,70 +138,21 @@ def get_desc_from_pyi_file(filename: str, comment_prefix: str) -> Dict[str, "Des
         }
     }
     """
-    if filename in _filename_desc_dict:
+    stat_result: os.stat_result = os.stat(filename)
+    cache_key: Tuple[str, str] = (filename, comment_prefix)
+    cache_value = _filename_desc_dict.get(cache_key, None)
+    if cache_value and cache_value[0] == stat_result.st_mtime_ns and cache_value[1] == stat_result.st_size:
         # get protobuf message info by cache
-        return _filename_desc_dict[filename]
+        return cache_value[2]
+    cache_desc_dict = get_desc_from_cache("pyi", filename, stat_result, comment_prefix)
+    if cache_desc_dict is not None:
+        # get protobuf message info by persistent cache, not need to scan the pyi file
+        _filename_desc_dict[cache_key] = (stat_result.st_mtime_ns, stat_result.st_size, cache_desc_dict)
+        return cache_desc_dict
 
     with open(filename, "r") as f:
-        pyi_content: str = f.read()
-    line_list = pyi_content.split("\n")
-
-    _comment_model: bool = False  # Whether to enable parsing comment mode
-    _doc: str = ""
-    _field_name: str = ""
-    message_str_stack: List[Tuple[str, int, DescFromOptionTypedDict]] = []
-    indent: int = 0
-
-    global_message_field_dict: Dict[str, "DescFromOptionTypedDict"] = {}
-
-    for index, line in enumerate(line_list):
-        if "class" in line:
-            if not line.endswith("google.protobuf.message.Message):"):
-                continue
-            match_list = re.findall(r"class (.+)\(google.protobuf.message.Message", line)
-            if not match_list:
-                continue
-            message_str: str = match_list[0]
-            new_indent: int = line.index("class")
-            if message_str_stack and message_str != message_str_stack[-1][0] and new_indent <= indent:
-                # When you encounter the same indentation of different classes,
-                # need to pop off the previous one and insert the current one
-                message_str_stack.pop()
-            message_field_dict: Dict[str, FieldInfoTypedDict] = {}
-            global_message_field_dict[message_str] = {
-                "message": message_field_dict,
-                "one_of": {},
-                "nested": {},  # type: ignore
-            }
-            if message_str_stack:
-                parent_message_field_dict = message_str_stack[-1][2]
-                parent_message_field_dict["nested"][message_str] = global_message_field_dict[message_str]
-
-            indent = new_indent
-            message_str_stack.append((message_str, indent, global_message_field_dict[message_str]))
-        elif indent:
-            if line and message_str_stack and line[indent] != " ":
-                # The current class has been scanned, go back to the previous class
-                message_str_stack.pop()
-
-        if message_str_stack:
-            message_str, indent, desc_dict = message_str_stack[-1]
-            line = line.strip()
-            if _comment_model:
-                _doc += "\n" + line
-
-            if not _comment_model and line.startswith('"""') and not line_list[index - 1].startswith("class"):
-                # start add doc
-                if "def" in line_list[index - 1]:
-                    _field_name = line_list[index - 1].split("(")[0].replace("def", "").strip()
-                else:
-                    _field_name = line_list[index - 1].split(":")[0].strip()
-                _comment_model = True
-                _doc = line
-            if (line.endswith('"""') or line == '"""') and _comment_model:
-                # end add doc
-                _comment_model = False
-                desc_dict["message"][_field_name] = gen_dict_from_desc_str(comment_prefix, _doc.replace('"""', ""))
+        global_message_field_dict = _scan_pyi_line_iter(f, comment_prefix)
 
-    _filename_desc_dict[filename] = global_message_field_dict
+    _filename_desc_dict[cache_key] = (stat_result.st_mtime_ns, stat_result.st_size, global_message_field_dict)
+    set_desc_to_cache("pyi", filename, stat_result, comment_prefix, global_message_field_dict)
     return global_message_field_dict
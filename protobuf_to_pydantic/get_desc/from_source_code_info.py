@@ -0,0 +1,61 @@
+from typing import TYPE_CHECKING, Dict, Iterable, Tuple
+
+from protobuf_to_pydantic.grpc_types import DescriptorProto, FileDescriptorProto
+from protobuf_to_pydantic.util import gen_dict_from_desc_str
+
+if TYPE_CHECKING:
+    from protobuf_to_pydantic.types import DescFromOptionTypedDict
+
+# The field number in `descriptor.proto`, used to locate the element through `SourceCodeInfo.Location.path`
+_MESSAGE_TYPE_FIELD_NUMBER: int = 4  # FileDescriptorProto.message_type
+_FIELD_FIELD_NUMBER: int = 2  # DescriptorProto.field
+_NESTED_TYPE_FIELD_NUMBER: int = 3  # DescriptorProto.nested_type
+
+
+def get_comment_dict(fd: FileDescriptorProto) -> Dict[Tuple[int, ...], str]:
+    """Index the leading and trailing comments of the file by the path of `SourceCodeInfo.Location`
+
+    Note: The `SourceCodeInfo` is only available when the protobuf compiler provides it
+     (e.g. the `CodeGeneratorRequest` of plugin or `protoc --include_source_info --descriptor_set_out`)
+    """
+    comment_dict: Dict[Tuple[int, ...], str] = {}
+    for location in fd.source_code_info.location:
+        if not location.leading_comments and not location.trailing_comments:
+            continue
+        comment_dict[tuple(location.path)] = location.leading_comments + "\n" + location.trailing_comments
+    return comment_dict
+
+
+def _parse_message_desc_dict(
+    message_list: Iterable[DescriptorProto],
+    path: Tuple[int, ...],
+    comment_dict: Dict[Tuple[int, ...], str],
+    comment_prefix: str,
+) -> Dict[str, "DescFromOptionTypedDict"]:
+    container: Dict[str, "DescFromOptionTypedDict"] = {}
+    for message_index, message in enumerate(message_list):
+        message_path: Tuple[int, ...] = path + (message_index,)
+        container[message.name] = {
+            "message": {
+                field.name: gen_dict_from_desc_str(
+                    comment_prefix, comment_dict.get(message_path + (_FIELD_FIELD_NUMBER, field_index), "")
+                )
+                for field_index, field in enumerate(message.field)
+            },
+            "one_of": {},
+            "nested": _parse_message_desc_dict(  # type: ignore
+                message.nested_type, message_path + (_NESTED_TYPE_FIELD_NUMBER,), comment_dict, comment_prefix
+            ),
+        }
+    return container
+
+
+def get_desc_from_file_descriptor_proto(
+    fd: FileDescriptorProto, comment_prefix: str
+) -> Dict[str, "DescFromOptionTypedDict"]:
+    """Obtain corresponding information through the comments in the `SourceCodeInfo` of the FileDescriptorProto,
+    the result is the same as `get_desc_from_proto_file`, but does not need to parse the protobuf file again.
+    """
+    return _parse_message_desc_dict(
+        fd.message_type, (_MESSAGE_TYPE_FIELD_NUMBER,), get_comment_dict(fd), comment_prefix
+    )
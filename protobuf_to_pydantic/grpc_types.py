@@ -1,11 +1,14 @@
 from google.protobuf.any_pb2 import Any as AnyMessage  # type: ignore
-from google.protobuf.descriptor import Descriptor, FieldDescriptor  # type: ignore
+from google.protobuf.descriptor import Descriptor, EnumDescriptor, FieldDescriptor  # type: ignore
 from google.protobuf.descriptor_pb2 import (  # type: ignore
     DescriptorProto,
     EnumDescriptorProto,
     FieldDescriptorProto,
     FileDescriptorProto,
+    FileDescriptorSet,
 )
+from google.protobuf.descriptor_pool import Default as get_default_descriptor_pool  # type: ignore
+from google.protobuf.descriptor_pool import DescriptorPool  # type: ignore
 from google.protobuf.duration_pb2 import Duration  # type: ignore
 from google.protobuf.json_format import MessageToDict  # type: ignore
 from google.protobuf.message import Message  # type: ignore
@@ -21,12 +24,16 @@ from google.protobuf.timestamp_pb2 import Timestamp  # type: ignore
 __all__ = [
     "AnyMessage",
     "Descriptor",
+    "DescriptorPool",
     "DescriptorProto",
     "Duration",
+    "EnumDescriptor",
     "EnumDescriptorProto",
     "FieldDescriptor",
     "FieldDescriptorProto",
     "FileDescriptorProto",
+    "FileDescriptorSet",
+    "get_default_descriptor_pool",
     "Message",
     "Timestamp",
     "MessageToDict",
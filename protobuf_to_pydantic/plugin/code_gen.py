@@ -1,13 +1,20 @@
+import hashlib
 import importlib
 import logging
+import os
 import pathlib
 import sys
-from typing import Generic, Type
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, Generic, List, Optional, Tuple, Type
 
 from google.protobuf.compiler.plugin_pb2 import CodeGeneratorRequest, CodeGeneratorResponse
-from mypy_protobuf.main import Descriptors, code_generation
+from mypy_protobuf.main import PYTHON_RESERVED, Descriptors, code_generation
 
+from protobuf_to_pydantic.__version__ import __version__
+from protobuf_to_pydantic.gen_code import BaseP2C
+from protobuf_to_pydantic.grpc_types import FileDescriptorProto
 from protobuf_to_pydantic.plugin.config import ConfigT, get_config_by_module
+from protobuf_to_pydantic.util import find_pyproject_file_path
 
 # If want to parse option, need to import the corresponding file
 #   see details:https://stackoverflow.com/a/59301849
@@ -19,15 +26,34 @@ logger = logging.getLogger(__name__)
 
 class CodeGen(Generic[ConfigT]):
     config: ConfigT
+    # The plugin parameters that do not affect the generated content, they are not part of the cache key
+    cache_ignore_param_set: FrozenSet[str] = frozenset({"workers", "cache_dir"})
 
-    def __init__(self, config_class: Type[ConfigT]) -> None:
+    def __init__(self, config_class: Type[ConfigT], request: Optional[CodeGeneratorRequest] = None) -> None:
+        """
+        :param config_class: plugin config class
+        :param request: If not None, only init by request (used by worker process),
+            otherwise read the request from stdin and write the response to stdout
+        """
         self.config_class: Type[ConfigT] = config_class
         self.param_dict: dict = {}
+        self.config_path: str = ""
+        # The hash of everything other than the proto file that affects the generated content
+        self._cache_hash_prefix: str = ""
+        self._request: CodeGeneratorRequest = CodeGeneratorRequest()
+        if request is not None:
+            self.init_by_request(request)
+            return
         with code_generation() as (request, response):
-            self.parse_param(request)
-            self.gen_config()
+            self.init_by_request(request)
             self.generate_pydantic_model(Descriptors(request), response)
 
+    def init_by_request(self, request: CodeGeneratorRequest) -> None:
+        self._request = request
+        self.parse_param(request)
+        self.gen_config()
+        self.gen_cache_hash_prefix(request)
+
     def parse_param(self, request: CodeGeneratorRequest) -> None:
         if not request.parameter:
             return
@@ -50,6 +76,7 @@ class CodeGen(Generic[ConfigT]):
         if not path_obj.exists():
             raise SystemError(f"Can not  find config file at {path_obj}")
         config_path: str = str(path_obj)
+        self.config_path = config_path
         print(f"Load config: {config_path}", file=sys.stderr)
 
         try_import_module_path_list: list = [f"{path_obj.name}", f"{path_obj.parent.name}.{path_obj.name}"]
@@ -72,13 +99,172 @@ class CodeGen(Generic[ConfigT]):
         if self.config == default_config:
             print(f"load config error. try use path and error:{error_path_dict}")
 
-    def generate_pydantic_model(self, descriptors: Descriptors, response: CodeGeneratorResponse) -> None:
-        for name, fd in descriptors.to_generate.items():
-            if fd.package in self.config.ignore_pkg_list:
+    @property
+    def workers(self) -> int:
+        """The number of processes used to generate files, set by the plugin parameter `workers`"""
+        return int(self.param_dict.get("workers", 1))
+
+    @property
+    def cache_dir(self) -> str:
+        """The cache directory of the generated content, set by the plugin parameter `cache_dir`"""
+        return self.param_dict.get("cache_dir", "")
+
+    def gen_cache_hash_prefix(self, request: CodeGeneratorRequest) -> None:
+        if not self.cache_dir:
+            return
+        hash_obj = hashlib.sha256()
+        hash_obj.update(__version__.encode())
+        for key, value in sorted(self.param_dict.items()):
+            if key not in self.cache_ignore_param_set:
+                hash_obj.update(f"{key}={value},".encode())
+        for file_path in (self.config_path, find_pyproject_file_path(self.config.pyproject_file_path)):
+            if file_path:
+                with open(file_path, "rb") as f:
+                    hash_obj.update(f.read())
+        self._cache_hash_prefix = hash_obj.hexdigest()
+
+    def get_cache_key(self, fd: FileDescriptorProto, descriptors: Descriptors) -> str:
+        """The key is generated from the file and its transitive dependencies,
+        as well as the package version, plugin parameters, config module and pyproject.toml"""
+        hash_obj = hashlib.sha256()
+        hash_obj.update(self._cache_hash_prefix.encode())
+        hash_obj.update(fd.SerializeToString(deterministic=True))
+
+        dependency_name_list: List[str] = list(fd.dependency)
+        dependency_fd_dict: Dict[str, FileDescriptorProto] = {}
+        while dependency_name_list:
+            dependency_name: str = dependency_name_list.pop()
+            if dependency_name in dependency_fd_dict or dependency_name not in descriptors.files:
                 continue
-            file = response.file.add()
-            file.name = fd.name[:-6].replace("-", "_").replace(".", "/") + f"{self.config.file_name_suffix}.py"
-            file.content = self.config.file_descriptor_proto_to_code(
+            dependency_fd: FileDescriptorProto = descriptors.files[dependency_name]
+            dependency_fd_dict[dependency_name] = dependency_fd
+            dependency_name_list.extend(dependency_fd.dependency)
+        for dependency_name in sorted(dependency_fd_dict):
+            hash_obj.update(dependency_fd_dict[dependency_name].SerializeToString(deterministic=True))
+        return hash_obj.hexdigest()
+
+    def get_content_from_cache(self, cache_key: str) -> Optional[str]:
+        cache_file_path: str = os.path.join(self.cache_dir, cache_key + ".py")
+        if not os.path.exists(cache_file_path):
+            return None
+        with open(cache_file_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def set_content_to_cache(self, cache_key: str, content: str) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_file_path: str = os.path.join(self.cache_dir, cache_key + ".py")
+        # Write to a temporary file first to prevent other processes from reading incomplete content
+        tmp_file_path: str = f"{cache_file_path}.{os.getpid()}.tmp"
+        with open(tmp_file_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_file_path, cache_file_path)
+
+    def gen_content(self, fd: FileDescriptorProto, descriptors: Descriptors) -> str:
+        if not self.cache_dir:
+            return self.config.file_descriptor_proto_to_code(fd=fd, descriptors=descriptors, config=self.config).content
+
+        cache_key: str = self.get_cache_key(fd, descriptors)
+        content: Optional[str] = self.get_content_from_cache(cache_key)
+        if content is None:
+            content = self.config.file_descriptor_proto_to_code(
                 fd=fd, descriptors=descriptors, config=self.config
             ).content
+            self.set_content_to_cache(cache_key, content)
+        else:
+            print(f"Use protobuf-to-pydantic cache for {fd.name}", file=sys.stderr)
+        return content
+
+    def generate_pydantic_model(self, descriptors: Descriptors, response: CodeGeneratorResponse) -> None:
+        fd_list: List[FileDescriptorProto] = [
+            fd for fd in descriptors.to_generate.values() if fd.package not in self.config.ignore_pkg_list
+        ]
+        workers: int = min(self.workers, len(fd_list))
+        if workers > 1:
+            # Each file is independent, the worker process rebuilds the config and descriptors from the request once
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.__class__, self.config_class, self._request.SerializeToString()),
+            ) as executor:
+                # `map` returns results in the order of the input, so the output is deterministic
+                content_list: List[str] = list(executor.map(_gen_content_in_worker, [fd.name for fd in fd_list]))
+        else:
+            content_list = [self.gen_content(fd, descriptors) for fd in fd_list]
+
+        for fd, content in zip(fd_list, content_list):
+            file = response.file.add()
+            file.name = self.get_file_name(fd)
+            file.content = content
+            print(f"Writing protobuf-to-pydantic code to {file.name}", file=sys.stderr)
+
+        if self.config.lazy_import:
+            self.generate_package_init(fd_list, response)
+
+    def get_file_name(self, fd: FileDescriptorProto) -> str:
+        return fd.name[:-6].replace("-", "_").replace(".", "/") + f"{self.config.file_name_suffix}.py"
+
+    def generate_package_init(self, fd_list: List[FileDescriptorProto], response: CodeGeneratorResponse) -> None:
+        """Generate the `__init__.py` of each package, the models are imported on first access(PEP 562)
+        Note: Only the files generated this time are included in the `__init__.py`
+        """
+        package_dict: Dict[str, Dict[str, str]] = {}
+        for fd in fd_list:
+            file_path: pathlib.PurePosixPath = pathlib.PurePosixPath(self.get_file_name(fd))
+            module_name_dict: Dict[str, str] = package_dict.setdefault(str(file_path.parent), {})
+            for name in [i.name for i in fd.enum_type] + [i.name for i in fd.message_type]:
+                if name in PYTHON_RESERVED:
+                    name = "_r_" + name
+                if name in module_name_dict:
+                    logger.warning(f"{name} of {fd.name} is already defined in {module_name_dict[name]}, ignore it")
+                    continue
+                module_name_dict[name] = "." + file_path.stem
+
+        for package_path, module_name_dict in package_dict.items():
+            file = response.file.add()
+            file.name = str(pathlib.PurePosixPath(package_path) / "__init__.py")
+            file.content = self.gen_package_init_content(module_name_dict)
             print(f"Writing protobuf-to-pydantic code to {file.name}", file=sys.stderr)
+
+    @staticmethod
+    def gen_package_init_content(module_name_dict: Dict[str, str]) -> str:
+        import_content: str = "".join(
+            f"    from {module_name} import {name}\n" for name, module_name in sorted(module_name_dict.items())
+        )
+        module_name_dict_content: str = "".join(
+            f'    "{name}": "{module_name}",\n' for name, module_name in sorted(module_name_dict.items())
+        )
+        all_content: str = "".join(f'    "{name}",\n' for name in sorted(module_name_dict))
+        return (
+            BaseP2C.head_content + "import importlib\n"
+            "import typing\n\n"
+            "if typing.TYPE_CHECKING:\n"
+            f"{import_content}\n"
+            f"_module_name_dict: typing.Dict[str, str] = {{\n{module_name_dict_content}}}\n"
+            f"__all__ = [\n{all_content}]\n\n\n"
+            "def __getattr__(name: str) -> typing.Any:\n"
+            '    """Import the model from its module on first access(PEP 562)"""\n'
+            "    if name not in _module_name_dict:\n"
+            '        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")\n'
+            "    value: typing.Any = getattr(importlib.import_module(_module_name_dict[name], __name__), name)\n"
+            "    globals()[name] = value\n"
+            "    return value\n\n\n"
+            "def __dir__() -> typing.List[str]:\n"
+            "    return sorted(set(globals()) | set(__all__))\n"
+        )
+
+
+_worker_context: Optional[Tuple[CodeGen, Descriptors]] = None
+
+
+def _init_worker(code_gen_class: Type[CodeGen], config_class: Type[ConfigT], request_bytes: bytes) -> None:
+    global _worker_context
+    request: CodeGeneratorRequest = CodeGeneratorRequest()
+    request.ParseFromString(request_bytes)
+    _worker_context = (code_gen_class(config_class, request=request), Descriptors(request))
+
+
+def _gen_content_in_worker(fd_name: str) -> str:
+    if _worker_context is None:
+        raise RuntimeError("The worker process is not initialized")
+    code_gen, descriptors = _worker_context
+    return code_gen.gen_content(descriptors.to_generate[fd_name], descriptors)
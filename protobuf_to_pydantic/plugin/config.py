@@ -33,6 +33,24 @@ class ConfigModel(BaseModel):
         ),
     )
     file_descriptor_proto_to_code: Type[FileDescriptorProtoToCode] = Field(default=FileDescriptorProtoToCode)
+    parse_comment: bool = Field(
+        default=False,
+        description=(
+            "If True, the rules of field are also extracted from the text comments(start with `comment_prefix`)"
+            " in the `SourceCodeInfo` provided by the protobuf compiler"
+        ),
+    )
+    gen_protobuf_method: bool = Field(
+        default=False,
+        description="If True, generate the `from_protobuf` and `to_protobuf` methods for each model",
+    )
+    lazy_import: bool = Field(
+        default=False,
+        description=(
+            "If True, the models of other modules are imported on first use instead of at import time,"
+            " and generate the `__init__.py` of each package that imports the models on first access(PEP 562)"
+        ),
+    )
 
     desc_template_instance: DescTemplate = Field(
         default_factory=lambda: DescTemplate({}, ""),
@@ -2,23 +2,24 @@ import inspect
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from mypy_protobuf.main import PYTHON_RESERVED, Descriptors, SourceCodeLocation
 from pydantic import BaseModel
 from pydantic.fields import FieldInfo, Undefined
 
-from protobuf_to_pydantic import customer_validator
+from protobuf_to_pydantic import convert, customer_validator
 from protobuf_to_pydantic.customer_con_type import pydantic_con_dict
 from protobuf_to_pydantic.gen_code import BaseP2C
 from protobuf_to_pydantic.gen_model import (
     DescTemplate,
-    MessagePaitModel,
     field_param_dict_handle,
+    gen_field_param_dict,
     python_type_default_value_dict,
     type_dict,
 )
 from protobuf_to_pydantic.get_desc.from_pb_option.base import field_option_handle, protobuf_common_type_dict
+from protobuf_to_pydantic.get_desc.from_source_code_info import get_desc_from_file_descriptor_proto
 from protobuf_to_pydantic.grpc_types import (
     AnyMessage,
     DescriptorProto,
@@ -27,6 +28,7 @@ from protobuf_to_pydantic.grpc_types import (
     FileDescriptorProto,
 )
 from protobuf_to_pydantic.plugin.my_types import ProtobufTypeModel
+from protobuf_to_pydantic.types import DescFromOptionTypedDict
 
 if TYPE_CHECKING:
     from protobuf_to_pydantic.plugin.config import ConfigModel
@@ -44,6 +46,7 @@ class FileDescriptorProtoToCode(BaseP2C):
             module_path=config.module_path,
             code_indent=config.code_indent,
             pyproject_file_path=config.pyproject_file_path,
+            gen_protobuf_method=config.gen_protobuf_method,
         )
         self.config = config
         self._fd: FileDescriptorProto = fd
@@ -55,6 +58,11 @@ class FileDescriptorProtoToCode(BaseP2C):
         else:
             self._add_import_code(config.base_model_class.__module__, config.base_model_class.__name__)
         self._parse_desc_name_dict: Dict[str, str] = {}
+        self._message_full_name_dict: Dict[int, str] = {}
+        self._comment_desc_dict: Optional[Dict[str, DescFromOptionTypedDict]] = None
+        # The names of other modules used by each model when `lazy_import` is enabled
+        # key is the class path, value is {name: module name}
+        self._lazy_import_dict: Dict[str, Dict[str, str]] = {}
         self._parse_field_descriptor()
 
     def _add_other_module_pkg(self, other_fd: FileDescriptorProto, type_str: str) -> None:
@@ -65,6 +73,10 @@ class FileDescriptorProtoToCode(BaseP2C):
         #   fd name:example_proto/demo/demo.proto
         #   other_fd name: example_proto/common/single.proto
         #   output: from ..common.single_p2p import DemoMessage
+        self._add_import_code(self._get_other_module_name(other_fd), type_str)
+
+    def _get_other_module_name(self, other_fd: FileDescriptorProto) -> str:
+        """Get the relative module name of the file generated from other_fd, e.g: `..common.single_p2p`"""
         fd_path_list: Tuple[str, ...] = Path(self._fd.name).parts
         message_path_list: Tuple[str, ...] = Path(other_fd.name).parts
         index: int = -1
@@ -81,7 +93,10 @@ class FileDescriptorProtoToCode(BaseP2C):
         logger.info((self._fd.name, other_fd.name, index))
         if index != "-1":
             module_name = "." * (len(message_path_list) - (index + 1)) + module_name
-        self._add_import_code(module_name, type_str)
+        return module_name
+
+    def _is_lazy_import(self, other_fd: FileDescriptorProto) -> bool:
+        return self.config.lazy_import and other_fd.name != self._fd.name
 
     def _enum(self, enums: Iterable[EnumDescriptorProto], scl_prefix: SourceCodeLocation, indent: int = 0) -> str:
         """
@@ -142,6 +157,8 @@ class FileDescriptorProtoToCode(BaseP2C):
         field_info_dict: dict = {}
         rule_type_str: Optional[str] = None
         nested_message_name: Optional[str] = None
+        # The name and module of the type that imported on first use
+        lazy_import_item: Optional[Tuple[str, str]] = None
         if field.type == 11:
             # message handle
             message = self._descriptors.messages[field.type_name]
@@ -167,7 +184,10 @@ class FileDescriptorProtoToCode(BaseP2C):
                 nested_message_name = type_str
 
                 message_fd: FileDescriptorProto = self._descriptors.message_to_fd[field.type_name]
-                self._add_other_module_pkg(message_fd, type_str)
+                if self._is_lazy_import(message_fd):
+                    lazy_import_item = (type_str, self._get_other_module_name(message_fd))
+                else:
+                    self._add_other_module_pkg(message_fd, type_str)
                 if message == desc:
                     # if self-referencing, need use Python type hints postponed annotations
                     type_str = f'"{type_str}"'
@@ -181,7 +201,10 @@ class FileDescriptorProtoToCode(BaseP2C):
             field_info_dict["default"] = 0
             rule_type_str = "enum"
             message_fd = self._descriptors.message_to_fd[field.type_name]
-            self._add_other_module_pkg(message_fd, type_str)
+            if self._is_lazy_import(message_fd):
+                lazy_import_item = (type_str, self._get_other_module_name(message_fd))
+            else:
+                self._add_other_module_pkg(message_fd, type_str)
         elif field.type not in type_dict:
             logger.error(f"Not found {field.type} in type_dict")
             return None
@@ -198,9 +221,15 @@ class FileDescriptorProtoToCode(BaseP2C):
             field_info_dict.pop("default", "")
             field_info_dict["default_factory"] = list
             rule_type_str = "repeated"
-        if len(field.options.ListFields()) != 0 and rule_type_str and not skip_validate_rule:
+        field_comment_dict: dict = self._get_field_comment_dict(desc, field) if self.config.parse_comment else {}
+        if (len(field.options.ListFields()) != 0 or field_comment_dict) and rule_type_str and not skip_validate_rule:
             # protobuf option support
-            field_option_info_dict: dict = field_option_handle(rule_type_str, field.type_name, field)  # type: ignore
+            field_option_info_dict: dict = {}
+            if len(field.options.ListFields()) != 0:
+                field_option_info_dict = field_option_handle(rule_type_str, field.type_name, field)  # type: ignore
+            if field_comment_dict:
+                # text comment support, the rules of option have a higher priority
+                field_option_info_dict = {**field_comment_dict, **field_option_info_dict}
 
             skip = field_option_info_dict.pop("skip", False)
             if nested_message_name:
@@ -208,9 +237,9 @@ class FileDescriptorProtoToCode(BaseP2C):
                     nested_message_config_dict[nested_message_name] = {}
                 nested_message_config_dict[nested_message_name]["skip"] = skip
 
-            field_option_info_dict = MessagePaitModel(
-                **self._desc_template.handle_template_var(field_option_info_dict)
-            ).dict()
+            field_option_info_dict = gen_field_param_dict(
+                self._desc_template.handle_template_var(field_option_info_dict)
+            )
             if not field_option_info_dict.pop("enable", False):
                 return None
             field_param_dict_handle(
@@ -260,6 +289,10 @@ class FileDescriptorProtoToCode(BaseP2C):
             else:
                 value_type_str = self._get_protobuf_type_model(message.field[1]).py_type_str
             type_str = f"typing.Dict[{key_type_str}, {value_type_str}]"
+        elif lazy_import_item:
+            # Use forward ref, the type will be imported before the first validation of model
+            self._lazy_import_dict.setdefault(self._get_class_path(desc), {})[lazy_import_item[0]] = lazy_import_item[1]
+            type_str = f'"{type_str}"'
 
         # custom field support
         field_class: Optional[FieldInfo] = field_info_dict.pop("field", None)
@@ -321,6 +354,8 @@ class FileDescriptorProtoToCode(BaseP2C):
 
         use_custom_type: bool = False
         nested_message_config_dict: dict = {}
+        # The fields that generated in the model, used to generate the `to_protobuf` method
+        gen_field_list: List[FieldDescriptorProto] = []
         for idx, field in enumerate(desc.field):
             if field.name in PYTHON_RESERVED:
                 continue
@@ -333,6 +368,7 @@ class FileDescriptorProtoToCode(BaseP2C):
             if _content_tuple:
                 class_head_content += _content_tuple[0]
                 class_field_content += _content_tuple[1]
+                gen_field_list.append(field)
 
         if desc.nested_type:
             class_head_content += self._message_nested_type_handle(desc, scl_prefix, indent, nested_message_config_dict)
@@ -352,6 +388,9 @@ class FileDescriptorProtoToCode(BaseP2C):
                 self._add_import_code("pydantic", "root_validator")
                 self._add_import_code("protobuf_to_pydantic.customer_validator", "check_one_of")
 
+        if self.gen_protobuf_method:
+            class_field_content += "\n" + self._message_protobuf_method(desc, class_name, gen_field_list, indent)
+
         if use_custom_type:
             config_content: str = f"{' ' * (indent + self.code_indent)}class Config:\n"
             config_content += f"{' ' * (indent + self.code_indent * 2)}arbitrary_types_allowed = True\n\n"
@@ -367,6 +406,81 @@ class FileDescriptorProtoToCode(BaseP2C):
         self._parse_desc_name_dict[class_name] = content
         return content
 
+    def _get_message_path(self, desc: DescriptorProto) -> str:
+        """Get the path of the message in the file, e.g: `NestedMessage.UserPayMessage`"""
+        if not self._message_full_name_dict:
+            self._message_full_name_dict = {id(v): k for k, v in self._descriptors.messages.items()}
+        message_path: str = self._message_full_name_dict[id(desc)]
+        if self._fd.package:
+            return message_path[len(self._fd.package) + 2 :]
+        return message_path[1:]
+
+    def _get_class_path(self, desc: DescriptorProto) -> str:
+        """Get the path of the model class in the generated file, e.g: `NestedMessage.UserPayMessage`"""
+        return ".".join(
+            "_r_" + name if name in PYTHON_RESERVED else name for name in self._get_message_path(desc).split(".")
+        )
+
+    def _get_field_comment_dict(self, desc: DescriptorProto, field: FieldDescriptorProto) -> dict:
+        """Get the rules of field from the comments of `SourceCodeInfo` provided by the protobuf compiler"""
+        if self._comment_desc_dict is None:
+            self._comment_desc_dict = get_desc_from_file_descriptor_proto(self._fd, self.config.comment_prefix)
+        message_name, *nested_name_list = self._get_message_path(desc).split(".")
+        desc_dict: Optional[DescFromOptionTypedDict] = self._comment_desc_dict.get(message_name, None)
+        for nested_name in nested_name_list:
+            if desc_dict is None:
+                break
+            desc_dict = desc_dict["nested"].get(nested_name, None)  # type: ignore
+        if desc_dict is None:
+            return {}
+        return dict(desc_dict["message"].get(field.name) or {})
+
+    def _message_protobuf_method(
+        self, desc: DescriptorProto, class_name: str, field_list: List[FieldDescriptorProto], indent: int
+    ) -> str:
+        """Generate the method of converting between Message and Model
+        e.g:
+            @classmethod
+            def from_protobuf(cls, message: Message, validate: bool = True) -> "UserMessage":
+                return msg_to_model(message, cls, validate=validate)
+
+            def to_protobuf(self) -> demo_pb2.UserMessage:
+                message = demo_pb2.UserMessage()
+                message.uid = self.uid
+                ...
+                return message
+        """
+        # The `_pb2` module generated by protoc is in the same directory as the file generated by the plugin
+        pb2_module_name: str = Path(self._fd.name).stem.replace("-", "_") + "_pb2"
+        self._add_import_code(".", pb2_module_name)
+        return self._gen_protobuf_method_code(
+            class_name,
+            f"{pb2_module_name}.{self._get_message_path(desc)}",
+            [(field.name, *self._get_field_kind(field), self._field_check_presence(field)) for field in field_list],
+            indent=indent + self.code_indent,
+        )
+
+    def _get_field_kind(self, field: FieldDescriptorProto) -> Tuple[str, str]:
+        """Get the container kind and value kind of the field, see `convert.get_field_kind`"""
+        container_kind: str = convert.REPEATED if field.label == field.LABEL_REPEATED else convert.SINGLE
+        if field.type != 11:
+            return container_kind, convert.SCALAR
+        message: DescriptorProto = self._descriptors.messages[field.type_name]
+        if message.options.map_entry:
+            return convert.MAP, self._get_field_kind(message.field[1])[1]
+        return container_kind, convert.well_known_kind_dict.get(field.type_name[1:], convert.MESSAGE)
+
+    def _field_check_presence(self, field: FieldDescriptorProto) -> bool:
+        """see `convert.field_check_presence`"""
+        if field.HasField("oneof_index"):
+            # Include proto3 optional (synthetic oneof)
+            return True
+        return (
+            self._fd.syntax in ("", "proto2")
+            and field.label == field.LABEL_OPTIONAL
+            and self._get_field_kind(field) == (convert.SINGLE, convert.SCALAR)
+        )
+
     def _get_protobuf_type_model(self, field: FieldDescriptorProto) -> ProtobufTypeModel:
         rule_type_str: str = ""
         type_factory: Optional[Any] = None
@@ -426,3 +540,16 @@ class FileDescriptorProtoToCode(BaseP2C):
         self._content_deque.append(self._enum(self._fd.enum_type, [FileDescriptorProto.ENUM_TYPE_FIELD_NUMBER]))
         for desc in self._fd.message_type:
             self._content_deque.append(self._message(desc, [FileDescriptorProto.ENUM_TYPE_FIELD_NUMBER]))
+        if self._lazy_import_dict:
+            self._content_deque.append(self._gen_lazy_import_code())
+
+    def _gen_lazy_import_code(self) -> str:
+        """Generate the code that imports the models of other modules on first use
+        e.g:
+            set_lazy_import(UserMessage, __package__, {"DemoMessage": "..common.single_p2p"})
+        """
+        self._add_import_code("protobuf_to_pydantic.util", "set_lazy_import")
+        return "".join(
+            f"set_lazy_import({class_path}, __package__, {self._get_value_code(import_dict)})\n"
+            for class_path, import_dict in self._lazy_import_dict.items()
+        )
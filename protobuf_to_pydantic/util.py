@@ -1,10 +1,38 @@
+import importlib
+import importlib.util
 import inspect
 import json
 import logging
 import os
+import re
 import sys
+import sysconfig
+import tokenize
+from collections import OrderedDict
 from datetime import timedelta
-from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, Optional, Tuple, Type, Union
+from functools import partial
+from threading import RLock
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Generator,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pydantic import BaseConfig, BaseModel, create_model
 
@@ -12,9 +40,11 @@ if TYPE_CHECKING:
     from pydantic.main import Model
     from pydantic.typing import AnyClassMethod
 
-from protobuf_to_pydantic.grpc_types import Duration, ProtobufRepeatedType, Timestamp
+from protobuf_to_pydantic.grpc_types import Duration, Message, ProtobufRepeatedType, Timestamp
 from protobuf_to_pydantic.types import FieldInfoTypedDict
 
+_T = TypeVar("_T")
+
 
 class Timedelta(timedelta):
     """Timedelta object supporting Protobuf.Duration of pydantic.field."""
@@ -34,6 +64,100 @@ class Timedelta(timedelta):
         return timedelta(seconds=v)
 
 
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class LRUCache(Generic[_T]):
+    """Thread-safe LRU cache with hit/miss statistics
+
+    If maxsize is None, the cache can grow without bound, if maxsize is 0, nothing will be cached
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128) -> None:
+        self._maxsize: Optional[int] = maxsize
+        self._data: "OrderedDict[Hashable, _T]" = OrderedDict()
+        self._lock: RLock = RLock()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def get(self, key: Hashable, default: Optional[_T] = None) -> Optional[_T]:
+        with self._lock:
+            try:
+                value: _T = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: _T) -> None:
+        with self._lock:
+            if self._maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self._maxsize is not None:
+                while len(self._data) > self._maxsize:
+                    self._data.popitem(last=False)
+
+    def setdefault(self, key: Hashable, value: _T) -> _T:
+        """If the key already exists, return the cached value, otherwise cache the value and return it"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.set(key, value)
+            return value
+
+    def set_maxsize(self, maxsize: Optional[int]) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            if maxsize is not None:
+                while len(self._data) > maxsize:
+                    self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._data))
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def freeze_value(value: Any) -> Hashable:
+    """Convert the value to a hashable value that can be used as a cache key,
+    the containers are tagged by their type (e.g. `[1]` and `(1,)` are different) and
+    the protobuf message is represented by its content.
+    Raise TypeError if the value is unhashable and cannot be converted
+    (the id of object can not be used, it may be reused by another object after the object is released)
+    """
+    if isinstance(value, dict):
+        return dict, tuple(sorted(((k, freeze_value(v)) for k, v in value.items()), key=lambda i: repr(i[0])))
+    elif isinstance(value, (list, tuple)):
+        return type(value), tuple(freeze_value(i) for i in value)
+    elif isinstance(value, (set, frozenset)):
+        return type(value), frozenset(freeze_value(i) for i in value)
+    elif isinstance(value, Message):
+        # The message that miss required fields can also be serialized
+        return Message, value.DESCRIPTOR.full_name, value.SerializePartialToString(deterministic=True)
+    hash(value)
+    return value
+
+
 def create_pydantic_model(
     annotation_dict: Dict[str, Tuple[Type, Any]],
     class_name: str = "DynamicModel",
@@ -55,6 +179,73 @@ def create_pydantic_model(
     )
 
 
+_lazy_model_lock: RLock = RLock()
+
+
+class _LazyFields(object):
+    """Replace the `__fields__` of the lazy model, the model is resolved on the first access of `__fields__`
+    (pydantic reads the fields through it when validating, generating schema and so on)
+    """
+
+    def __init__(self, fields: Dict[str, Any]) -> None:
+        self.fields: Dict[str, Any] = fields
+
+    def __get__(self, instance: Any, owner: Type[BaseModel]) -> Dict[str, Any]:
+        resolve_lazy_model(owner)
+        return self.fields
+
+
+def set_lazy_model_resolver(model: Type[BaseModel], resolver: Callable[[], None]) -> None:
+    """Defer the creation of the models referenced by the model (its fields are forward refs),
+    the resolver will be called to update the forward refs of model before the fields of model are first used
+    (e.g. validation, `Model.schema()`, `Model.__fields__`)
+    """
+    setattr(model, "_lazy_resolver", resolver)
+    setattr(model, "__fields__", _LazyFields(model.__fields__))
+
+
+def resolve_lazy_model(model: Type[BaseModel]) -> None:
+    """Create the models referenced by the lazy model and update its forward refs, the other model is not affected
+    Note: the referenced models are also lazy, they will be resolved when they are used
+    """
+    if "_lazy_resolver" not in model.__dict__:
+        return
+    with _lazy_model_lock:
+        resolver: Optional[Callable[[], None]] = model.__dict__.get("_lazy_resolver", None)
+        if resolver is None:
+            # Resolved by other thread, or is being resolved by the current thread(the resolver reads `__fields__`)
+            return
+        setattr(model, "_lazy_resolver", None)
+        try:
+            resolver()
+        except Exception:
+            setattr(model, "_lazy_resolver", resolver)
+            raise
+        setattr(model, "__fields__", model.__dict__["__fields__"].fields)
+        delattr(model, "_lazy_resolver")
+
+
+def import_forward_refs(model: Type[BaseModel], package: Optional[str], import_dict: Dict[str, str]) -> None:
+    """Import the names from the modules(relative to package) and update the forward refs of model
+
+    :param model: pydantic model
+    :param package: the package of relative module, generally is `__package__`
+    :param import_dict: key is the name, value is the module name, e.g: {"DemoMessage": "..common.single_p2p"}
+    """
+    model.update_forward_refs(
+        **{
+            name: getattr(importlib.import_module(module_name, package), name)
+            for name, module_name in import_dict.items()
+        }
+    )
+
+
+def set_lazy_import(model: Type[BaseModel], package: Optional[str], import_dict: Dict[str, str]) -> None:
+    """The names of other modules used by model are imported before the fields of model are first used
+    (see `import_forward_refs`)"""
+    set_lazy_model_resolver(model, partial(import_forward_refs, model, package, import_dict))
+
+
 def replace_protobuf_type_to_python_type(value: Any) -> Any:
     """
     protobuf.Duration -> datetime.timedelta
@@ -84,85 +275,363 @@ def gen_dict_from_desc_str(comment_prefix: str, desc: str) -> FieldInfoTypedDict
     return pait_dict  # type: ignore
 
 
-# flake8: noqa: C901
-def format_content(content_str: str, pyproject_file_path: str = "") -> str:
-    if not pyproject_file_path:
-        for path in sys.path:
-            pyproject_file_path = os.path.join(path, "pyproject.toml")
-            if os.path.exists(pyproject_file_path):
-                break
-            pyproject_file_path = ""
-
-    pyproject_dict: dict = {}
+# tuple(sys.path) -> the pyproject file path found through `sys.path`
+_pyproject_file_path_cache: LRUCache[str] = LRUCache(maxsize=8)
+
+
+def find_pyproject_file_path(pyproject_file_path: str = "") -> str:
+    """If the pyproject file path is not specified, find the pyproject.toml through `sys.path`
+    (the result is resolved once for the same `sys.path`)
+    """
+    if pyproject_file_path:
+        return pyproject_file_path
+    sys_path_tuple: Tuple[str, ...] = tuple(sys.path)
+    cache_value: Optional[str] = _pyproject_file_path_cache.get(sys_path_tuple)
+    if cache_value is not None:
+        return cache_value
+    for path in sys_path_tuple:
+        pyproject_file_path = os.path.join(path, "pyproject.toml")
+        if os.path.exists(pyproject_file_path):
+            break
+        pyproject_file_path = ""
+    _pyproject_file_path_cache.set(sys_path_tuple, pyproject_file_path)
+    return pyproject_file_path
+
+
+_identifier_re: Pattern = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_top_level_define_prefix_tuple: Tuple[str, ...] = ("class ", "def ", "async def ", "@")
+
+
+def _get_import_section_index(module_name: str, known_first_party: FrozenSet[str]) -> int:
+    """Return the section of the import, like isort:
+    0: future, 1: standard library, 2: third party, 3: first party(module in `known_first_party`), 4: relative
+    """
+    if module_name == "__future__":
+        return 0
+    elif module_name.startswith("."):
+        return 4
+    top_module_name: str = module_name.split(".")[0]
+    if top_module_name in known_first_party:
+        return 3
+    if top_module_name in getattr(sys, "stdlib_module_names", sys.builtin_module_names):
+        return 1
     try:
-        import toml  # type: ignore
-    except ImportError:
-        logging.warning(
-            "The toml module is not installed and the configuration information cannot be obtained through"
-            " pyproject.toml"
+        spec: Any = importlib.util.find_spec(top_module_name)
+    except (ImportError, ValueError):
+        return 2
+    if spec is None:
+        return 2
+    origin: str = spec.origin or (list(spec.submodule_search_locations or []) or [""])[0]
+    if origin.startswith(sysconfig.get_paths()["stdlib"]) and not (
+        "site-packages" in origin or "dist-packages" in origin
+    ):
+        return 1
+    return 2
+
+
+def _get_first_party_module_name_set(root_path: str) -> FrozenSet[str]:
+    """Return the names of the packages and modules in the project root path(the dir of pyproject.toml)"""
+    module_name_set: Set[str] = set()
+    for name in os.listdir(root_path):
+        path: str = os.path.join(root_path, name)
+        if os.path.isdir(path) and os.path.exists(os.path.join(path, "__init__.py")):
+            module_name_set.add(name)
+        elif name.endswith(".py") and os.path.isfile(path):
+            module_name_set.add(name[: -len(".py")])
+    return frozenset(module_name_set)
+
+
+def _split_import_block(line_list: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    """Split the content into head comments, import statements(one statement per item) and body"""
+    index: int = 0
+    head_list: List[str] = []
+    while index < len(line_list) and (not line_list[index].strip() or line_list[index].startswith("#")):
+        head_list.append(line_list[index])
+        index += 1
+
+    import_list: List[str] = []
+    while index < len(line_list):
+        line: str = line_list[index]
+        if not line.strip():
+            index += 1
+            continue
+        if not line.startswith(("import ", "from ")):
+            break
+        if "(" in line and ")" not in line:
+            # Parenthesized multi-line import
+            while ")" not in line_list[index]:
+                index += 1
+                line += " " + line_list[index].strip()
+            line = line.replace("(", "").replace(")", "")
+        import_list.append(line)
+        index += 1
+    return head_list, import_list, line_list[index:]
+
+
+def _format_import_list(
+    import_list: List[str], used_name_set: Set[str], line_length: int, known_first_party: FrozenSet[str]
+) -> List[str]:
+    """Remove the unused imports, merge `from` imports of the same module, and sort imports by section"""
+    # module -> (is `from` import, names(for `import a.b as c` is `a.b as c`)), comment
+    from_import_dict: Dict[str, Set[str]] = {}
+    module_import_set: Set[str] = set()
+    comment_dict: Dict[str, str] = {}
+    for import_str in import_list:
+        import_str, _, comment = import_str.partition("#")
+        if import_str.startswith("import "):
+            for module_name in import_str[len("import ") :].split(","):
+                module_name = " ".join(module_name.split())
+                name: str = module_name.split(" as ")[-1].split(".")[0]
+                if name in used_name_set:
+                    module_import_set.add(module_name)
+                    if comment:
+                        comment_dict[module_name] = comment.strip()
+        else:
+            module_name, _, name_str = import_str[len("from ") :].partition(" import ")
+            module_name = module_name.strip()
+            for name in name_str.split(","):
+                name = " ".join(name.split())
+                if name and (name == "*" or name.split(" as ")[-1] in used_name_set):
+                    from_import_dict.setdefault(module_name, set()).add(name)
+                    if comment:
+                        comment_dict[module_name] = comment.strip()
+
+    section_list: List[List[str]] = [[], [], [], [], []]
+
+    def _add_comment(_import_str: str, _module_name: str) -> str:
+        if _module_name in comment_dict:
+            _import_str += "  # " + comment_dict[_module_name]
+        return _import_str
+
+    # Like isort, the `import` statements are placed before the `from` statements in each section
+    for module_name in sorted(module_import_set):
+        section_list[_get_import_section_index(module_name, known_first_party)].append(
+            _add_comment(f"import {module_name}", module_name)
         )
-    else:
-        if pyproject_file_path:
-            with open(pyproject_file_path, "r") as f:
-                pyproject_dict = toml.loads("\n".join(f.readlines()))
-    try:
-        p2p_format_dict: dict = pyproject_dict["tool"]["protobuf-to-pydantic"]["format"]
-    except KeyError:
-        p2p_format_dict = {}
+    for module_name in sorted(from_import_dict):
+        name_list: List[str] = sorted(from_import_dict[module_name])
+        import_str = _add_comment(f"from {module_name} import {', '.join(name_list)}", module_name)
+        if len(import_str) > line_length:
+            # Same as the black style
+            import_str = "\n".join(
+                [_add_comment(f"from {module_name} import (", module_name)]
+                + [f"    {name}," for name in name_list]
+                + [")"]
+            )
+        section_list[_get_import_section_index(module_name, known_first_party)].append(import_str)
+
+    result_list: List[str] = []
+    for section in section_list:
+        if not section:
+            continue
+        if result_list:
+            result_list.append("")
+        result_list.extend(section)
+    return result_list
 
-    try:
-        import isort  # type: ignore
-    except ImportError:
-        pass
-    else:
-        if p2p_format_dict.get("isort", True):
-            if pyproject_file_path:
-                content_str = isort.code(content_str, config=isort.Config(settings_file=pyproject_file_path))
-            else:
-                content_str = isort.code(content_str)
 
+def _get_string_line_index(line_list: List[str]) -> Tuple[Set[int], Set[int]]:
+    """Return the index of the first line of each multi-line string(e.g. docstring),
+    and the index of the other lines of these strings(the content of the string can not be changed)
+    """
+    start_index_set: Set[int] = set()
+    inner_index_set: Set[int] = set()
+    # Python 3.12+ splits the f-string into multiple tokens
+    fstring_start_type: Optional[int] = getattr(tokenize, "FSTRING_START", None)
+    fstring_end_type: Optional[int] = getattr(tokenize, "FSTRING_END", None)
+    fstring_start_row_list: List[int] = []
+    line_iter: Iterator[str] = iter([line + "\n" for line in line_list])
     try:
-        import autoflake  # type: ignore
-    except ImportError:
-        pass
-    else:
-        autoflake_dict: dict = {}
-        try:
-            for k, v in pyproject_dict["tool"]["autoflake"].items():
-                k = k.replace("-", "_")
-                if k not in inspect.signature(autoflake.fix_code).parameters.keys():
+        for token in tokenize.generate_tokens(lambda: next(line_iter, "")):
+            if token.type == fstring_start_type:
+                fstring_start_row_list.append(token.start[0])
+                continue
+            elif token.type == fstring_end_type:
+                start_row: int = fstring_start_row_list.pop()
+                if fstring_start_row_list:
                     continue
-                autoflake_dict[k] = v
+            elif token.type == tokenize.STRING:
+                start_row = token.start[0]
+            else:
+                continue
+            if start_row != token.end[0]:
+                start_index_set.add(start_row - 1)
+                inner_index_set.update(range(start_row, token.end[0]))
+    except (tokenize.TokenError, SyntaxError):
+        # Not a complete code, can not find the strings
+        pass
+    return start_index_set, inner_index_set
 
-        except KeyError:
-            pass
-        if p2p_format_dict.get("autoflake", False):
-            if autoflake_dict:
-                content_str = autoflake.fix_code(content_str, **autoflake_dict)
+
+def _format_body(line_list: List[str]) -> List[str]:
+    """Normalize the blank lines of body, two blank lines before the top-level definition, otherwise at most one.
+    The content of multi-line strings is not changed
+    """
+    start_index_set, inner_index_set = _get_string_line_index(line_list)
+    result_list: List[str] = []
+    blank_line_cnt: int = 0
+    for index, line in enumerate(line_list):
+        if index in inner_index_set:
+            result_list.append(line)
+            continue
+        if index not in start_index_set:
+            line = line.rstrip()
+        if not line.strip():
+            blank_line_cnt += 1
+            continue
+        if result_list:
+            if line.startswith(_top_level_define_prefix_tuple) and not result_list[-1].startswith(("@", "#")):
+                blank_line_cnt = 2
+            elif result_list[-1].endswith(":"):
+                blank_line_cnt = 0
             else:
-                content_str = autoflake.fix_code(content_str)
+                blank_line_cnt = min(blank_line_cnt, 2 if not line.startswith((" ", "\t")) else 1)
+            result_list.extend([""] * blank_line_cnt)
+        result_list.append(line)
+        blank_line_cnt = 0
+    return result_list
 
-    try:
-        import black  # type: ignore
-    except ImportError:
-        pass
-    else:
-        black_config_dict: dict = {}
+
+def builtin_format_content(content_str: str, line_length: int = 88, known_first_party: Iterable[str] = ()) -> str:
+    """A lightweight formatter for the generated code that does not depend on isort, autoflake and black.
+
+    It only produces stable sorted imports (unused imports are removed) and normalized blank lines,
+    the code itself is generated in a formatted style
+
+    :param known_first_party: the names of the first party packages, their imports are placed in the first party section
+    """
+    head_list, import_list, body_list = _split_import_block(content_str.splitlines())
+    body_list = _format_body(body_list)
+    used_name_set: Set[str] = set(_identifier_re.findall("\n".join(body_list)))
+    import_list = _format_import_list(import_list, used_name_set, line_length, frozenset(known_first_party))
+
+    while head_list and not head_list[-1].strip():
+        head_list.pop()
+    result_list: List[str] = head_list
+    if import_list:
+        result_list.extend(import_list)
+    if body_list:
+        if result_list:
+            result_list.extend(["", ""])
+        result_list.extend(body_list)
+    return "\n".join(result_list) + "\n"
+
+
+class Formatter(object):
+    """Format the generated code through isort, autoflake and black.
+
+    The configuration (pyproject.toml) and tool handles are resolved once when the formatter is created,
+    and then can be used to format many contents
+    """
+
+    def __init__(self, pyproject_file_path: str = "") -> None:
+        self.pyproject_file_path: str = find_pyproject_file_path(pyproject_file_path)
+        self._format_func_list: List[Callable[[str], str]] = []
+
+        pyproject_dict: dict = {}
+        try:
+            import toml  # type: ignore
+        except ImportError:
+            logging.warning(
+                "The toml module is not installed and the configuration information cannot be obtained through"
+                " pyproject.toml"
+            )
+        else:
+            if self.pyproject_file_path:
+                with open(self.pyproject_file_path, "r") as f:
+                    pyproject_dict = toml.loads("\n".join(f.readlines()))
         try:
-            black_config_dict = {k.replace("-", "_"): v for k, v in pyproject_dict["tool"]["black"].items()}
-            # target_version param replace
-            target_versions = {
-                getattr(black.TargetVersion, i.upper()) for i in black_config_dict.pop("target_version", [])
-            }
-            if target_versions:
-                black_config_dict["target_versions"] = target_versions
-
-            black_config_dict = {k: v for k, v in black_config_dict.items() if k in black.Mode.__annotations__}
+            p2p_format_dict: dict = pyproject_dict["tool"]["protobuf-to-pydantic"]["format"]
         except KeyError:
-            pass
+            p2p_format_dict = {}
+
+        if p2p_format_dict.get("engine", "") == "builtin":
+            # Do not need to import isort, autoflake and black, but the line length is consistent with black
+            line_length: int = pyproject_dict.get("tool", {}).get("black", {}).get("line-length", 88)
+            # Same as isort, the first party packages can be specified by `known_first_party`,
+            # otherwise they are the packages in the dir of pyproject.toml
+            known_first_party: Iterable[str] = (
+                pyproject_dict.get("tool", {}).get("isort", {}).get("known_first_party", ())
+            )
+            if not known_first_party and self.pyproject_file_path:
+                known_first_party = _get_first_party_module_name_set(
+                    os.path.dirname(os.path.abspath(self.pyproject_file_path))
+                )
+            self._format_func_list.append(
+                partial(builtin_format_content, line_length=line_length, known_first_party=frozenset(known_first_party))
+            )
+            return
+        if p2p_format_dict.get("isort", True):
+            self._init_isort()
+        if p2p_format_dict.get("autoflake", False):
+            self._init_autoflake(pyproject_dict)
         if p2p_format_dict.get("black", False):
-            if black_config_dict:
-                content_str = black.format_str(content_str, mode=black.Mode(**black_config_dict))
-            else:
-                content_str = black.format_str(content_str, mode=black.Mode())
-    return content_str
+            self._init_black(pyproject_dict)
+
+    def _init_isort(self) -> None:
+        try:
+            import isort  # type: ignore
+        except ImportError:
+            return
+        if self.pyproject_file_path:
+            isort_config: Any = isort.Config(settings_file=self.pyproject_file_path)
+            self._format_func_list.append(lambda content_str: isort.code(content_str, config=isort_config))
+        else:
+            self._format_func_list.append(isort.code)
+
+    def _init_autoflake(self, pyproject_dict: dict) -> None:
+        try:
+            import autoflake  # type: ignore
+        except ImportError:
+            return
+        autoflake_dict: dict = {}
+        fix_code_param_set: Set[str] = set(inspect.signature(autoflake.fix_code).parameters.keys())
+        for k, v in pyproject_dict.get("tool", {}).get("autoflake", {}).items():
+            k = k.replace("-", "_")
+            if k not in fix_code_param_set:
+                continue
+            autoflake_dict[k] = v
+        self._format_func_list.append(lambda content_str: autoflake.fix_code(content_str, **autoflake_dict))
+
+    def _init_black(self, pyproject_dict: dict) -> None:
+        try:
+            import black  # type: ignore
+        except ImportError:
+            return
+        black_config_dict: dict = {
+            k.replace("-", "_"): v for k, v in pyproject_dict.get("tool", {}).get("black", {}).items()
+        }
+        # target_version param replace
+        target_versions = {getattr(black.TargetVersion, i.upper()) for i in black_config_dict.pop("target_version", [])}
+        if target_versions:
+            black_config_dict["target_versions"] = target_versions
+
+        black_config_dict = {k: v for k, v in black_config_dict.items() if k in black.Mode.__annotations__}
+        black_mode: Any = black.Mode(**black_config_dict)
+        self._format_func_list.append(lambda content_str: black.format_str(content_str, mode=black_mode))
+
+    def format(self, content_str: str) -> str:
+        for format_func in self._format_func_list:
+            content_str = format_func(content_str)
+        return content_str
+
+
+# (pyproject file path, mtime of pyproject file) -> Formatter
+_formatter_cache: LRUCache[Formatter] = LRUCache(maxsize=32)
+
+
+def get_formatter(pyproject_file_path: str = "") -> Formatter:
+    """Get the formatter of the pyproject file, the formatter will be recreated only when the file is modified"""
+    pyproject_file_path = find_pyproject_file_path(pyproject_file_path)
+    cache_key: Tuple[str, int] = (
+        pyproject_file_path,
+        os.stat(pyproject_file_path).st_mtime_ns if pyproject_file_path else 0,
+    )
+    formatter: Optional[Formatter] = _formatter_cache.get(cache_key)
+    if formatter is None:
+        formatter = _formatter_cache.setdefault(cache_key, Formatter(pyproject_file_path))
+    return formatter
+
+
+def format_content(content_str: str, pyproject_file_path: str = "") -> str:
+    return get_formatter(pyproject_file_path).format(content_str)
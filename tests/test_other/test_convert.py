@@ -0,0 +1,204 @@
+from datetime import datetime, timezone
+
+import pytest
+from google.protobuf import __version__
+from google.protobuf.json_format import MessageToDict
+
+if __version__ > "4.0.0":
+    from example.proto.example.example_proto.demo import demo_pb2
+    from example.proto.example.example_proto.p2p_validate import demo_pb2 as p2p_validate_demo_pb2
+else:
+    from example.proto_3_20.example.example_proto.demo import demo_pb2  # type: ignore[no-redef]
+    from example.proto_3_20.example.example_proto.p2p_validate import (  # type: ignore[no-redef]
+        demo_pb2 as p2p_validate_demo_pb2,
+    )
+
+from protobuf_to_pydantic import convert, msg_to_pydantic_model, pydantic_model_to_py_code
+from protobuf_to_pydantic.convert import (
+    clear_plan_cache,
+    convert_many,
+    get_message_class,
+    get_message_to_model_plan,
+    get_model_to_message_plan,
+    get_plan_cache_info,
+    model_to_msg,
+    msg_to_model,
+)
+from protobuf_to_pydantic.grpc_types import Descriptor, DescriptorPool, FieldDescriptorProto, FileDescriptorProto
+
+
+def _gen_nested_message() -> demo_pb2.NestedMessage:
+    message = demo_pb2.NestedMessage()
+    message.user_list_map["a"].str_list.extend(["x", "y"])
+    message.user_list_map["a"].user_list.add(uid="1", age=3, sex=1, demo_message={"earth": "e"})
+    message.user_map["b"].user_flag["c"] = True
+    message.user_pay.bank_number = "123"
+    message.user_pay.exp.FromDatetime(datetime(2023, 1, 1))
+    message.not_enable_user_pay.uuid = "u"
+    message.after_refer.uid = "x"
+    message.include_enum = 2
+    return message
+
+
+class TestMsgToModel:
+    def test_from_protobuf(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.NestedMessage, parse_msg_desc_method="ignore")
+        message = _gen_nested_message()
+        instance = model.from_protobuf(message)  # type: ignore[attr-defined]
+        assert isinstance(instance, model)
+        assert instance.user_list_map["a"].str_list == ["x", "y"]
+        assert instance.user_list_map["a"].user_list[0].uid == "1"
+        assert instance.user_list_map["a"].user_list[0].sex == 1
+        assert instance.user_list_map["a"].user_list[0].demo_message.earth == "e"
+        assert instance.user_map["b"].user_flag == {"c": True}
+        assert instance.user_pay.exp == datetime(2023, 1, 1, tzinfo=timezone.utc)
+        assert instance.include_enum == 2
+        assert instance.after_refer.uid == "x"
+        # The unset message field is not set
+        assert "empty" not in instance.__fields_set__
+
+    def test_same_as_message_to_dict(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.RepeatedMessage, parse_msg_desc_method="ignore")
+        message = demo_pb2.RepeatedMessage(str_list=["a"], int_list=[1, 2])
+        for i in range(3):
+            message.user_list.add(uid=str(i), age=i, demo_message={"mars": str(i)})
+        assert msg_to_model(message, model) == model(**MessageToDict(message, preserving_proto_field_name=True))
+
+    def test_timestamp_same_as_message_to_dict(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.NestedMessage.UserPayMessage, parse_msg_desc_method="ignore")
+        message = demo_pb2.NestedMessage.UserPayMessage(bank_number="123")
+        message.exp.FromDatetime(datetime(2023, 1, 1, 8, 30, 15, 123456))
+        instance = model.from_protobuf(message)  # type: ignore[attr-defined]
+        assert instance == model(**MessageToDict(message, preserving_proto_field_name=True))
+        assert instance.exp.tzinfo is not None
+        assert instance.exp == datetime(2023, 1, 1, 8, 30, 15, 123456, tzinfo=timezone.utc)
+        assert model.from_protobuf(message, validate=False) == instance  # type: ignore[attr-defined]
+
+    def test_skip_validate(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.NestedMessage, parse_msg_desc_method="ignore")
+        message = _gen_nested_message()
+        instance = model.from_protobuf(message, validate=False)  # type: ignore[attr-defined]
+        # `not_enable_user_pay.exp` default value is `datetime.now`
+        exclude_dict: dict = {"not_enable_user_pay": {"exp"}}
+        validate_instance = model.from_protobuf(message)  # type: ignore[attr-defined]
+        assert instance.dict(exclude=exclude_dict) == validate_instance.dict(exclude=exclude_dict)
+        assert instance.include_enum is model.__fields__["include_enum"].type_(2)
+
+    def test_self_referencing(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.InvoiceItem, parse_msg_desc_method="ignore")
+        message = demo_pb2.InvoiceItem(name="a")
+        message.items.add(name="b").items.add(name="c")
+        instance = msg_to_model(message, model)
+        assert instance.items[0].items[0].name == "c"
+
+    def test_convert_many(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore")
+        message = demo_pb2.RepeatedMessage()
+        for i in range(3):
+            message.user_list.add(uid=str(i), age=i, demo_message={"mars": str(i)})
+
+        instance_list = list(convert_many(message.user_list, model))
+        assert [i.uid for i in instance_list] == ["0", "1", "2"]
+        assert instance_list == [msg_to_model(i, model) for i in message.user_list]
+        assert list(convert_many(message.user_list, model, validate=False)) == instance_list
+        assert list(convert_many([], model)) == []
+
+
+class TestModelToMsg:
+    def test_to_protobuf(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.NestedMessage, parse_msg_desc_method="ignore")
+        message = _gen_nested_message()
+        instance = model.from_protobuf(message)  # type: ignore[attr-defined]
+        new_message = instance.to_protobuf()  # type: ignore[attr-defined]
+        assert isinstance(new_message, demo_pb2.NestedMessage)
+        # `not_enable_user_pay.exp` is filled by the default value of model
+        new_message.not_enable_user_pay.ClearField("exp")
+        assert new_message == message
+
+    def test_same_as_parse_dict(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.RepeatedMessage, parse_msg_desc_method="ignore")
+        message = demo_pb2.RepeatedMessage(str_list=["a"], int_list=[1, 2])
+        for i in range(3):
+            message.user_list.add(uid=str(i), age=i, demo_message={"mars": str(i)})
+        instance = msg_to_model(message, model)
+        assert model_to_msg(instance, demo_pb2.RepeatedMessage()) == message
+
+    def test_one_of(self) -> None:
+        model = msg_to_pydantic_model(p2p_validate_demo_pb2.OneOfNotTest, parse_msg_desc_method="ignore")
+        message = p2p_validate_demo_pb2.OneOfNotTest(header="a", y=0)
+        new_message = model.from_protobuf(message).to_protobuf()  # type: ignore[attr-defined]
+        assert new_message.WhichOneof("id") == "y"
+        assert new_message == message
+
+    def test_self_referencing(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.InvoiceItem, parse_msg_desc_method="ignore")
+        message = demo_pb2.InvoiceItem(name="a")
+        message.items.add(name="b").items.add(name="c")
+        assert msg_to_model(message, model).to_protobuf() == message  # type: ignore[attr-defined]
+
+    def test_gen_code(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.NestedMessage, parse_msg_desc_method="ignore")
+        content = pydantic_model_to_py_code(model, gen_protobuf_method=True)
+        assert "def to_protobuf(self) -> demo_pb2.NestedMessage:" in content
+        assert "message.user_map[key].CopyFrom(value.to_protobuf())" in content
+
+        namespace: dict = {}
+        exec(content, namespace)
+        message = _gen_nested_message()
+        message.not_enable_user_pay.exp.FromDatetime(datetime(2023, 1, 1))
+        assert namespace["NestedMessage"].from_protobuf(message).to_protobuf() == message
+
+    def test_gen_code_none_value(self) -> None:
+        for message_class in (demo_pb2.UserMessage, p2p_validate_demo_pb2.OneOfNotTest):
+            model = msg_to_pydantic_model(message_class, parse_msg_desc_method="ignore")
+            namespace: dict = {}
+            exec(pydantic_model_to_py_code(model, gen_protobuf_method=True), namespace)
+            model_class = namespace[message_class.DESCRIPTOR.name]
+            if message_class is demo_pb2.UserMessage:
+                instance = model_class.construct(uid=None, age=1, demo_message=None)
+                # Same as `model_to_msg`, the None value is skipped
+                assert instance.to_protobuf() == model_to_msg(instance, message_class()) == message_class(age=1)
+            else:
+                # The field of one of is in `__fields_set__`
+                instance = model_class.construct(header="a", x=None)
+                assert instance.to_protobuf() == message_class(header="a")
+
+    def test_message_class_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Same as the old versions of protobuf that do not have `message_factory.GetMessageClass`
+        monkeypatch.setattr(convert, "GetMessageClass", None)
+        assert get_message_class(demo_pb2.UserMessage.DESCRIPTOR) is demo_pb2.UserMessage
+        descriptor: Descriptor = _gen_descriptor(FieldDescriptorProto.TYPE_INT32)
+        message_class = get_message_class(descriptor)
+        assert message_class.DESCRIPTOR is descriptor
+        assert get_message_class(descriptor) is message_class
+
+        model = msg_to_pydantic_model(descriptor, parse_msg_desc_method="ignore", use_cache=False)
+        message = model(a=1).to_protobuf()  # type: ignore[attr-defined]
+        assert isinstance(message, message_class)
+        assert message.a == 1
+
+
+def _gen_descriptor(field_type: int) -> Descriptor:
+    """Each call generates the message with the same full name in a new descriptor pool"""
+    fd = FileDescriptorProto(name="plan_cache.proto", package="plan_cache", syntax="proto3")
+    fd.message_type.add(name="Demo").field.add(name="a", number=1, type=field_type)
+    pool: DescriptorPool = DescriptorPool()
+    pool.Add(fd)
+    return pool.FindMessageTypeByName("plan_cache.Demo")
+
+
+class TestPlanCache:
+    def setup_method(self) -> None:
+        clear_plan_cache()
+
+    def test_same_full_name_of_different_pool(self) -> None:
+        int_descriptor: Descriptor = _gen_descriptor(FieldDescriptorProto.TYPE_INT32)
+        str_descriptor: Descriptor = _gen_descriptor(FieldDescriptorProto.TYPE_STRING)
+        int_plan = get_message_to_model_plan(int_descriptor)
+        str_plan = get_message_to_model_plan(str_descriptor)
+        assert int_plan is not str_plan
+        assert int_plan.build(get_message_class(int_descriptor)(a=1)) == {"a": 1}
+        assert str_plan.build(get_message_class(str_descriptor)(a="1")) == {"a": "1"}
+        assert get_model_to_message_plan(int_descriptor) is not get_model_to_message_plan(str_descriptor)
+        assert get_message_to_model_plan(int_descriptor) is int_plan
+        assert get_plan_cache_info().currsize == 4
@@ -1,9 +1,15 @@
 from datetime import datetime, timedelta
 
 import pytest
-from pydantic import BaseModel, ValidationError
-
-from protobuf_to_pydantic.customer_con_type import contimedelta, contimestamp
+from pydantic import BaseModel, ValidationError, conint, conlist, constr
+
+from protobuf_to_pydantic.customer_con_type import (
+    clear_con_type_cache,
+    contimedelta,
+    contimestamp,
+    get_con_type,
+    get_con_type_cache_info,
+)
 from protobuf_to_pydantic.customer_validator import _now_default_factory, set_now_default_factory
 
 _diff_utc_second: float = datetime.now().astimezone().utcoffset().total_seconds()  # type: ignore
@@ -260,3 +266,36 @@ class TestCustomerConTimestamp:
         Demo(demo=datetime.fromtimestamp(1600000001))
         with pytest.raises(ValidationError):
             Demo(demo=datetime.fromtimestamp(1600000000))
+
+
+class TestConTypeCache:
+    def setup_method(self) -> None:
+        clear_con_type_cache()
+
+    def test_same_param_share_con_type(self) -> None:
+        con_type = get_con_type(constr, max_length=64)
+        assert get_con_type(constr, max_length=64) is con_type
+        assert con_type.max_length == 64
+        assert get_con_type(constr, max_length=32) is not con_type
+        assert get_con_type(conint, gt=1) is not get_con_type(conint, gt=True)
+        assert get_con_type(conlist, con_type, min_items=1) is get_con_type(conlist, con_type, min_items=1)
+        assert get_con_type(contimedelta, duration_in=[timedelta(days=1)]) is not get_con_type(
+            contimedelta, duration_in=(timedelta(days=1),)
+        )
+        cache_info = get_con_type_cache_info()
+        assert cache_info.hits == 2
+        assert cache_info.currsize == 7
+
+    def test_unhashable_param_not_cache(self) -> None:
+        con_type = get_con_type(contimestamp, timestamp_in=[bytearray(b"a")])
+        assert get_con_type(contimestamp, timestamp_in=[bytearray(b"a")]) is not con_type
+        assert get_con_type_cache_info().currsize == 0
+
+    def test_shared_con_type_validate(self) -> None:
+        class Demo(BaseModel):
+            a: get_con_type(constr, max_length=2)  # type: ignore
+            b: get_con_type(constr, max_length=2)  # type: ignore
+
+        Demo(a="a", b="bb")
+        with pytest.raises(ValidationError):
+            Demo(a="a", b="bbb")
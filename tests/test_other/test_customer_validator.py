@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import BaseModel, Field, ValidationError, root_validator, validator
+
+from protobuf_to_pydantic import customer_validator
+from protobuf_to_pydantic.customer_con_type import contimedelta, contimestamp
+from protobuf_to_pydantic.customer_validator import (
+    _get_field_rule,
+    check_one_of,
+    clear_field_rule_cache,
+    get_one_of_rule,
+    in_validator,
+    not_in_validator,
+    timestamp_in_validator,
+)
+
+
+class OneOfDemo(BaseModel):
+    _one_of_dict = {
+        "demo.OneOfDemo.a": {"fields": {"x", "y", "z"}, "required": True},
+        "demo.OneOfDemo.b": {"fields": {"m", "n"}, "required": False},
+    }
+    _check_one_of = root_validator(pre=True, allow_reuse=True)(check_one_of)
+
+    x: str = ""
+    y: str = ""
+    z: str = ""
+    m: str = ""
+    n: str = ""
+
+
+class TestCheckOneOf:
+    def test_check_one_of(self) -> None:
+        OneOfDemo(x="1")
+        OneOfDemo(y="1", m="1")
+
+        with pytest.raises(ValidationError) as e:
+            OneOfDemo(m="1")
+        assert "OneOf:demo.OneOfDemo.a must set value" in str(e.value)
+        with pytest.raises(ValidationError) as e:
+            OneOfDemo(x="1", y="1", z="1")
+        assert "OneOf:demo.OneOfDemo.a has 3 value" in str(e.value)
+        with pytest.raises(ValidationError) as e:
+            OneOfDemo(x="1", m="1", n="1")
+        assert "OneOf:demo.OneOfDemo.b has 2 value" in str(e.value)
+
+    def test_rule_cache(self) -> None:
+        rule_tuple = get_one_of_rule(OneOfDemo)
+        assert get_one_of_rule(OneOfDemo) is rule_tuple
+        assert rule_tuple[0].fields == frozenset({"x", "y", "z"})
+        assert rule_tuple[0].required is True
+
+        class SubOneOfDemo(OneOfDemo):
+            _one_of_dict = {"demo.SubOneOfDemo.a": {"fields": {"x", "y"}}}
+
+        assert [i.name for i in get_one_of_rule(SubOneOfDemo)] == ["demo.SubOneOfDemo.a"]
+        assert get_one_of_rule(SubOneOfDemo)[0].required is False
+        SubOneOfDemo(z="1")
+
+
+class TestFieldRule:
+    def setup_method(self) -> None:
+        clear_field_rule_cache()
+
+    def test_in_validator(self) -> None:
+        class Demo(BaseModel):
+            a: int = Field(in_=[1, 2, 3])
+            b: list = Field(not_in=[[1], [2]])
+
+            in_validator_a = validator("a", allow_reuse=True)(in_validator)
+            not_in_validator_b = validator("b", allow_reuse=True)(not_in_validator)
+
+        rule = _get_field_rule("in_", Demo.__fields__["a"])
+        assert rule.container == frozenset({1, 2, 3})
+        assert _get_field_rule("in_", Demo.__fields__["a"]) is rule
+        # unhashable value
+        assert _get_field_rule("not_in", Demo.__fields__["b"]).container == [[1], [2]]
+
+        Demo(a=1, b=[3])
+        with pytest.raises(ValidationError) as e:
+            Demo(a=4, b=[3])
+        assert "a:4 not in [1, 2, 3]" in str(e.value)
+        with pytest.raises(ValidationError) as e:
+            Demo(a=1, b=[1])
+        assert "b:[1] in [[1], [2]]" in str(e.value)
+
+    def test_timestamp_in_validator(self) -> None:
+        class Demo(BaseModel):
+            a: datetime = Field(timestamp_in=[1600000000, 1700000000])
+
+            timestamp_in_validator_a = validator("a", allow_reuse=True)(timestamp_in_validator)
+
+        Demo(a=datetime.fromtimestamp(1600000000))
+        rule = _get_field_rule("timestamp_in", Demo.__fields__["a"], enable_timestamp_to_datetime=True)
+        assert rule.container == frozenset({datetime.fromtimestamp(1600000000), datetime.fromtimestamp(1700000000)})
+        with pytest.raises(ValidationError):
+            Demo(a=datetime.fromtimestamp(1600000001))
+
+    def test_con_type_rule_bound_when_model_built(self) -> None:
+        class Demo(BaseModel):
+            a: contimestamp(timestamp_in=[1600000000, 1700000000], timestamp_gt=1500000000)  # type: ignore
+            b: contimedelta(duration_lt=timedelta(seconds=10))  # type: ignore
+
+        for _ in range(3):
+            Demo(a=datetime.fromtimestamp(1600000000), b=timedelta(seconds=1))
+        with pytest.raises(ValidationError) as e:
+            Demo(a=datetime.fromtimestamp(1600000001), b=timedelta(seconds=1))
+        assert "a not in" in str(e.value)
+        with pytest.raises(ValidationError) as e:
+            Demo(a=datetime.fromtimestamp(1600000000), b=timedelta(seconds=11))
+        assert "b must < 0:00:10, not 0:00:11" in str(e.value)
+        # The rules of the constrained types are bound to the validators, so they are not looked up per validation
+        assert len(customer_validator._field_rule_cache) == 0
@@ -0,0 +1,81 @@
+import pickle
+from pathlib import Path
+from typing import Any, Generator
+
+import pytest
+
+from protobuf_to_pydantic.contrib import proto_parser
+from protobuf_to_pydantic.get_desc import (
+    desc_cache,
+    from_proto_file,
+    get_desc_from_proto_file,
+    save_desc_cache,
+    set_desc_cache_dir,
+)
+
+proto_content: str = """syntax = "proto3";
+package demo;
+
+message Demo {
+  // p2p: {"title": "UID"}
+  string uid = 1;
+}
+"""
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Generator[Path, None, None]:
+    cache_dir = tmp_path / "cache"
+    set_desc_cache_dir(str(cache_dir))
+    yield cache_dir
+    set_desc_cache_dir("")
+
+
+def _reset_memory_cache() -> None:
+    # Simulate a new process
+    from_proto_file._filename_desc_dict.clear()
+    desc_cache._desc_cache_dict = None
+
+
+class TestDescCache:
+    def test_persistent_cache(self, cache_dir: Path, tmp_path: Path, monkeypatch: Any) -> None:
+        proto_file = tmp_path / "demo.proto"
+        proto_file.write_text(proto_content)
+        desc_dict = get_desc_from_proto_file(str(proto_file), "p2p")
+        save_desc_cache()
+        assert (cache_dir / "desc_cache.pickle").exists()
+
+        _reset_memory_cache()
+
+        def _parse_from_file(file: str) -> None:
+            raise RuntimeError("The protobuf file should not be parsed")
+
+        monkeypatch.setattr(proto_parser, "parse_from_file", _parse_from_file)
+        assert get_desc_from_proto_file(str(proto_file), "p2p") == desc_dict
+
+        # The cache is invalid after the file is changed
+        _reset_memory_cache()
+        proto_file.write_text(proto_content.replace("UID", "User ID"))
+        with pytest.raises(RuntimeError):
+            get_desc_from_proto_file(str(proto_file), "p2p")
+
+    def test_version_mismatch(self, cache_dir: Path, tmp_path: Path) -> None:
+        proto_file = tmp_path / "demo.proto"
+        proto_file.write_text(proto_content)
+        get_desc_from_proto_file(str(proto_file), "p2p")
+        save_desc_cache()
+        cache_file = cache_dir / "desc_cache.pickle"
+        _, cache_dict = pickle.loads(cache_file.read_bytes())
+        assert cache_dict
+        cache_file.write_bytes(pickle.dumps(("0.0.0-other", cache_dict)))
+
+        _reset_memory_cache()
+        assert desc_cache._get_desc_cache_dict() == {}
+
+    def test_disable(self, tmp_path: Path) -> None:
+        proto_file = tmp_path / "demo.proto"
+        proto_file.write_text(proto_content)
+        get_desc_from_proto_file(str(proto_file), "p2p")
+        save_desc_cache()
+        assert not desc_cache._dirty_key_set
+        assert not list(tmp_path.glob("**/desc_cache.pickle"))
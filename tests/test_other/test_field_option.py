@@ -0,0 +1,141 @@
+from typing import Type
+
+from google.protobuf import __version__, descriptor_pb2, descriptor_pool, message_factory
+from google.protobuf.descriptor import FileDescriptor
+
+from protobuf_to_pydantic import msg_to_pydantic_model
+from protobuf_to_pydantic.get_desc import (
+    clear_option_desc_cache,
+    get_desc_from_p2p,
+    get_option_desc_cache_info,
+    set_option_desc_cache_size,
+)
+from protobuf_to_pydantic.get_desc.from_pb_option.base import _field_option_cache, field_option_handle
+from protobuf_to_pydantic.grpc_types import Message
+
+if __version__ > "4.0.0":
+    from example.proto.example.example_proto.common import p2p_validate_pb2
+    from example.proto.example.example_proto.p2p_validate import demo_pb2
+else:
+    from example.proto_3_20.example.example_proto.common import p2p_validate_pb2  # type: ignore[no-redef]
+    from example.proto_3_20.example.example_proto.p2p_validate import demo_pb2  # type: ignore[no-redef]
+
+
+class TestFieldOptionHandle:
+    def test_cache(self) -> None:
+        _field_option_cache.clear()
+        field = demo_pb2.FloatTest.DESCRIPTOR.fields_by_name["in_test"]
+        field_dict = field_option_handle("float", field.full_name, field, "p2p_validate")
+        assert field_dict["extra"] == {"in_": [1.0, 2.0, 3.0]}
+        assert len(_field_option_cache) == 1
+
+        # The caller can modify the result without affecting the cache
+        field_dict.pop("validator")
+        field_dict["extra"]["in_"] = []
+        new_field_dict = field_option_handle("float", field.full_name, field, "p2p_validate")
+        assert len(_field_option_cache) == 1
+        assert new_field_dict["extra"] == {"in_": [1.0, 2.0, 3.0]}
+        # The validators are created once and shared
+        assert (
+            new_field_dict["validator"]
+            is field_option_handle("float", field.full_name, field, "p2p_validate")["validator"]
+        )
+
+        # The field with different options is cached separately
+        other_field = demo_pb2.FloatTest.DESCRIPTOR.fields_by_name["not_in_test"]
+        other_field_dict = field_option_handle("float", other_field.full_name, other_field, "p2p_validate")
+        assert other_field_dict["extra"] == {"not_in": [1.0, 2.0, 3.0]}
+        assert len(_field_option_cache) == 2
+
+
+def _gen_message(pool: descriptor_pool.DescriptorPool, package: str, field_name: str) -> Type[Message]:
+    fd: descriptor_pb2.FileDescriptorProto = descriptor_pb2.FileDescriptorProto(
+        name=f"{package}/request.proto", package=package, syntax="proto3"
+    )
+    fd.message_type.add(name="Request").field.add(
+        name=field_name, number=1, type=descriptor_pb2.FieldDescriptorProto.TYPE_STRING
+    )
+    pool.Add(fd)
+    descriptor = pool.FindMessageTypeByName(f"{package}.Request")
+    if hasattr(message_factory, "GetMessageClass"):
+        return message_factory.GetMessageClass(descriptor)
+    return message_factory.MessageFactory(pool).GetPrototype(descriptor)
+
+
+def _add_file(pool: descriptor_pool.DescriptorPool, file_descriptor: FileDescriptor) -> None:
+    """Add the file and its dependencies to the pool"""
+    try:
+        pool.FindFileByName(file_descriptor.name)
+        return
+    except KeyError:
+        pass
+    for dependency in file_descriptor.dependencies:
+        _add_file(pool, dependency)
+    fd: descriptor_pb2.FileDescriptorProto = descriptor_pb2.FileDescriptorProto()
+    file_descriptor.CopyToProto(fd)
+    pool.Add(fd)
+
+
+class TestOptionDescCache:
+    def test_key_by_full_name_and_pool(self) -> None:
+        clear_option_desc_cache()
+        pool = descriptor_pool.DescriptorPool()
+        a_request = _gen_message(pool, "a", "a_field")
+        b_request = _gen_message(pool, "b", "b_field")
+        other_pool_a_request = _gen_message(descriptor_pool.DescriptorPool(), "a", "other_a_field")
+
+        assert list(get_desc_from_p2p(a_request)["a.Request"]["message"]) == ["a_field"]
+        # The message with the same name in another package or pool does not use the cache of `a.Request`
+        assert list(get_desc_from_p2p(b_request)["b.Request"]["message"]) == ["b_field"]
+        assert list(get_desc_from_p2p(other_pool_a_request)["a.Request"]["message"]) == ["other_a_field"]
+        assert get_option_desc_cache_info().currsize == 3
+
+        assert list(get_desc_from_p2p(a_request)["a.Request"]["message"]) == ["a_field"]
+        assert get_option_desc_cache_info().hits == 1
+
+    def test_cache_size(self) -> None:
+        clear_option_desc_cache()
+        try:
+            set_option_desc_cache_size(1)
+            get_desc_from_p2p(demo_pb2.FloatTest)
+            get_desc_from_p2p(demo_pb2.DoubleTest)
+            assert get_option_desc_cache_info().currsize == 1
+        finally:
+            set_option_desc_cache_size(1024)
+
+    def test_same_name_message_in_different_package(self) -> None:
+        pool = descriptor_pool.DescriptorPool()
+        _add_file(pool, p2p_validate_pb2.DESCRIPTOR)
+        for package, min_length in (("a", 2), ("b", 3)):
+            fd = descriptor_pb2.FileDescriptorProto(
+                name=f"{package}/request.proto",
+                package=package,
+                syntax="proto3",
+                dependency=[p2p_validate_pb2.DESCRIPTOR.name],
+            )
+            field = fd.message_type.add(name="Request").field.add(
+                name="name", number=1, type=descriptor_pb2.FieldDescriptorProto.TYPE_STRING
+            )
+            field.options.Extensions[p2p_validate_pb2.rules].string.min_length = min_length
+            pool.Add(fd)
+        fd = descriptor_pb2.FileDescriptorProto(
+            name="c/root.proto", package="c", syntax="proto3", dependency=["a/request.proto", "b/request.proto"]
+        )
+        root_message = fd.message_type.add(name="Root")
+        for number, package in enumerate(("a", "b"), start=1):
+            root_message.field.add(
+                name=f"{package}_request",
+                number=number,
+                type=descriptor_pb2.FieldDescriptorProto.TYPE_MESSAGE,
+                type_name=f".{package}.Request",
+            )
+        pool.Add(fd)
+        root_descriptor = pool.FindMessageTypeByName("c.Root")
+
+        desc_dict = get_desc_from_p2p(root_descriptor)
+        assert desc_dict["a.Request"]["message"]["name"]["min_length"] == 2
+        assert desc_dict["b.Request"]["message"]["name"]["min_length"] == 3
+
+        model = msg_to_pydantic_model(root_descriptor)
+        assert model.__fields__["a_request"].type_.__fields__["name"].field_info.min_length == 2
+        assert model.__fields__["b_request"].type_.__fields__["name"].field_info.min_length == 3
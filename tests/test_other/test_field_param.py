@@ -0,0 +1,133 @@
+import itertools
+from dataclasses import MISSING
+from typing import Any
+
+import pytest
+from pydantic import ValidationError, conint, constr
+from pydantic.fields import FieldInfo
+
+from protobuf_to_pydantic.customer_validator import in_validator
+from protobuf_to_pydantic.gen_model import (
+    DescTemplate,
+    MessagePaitModel,
+    clear_template_cache,
+    field_param_dict_handle,
+    gen_field_param_dict,
+    get_template_cache_info,
+)
+from protobuf_to_pydantic.grpc_types import AnyMessage
+
+
+class CustomerField(FieldInfo):
+    pass
+
+
+def _replace_missing(value: Any) -> Any:
+    """The default value `MISSING` is copied by pydantic"""
+    if isinstance(value, dict):
+        return {k: _replace_missing(v) for k, v in value.items()}
+    return "MISSING" if value.__class__ is MISSING.__class__ else value
+
+
+class TestGenFieldParamDict:
+    @pytest.mark.parametrize(
+        "field_doc_dict",
+        [
+            {},
+            {"enable": False, "skip": True, "miss_default": True},
+            {"field": CustomerField, "alias": "a", "title": "t", "description": "d", "example": [1, {"a": 1}]},
+            {"default": [1], "default_factory": list, "example_factory": dict, "const": "c"},
+            {"gt": 1, "ge": 1.5, "lt": 2.0, "le": None, "multiple_of": 3.0, "regex": "^a"},
+            {"min_length": 1, "max_length": "10", "min_items": True, "max_items": 2, "unique_items": True},
+            {"extra": '{"a": {"b": [1]}}', "type": constr, "type_": int},
+            {"extra": {"a": 1}, "validator": {"in_validator": in_validator}, "map_type": {"keys": str}},
+            {"type": conint, "sub": {"gt": 1.5, "type": int, "extra": {"a": 1}}},
+            {"sub": {"max_length": "1"}, "title": 1},
+        ],
+    )
+    def test_same_as_message_pait_model(self, field_doc_dict: dict) -> None:
+        field_param_dict: dict = gen_field_param_dict(field_doc_dict)
+        expect_dict: dict = MessagePaitModel(**field_doc_dict).dict()
+        assert list(field_param_dict.keys()) == list(expect_dict.keys())
+        assert _replace_missing(field_param_dict) == _replace_missing(expect_dict)
+        if "extra" in field_doc_dict and isinstance(field_doc_dict["extra"], dict):
+            # The container is not shared with the field doc dict
+            assert field_param_dict["extra"] is not field_doc_dict["extra"]
+
+    @pytest.mark.parametrize(
+        "field_doc_dict",
+        [{"field": int}, {"enable": "abc"}, {"extra": "{"}, {"map_type": {"keys": 1}}, {"sub": {"gt": "a"}}],
+    )
+    def test_invalid_param(self, field_doc_dict: dict) -> None:
+        with pytest.raises(ValidationError):
+            gen_field_param_dict(field_doc_dict)
+
+    def test_con_type_param(self) -> None:
+        field_param_dict: dict = gen_field_param_dict({"type": constr, "max_length": 10, "title": "t"})
+        field_param_dict_handle(field_param_dict, "", None)
+        assert field_param_dict["type_"].max_length == 10
+        assert "max_length" not in field_param_dict
+        assert field_param_dict["title"] == "t"
+
+
+class CounterDescTemplate(DescTemplate):
+    counter: "itertools.count[int]" = itertools.count()
+
+    def template_counter(self) -> int:
+        return next(self.counter)
+
+
+class CacheCounterDescTemplate(CounterDescTemplate):
+    cache_template_set = CounterDescTemplate.cache_template_set | {"counter"}
+
+
+class TestDescTemplate:
+    def setup_method(self) -> None:
+        clear_template_cache()
+
+    def test_template_cache(self) -> None:
+        any_template: str = (
+            "p2p@import_instance|google.protobuf.any_pb2|Any"
+            '|{"type_url": "type.googleapis.com/google.protobuf.Duration"}'
+        )
+        desc_template = DescTemplate({}, "p2p")
+        value = desc_template.handle_template_var({"default": any_template, "type": "p2p@import|pydantic|constr"})
+        assert isinstance(value["default"], AnyMessage)
+        assert value["type"] is constr
+        # The empty local_dict are the same
+        other_value = DescTemplate({}, "p2p").handle_template_var({"default": any_template})
+        assert other_value["default"] is value["default"]
+        assert get_template_cache_info().hits == 1
+        assert get_template_cache_info().currsize == 2
+
+    def test_local_template_cache(self) -> None:
+        local_dict: dict = {"a": 1}
+        assert DescTemplate(local_dict, "p2p").handle_template_var("p2p@local|a") == 1
+        assert DescTemplate(local_dict, "p2p").handle_template_var("p2p@local|a") == 1
+        assert DescTemplate({"a": 2}, "p2p").handle_template_var("p2p@local|a") == 2
+        assert get_template_cache_info().hits == 1
+        with pytest.raises(ValueError):
+            DescTemplate({}, "p2p").handle_template_var("p2p@local|a")
+
+    def test_subclass_template_not_cache(self) -> None:
+        desc_template = CounterDescTemplate({}, "p2p")
+        value: int = desc_template.handle_template_var("p2p@counter")
+        assert desc_template.handle_template_var("p2p@counter") == value + 1
+        assert get_template_cache_info().currsize == 0
+        # The built-in templates of subclass are still cached
+        assert desc_template.handle_template_var("p2p@builtin|int") is int
+        assert get_template_cache_info().currsize == 1
+
+    def test_subclass_template_cache(self) -> None:
+        desc_template = CacheCounterDescTemplate({}, "p2p")
+        value: int = desc_template.handle_template_var("p2p@counter")
+        assert desc_template.handle_template_var("p2p@counter") == value
+        assert get_template_cache_info().hits == 1
+
+    def test_container_without_template_var(self) -> None:
+        desc_template = DescTemplate({}, "p2p")
+        container: dict = {"a": ["b", {"c": 1}], "d": "p2p"}
+        assert desc_template.handle_template_var(container) is container
+        value = desc_template.handle_template_var({"a": ["b", "p2p@builtin|int"], "d": container})
+        assert value == {"a": ["b", int], "d": container}
+        assert value["d"] is container
@@ -0,0 +1,192 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from protobuf_to_pydantic.util import (
+    Formatter,
+    builtin_format_content,
+    find_pyproject_file_path,
+    format_content,
+    get_formatter,
+)
+
+content: str = "import typing\nimport os\nclass Demo:\n  a: typing.List[int] = [1,2]\n"
+
+
+class TestFormatter:
+    def test_get_formatter(self, tmp_path: Path) -> None:
+        pyproject_file = tmp_path / "pyproject.toml"
+        pyproject_file.write_text(
+            '[tool.isort]\nprofile = "black"\n[tool.protobuf-to-pydantic.format]\nblack = true\nisort = true\n'
+        )
+        formatter = get_formatter(str(pyproject_file))
+        assert get_formatter(str(pyproject_file)) is formatter
+        assert (
+            formatter.format(content) == "import os\nimport typing\n\n\nclass Demo:\n    a: typing.List[int] = [1, 2]\n"
+        )
+
+        # The formatter is recreated after the pyproject file is modified
+        pyproject_file.write_text("[tool.protobuf-to-pydantic.format]\nblack = false\nisort = false\n")
+        stat = pyproject_file.stat()
+        os.utime(pyproject_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        new_formatter = get_formatter(str(pyproject_file))
+        assert new_formatter is not formatter
+        assert new_formatter.format(content) == content
+
+    def test_find_pyproject_file_path(self, tmp_path: Path) -> None:
+        pyproject_file_path: str = find_pyproject_file_path()
+        assert find_pyproject_file_path() == pyproject_file_path
+        (tmp_path / "pyproject.toml").write_text("")
+        # The path is resolved again after `sys.path` is changed
+        sys.path.insert(0, str(tmp_path))
+        try:
+            assert find_pyproject_file_path() == str(tmp_path / "pyproject.toml")
+        finally:
+            sys.path.remove(str(tmp_path))
+        assert find_pyproject_file_path() == pyproject_file_path
+
+    def test_builtin_engine(self, tmp_path: Path) -> None:
+        pyproject_file = tmp_path / "pyproject.toml"
+        pyproject_file.write_text(
+            '[tool.black]\nline-length = 120\n[tool.protobuf-to-pydantic.format]\nengine = "builtin"\nblack = true\n'
+        )
+        formatter = Formatter(str(pyproject_file))
+        assert len(formatter._format_func_list) == 1
+        assert formatter._format_func_list[0].func is builtin_format_content  # type: ignore[attr-defined]
+        assert formatter._format_func_list[0].keywords == {  # type: ignore[attr-defined]
+            "line_length": 120,
+            "known_first_party": frozenset(),
+        }
+        assert formatter.format(content) == "import typing\n\n\nclass Demo:\n  a: typing.List[int] = [1,2]\n"
+
+    def test_builtin_engine_known_first_party(self, tmp_path: Path) -> None:
+        pyproject_file = tmp_path / "pyproject.toml"
+        pyproject_file.write_text('[tool.protobuf-to-pydantic.format]\nengine = "builtin"\n')
+        (tmp_path / "demo_package").mkdir()
+        (tmp_path / "demo_package" / "__init__.py").write_text("")
+        (tmp_path / "demo_module.py").write_text("")
+        (tmp_path / "not_package").mkdir()
+        formatter = Formatter(str(pyproject_file))
+        assert formatter._format_func_list[0].keywords["known_first_party"] == frozenset(  # type: ignore[attr-defined]
+            {"demo_package", "demo_module"}
+        )
+
+        pyproject_file.write_text(
+            '[tool.isort]\nknown_first_party = ["demo"]\n[tool.protobuf-to-pydantic.format]\nengine = "builtin"\n'
+        )
+        formatter = Formatter(str(pyproject_file))
+        assert formatter._format_func_list[0].keywords["known_first_party"] == frozenset(  # type: ignore[attr-defined]
+            {"demo"}
+        )
+
+    def test_builtin_format_content(self) -> None:
+        assert builtin_format_content(
+            "# head\n"
+            "from pydantic import Field\n"
+            "from .demo_p2p import Demo\n"
+            "from protobuf_to_pydantic.customer_validator import in_validator, not_in_validator, len_validator\n"
+            "import typing\n"
+            "from pydantic import BaseModel, validator\n"
+            "from google.protobuf.message import Message  # type: ignore\n"
+            "from datetime import datetime\n"
+            "\n"
+            "class A(BaseModel):\n"
+            "\n"
+            "    a: typing.List[int] = Field(default_factory=list)   \n"
+            "\n"
+            "\n"
+            "\n"
+            "    b: Demo = Field()\n"
+            "    _a = validator('a', allow_reuse=True)(in_validator)\n"
+            "    _b = validator('b', allow_reuse=True)(not_in_validator)\n"
+            "def demo() -> datetime:\n"
+            "    return datetime.now()\n",
+            line_length=60,
+            known_first_party=["protobuf_to_pydantic"],
+        ) == (
+            "# head\n"
+            "import typing\n"
+            "from datetime import datetime\n"
+            "\n"
+            "from pydantic import BaseModel, Field, validator\n"
+            "\n"
+            "from protobuf_to_pydantic.customer_validator import (\n"
+            "    in_validator,\n"
+            "    not_in_validator,\n"
+            ")\n"
+            "\n"
+            "from .demo_p2p import Demo\n"
+            "\n"
+            "\n"
+            "class A(BaseModel):\n"
+            "    a: typing.List[int] = Field(default_factory=list)\n"
+            "\n"
+            "    b: Demo = Field()\n"
+            "    _a = validator('a', allow_reuse=True)(in_validator)\n"
+            "    _b = validator('b', allow_reuse=True)(not_in_validator)\n"
+            "\n"
+            "\n"
+            "def demo() -> datetime:\n"
+            "    return datetime.now()\n"
+        )
+
+    def test_builtin_format_content_section(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        content_str: str = (
+            "from protobuf_to_pydantic import msg_to_pydantic_model\n"
+            "import pydantic\n"
+            "\n"
+            "msg_to_pydantic_model, pydantic\n"
+        )
+        third_party_str: str = (
+            "import pydantic\n"
+            "from protobuf_to_pydantic import msg_to_pydantic_model\n"
+            "\n"
+            "\n"
+            "msg_to_pydantic_model, pydantic\n"
+        )
+        assert builtin_format_content(content_str) == third_party_str
+        # The section does not depend on the current work dir
+        monkeypatch.chdir(tmp_path)
+        assert builtin_format_content(content_str) == third_party_str
+        assert builtin_format_content(content_str, known_first_party=["protobuf_to_pydantic"]) == (
+            "import pydantic\n"
+            "\n"
+            "from protobuf_to_pydantic import msg_to_pydantic_model\n"
+            "\n"
+            "\n"
+            "msg_to_pydantic_model, pydantic\n"
+        )
+
+    def test_builtin_format_content_keep_string(self) -> None:
+        assert builtin_format_content(
+            "class A(object):\n"
+            '    """doc   \n'
+            "\n"
+            "\n"
+            "\n"
+            '    end"""\n'
+            '    b: str = """a   \n'
+            "\n"
+            "\n"
+            "\n"
+            'b"""   \n'
+            "\n"
+            "\n"
+            "    c: str = 'c'\n"
+        ) == (
+            "class A(object):\n"
+            '    """doc   \n'
+            "\n"
+            "\n"
+            "\n"
+            '    end"""\n'
+            '    b: str = """a   \n'
+            "\n"
+            "\n"
+            "\n"
+            'b"""   \n'
+            "\n"
+            "    c: str = 'c'\n"
+        )
@@ -0,0 +1,44 @@
+from io import StringIO
+
+from protobuf_to_pydantic.get_desc.from_pyi_file import _scan_pyi_line_iter
+
+pyi_content: str = '''
+class UserMessage(google.protobuf.message.Message):
+    """user info"""
+    class PayMessage(google.protobuf.message.Message):
+        DESCRIPTOR: google.protobuf.descriptor.Descriptor
+        bank_number: builtins.str
+        """p2p: {"title": "bank number"}"""
+        def __init__(self, *, bank_number: builtins.str = ...) -> None: ...
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    uid: builtins.str
+    """p2p: {"miss_default": true, "example": "10086"}"""
+    age: builtins.int
+    """the age of user"""
+    user_name: builtins.str
+    """user name, the class of user
+    p2p: {"description": "user name"}
+    p2p: {"min_length": 1}
+    """
+    @property
+    def pay(self) -> global___UserMessage.PayMessage:
+        """p2p: {"title": "pay"}"""
+    def __init__(self, *, uid: builtins.str = ...) -> None: ...
+
+global___UserMessage = UserMessage
+'''
+
+
+class TestScanPyi:
+    def test_scan_pyi_line_iter(self) -> None:
+        result = _scan_pyi_line_iter(StringIO(pyi_content), "p2p")
+        assert result["UserMessage"]["message"] == {
+            "uid": {"miss_default": True, "example": "10086"},
+            "age": {},
+            # The line that contains `class` in the docstring will not be treated as a class
+            "user_name": {"description": "user name", "min_length": 1},
+            "pay": {"title": "pay"},
+        }
+        assert result["PayMessage"]["message"] == {"bank_number": {"title": "bank number"}}
+        assert result["UserMessage"]["nested"]["PayMessage"] is result["PayMessage"]  # type: ignore
@@ -0,0 +1,324 @@
+import inspect
+from enum import IntEnum
+from typing import Dict, Set, Tuple, Type
+
+from google.protobuf import __version__, descriptor_pb2
+from pydantic import BaseModel
+
+if __version__ > "4.0.0":
+    from example.proto.example.example_proto.demo import demo_pb2
+else:
+    from example.proto_3_20.example.example_proto.demo import demo_pb2  # type: ignore[no-redef]
+
+from protobuf_to_pydantic import clear_model_cache, msg_to_pydantic_model, pydantic_model_to_py_code
+from protobuf_to_pydantic.gen_model import _enum_cache, get_model_cache_info, set_model_cache_size
+from protobuf_to_pydantic.grpc_types import DescriptorPool
+from protobuf_to_pydantic.util import LRUCache, resolve_lazy_model, set_lazy_import
+
+
+class TestModelCache:
+    def setup_method(self) -> None:
+        clear_model_cache()
+
+    def teardown_method(self) -> None:
+        set_model_cache_size(1024)
+        clear_model_cache()
+
+    def test_same_message_share_model(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore")
+        assert msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore") is model
+        assert msg_to_pydantic_model(demo_pb2.UserMessage.DESCRIPTOR, parse_msg_desc_method="ignore") is model
+        cache_info = get_model_cache_info()
+        assert cache_info.hits == 2
+        assert cache_info.misses == 1
+        assert cache_info.currsize == 1
+
+    def test_different_param_not_share_model(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore")
+        other_model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict={"a": 1})
+        assert other_model is not model
+        assert msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", use_cache=False) is not model
+        assert get_model_cache_info().currsize == 2
+
+    def test_file_descriptor_proto_param(self) -> None:
+        def _gen_file_descriptor_proto(title: str) -> descriptor_pb2.FileDescriptorProto:
+            fd = descriptor_pb2.FileDescriptorProto()
+            demo_pb2.DESCRIPTOR.CopyToProto(fd)
+            message_index: int = [i.name for i in fd.message_type].index("UserMessage")
+            location = fd.source_code_info.location.add(path=[4, message_index, 2, 0])
+            location.leading_comments = f' p2p: {{"title": "{title}"}}'
+            return fd
+
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method=_gen_file_descriptor_proto("a"))
+        other_model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method=_gen_file_descriptor_proto("b"))
+        assert model.__fields__["uid"].field_info.title == "a"
+        assert other_model.__fields__["uid"].field_info.title == "b"
+        # The same content share one model
+        assert (
+            msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method=_gen_file_descriptor_proto("a")) is model
+        )
+
+    def test_unhashable_param_not_cache(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict={"a": [1]})
+        assert (
+            msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict={"a": [2]})
+            is not model
+        )
+        assert (
+            msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict={"a": bytearray()})
+            is not model
+        )
+        assert get_model_cache_info().currsize == 2
+
+    def test_unhashable_object_param_not_cache(self) -> None:
+        class Unhashable(object):
+            def __eq__(self, other: object) -> bool:
+                return True
+
+        local_dict: dict = {"a": Unhashable()}
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict=local_dict)
+        assert (
+            msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict=local_dict)
+            is not model
+        )
+        assert get_model_cache_info().currsize == 0
+
+    def test_container_type_in_cache_key(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict={"a": [1]})
+        assert (
+            msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict={"a": (1,)})
+            is not model
+        )
+        assert msg_to_pydantic_model(
+            demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict={"a": {1}}
+        ) is not msg_to_pydantic_model(
+            demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict={"a": frozenset({1})}
+        )
+        assert (
+            msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict={"a": [1]}) is model
+        )
+        assert get_model_cache_info().currsize == 4
+
+    def test_clear_model_cache(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore")
+        clear_model_cache()
+        assert get_model_cache_info().currsize == 0
+        assert msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore") is not model
+
+    def test_disable_model_cache(self) -> None:
+        set_model_cache_size(0)
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore")
+        assert msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore") is not model
+        assert get_model_cache_info().currsize == 0
+
+
+class TestLazyModel:
+    def test_lazy_model(self) -> None:
+        model = msg_to_pydantic_model(
+            demo_pb2.NestedMessage, parse_msg_desc_method="ignore", lazy=True, use_cache=False
+        )
+        # The referenced message model is not created until the model is used
+        assert "_lazy_resolver" in model.__dict__
+        message = demo_pb2.NestedMessage()
+        message.user_list_map["a"].user_list.add(uid="1", demo_message={"earth": "e"})
+        message.user_pay.bank_number = "123"
+        message.not_enable_user_pay.uuid = "u"
+        message.after_refer.uid = "x"
+        eager_model = msg_to_pydantic_model(demo_pb2.NestedMessage, parse_msg_desc_method="ignore", use_cache=False)
+        data: dict = eager_model.from_protobuf(message).dict()  # type: ignore[attr-defined]
+
+        instance = model(**data)
+        user_pay_model = model.__fields__["user_pay"].type_
+        assert user_pay_model.__name__ == "UserPayMessage"
+        assert isinstance(instance.user_pay, user_pay_model)
+        assert instance.user_pay.bank_number == "123"
+        assert instance.user_list_map["a"].user_list[0].demo_message.earth == "e"
+        assert instance.dict() == data
+
+    def test_resolve_lazy_model(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", lazy=True, use_cache=False)
+        resolve_lazy_model(model)
+        demo_message_model = model.__fields__["demo_message"].type_
+        assert demo_message_model.__name__ == "ExampleExampleProtoCommonSingleDemoMessage"
+        assert model.__fields__["demo_message"].type_ is demo_message_model
+        # The referenced model is also lazy and is resolved independently
+        instance = model.from_protobuf(demo_pb2.UserMessage(uid="1", demo_message={"earth": "e"}))  # type: ignore
+        assert instance.demo_message.earth == "e"
+
+    def test_lazy_model_schema(self) -> None:
+        eager_model = msg_to_pydantic_model(demo_pb2.NestedMessage, parse_msg_desc_method="ignore", use_cache=False)
+        for method in ("schema", "schema_json"):
+            model = msg_to_pydantic_model(
+                demo_pb2.NestedMessage, parse_msg_desc_method="ignore", lazy=True, use_cache=False
+            )
+            assert "_lazy_resolver" in model.__dict__
+            assert getattr(model, method)() == getattr(eager_model, method)()
+            assert "_lazy_resolver" not in model.__dict__
+
+        model = msg_to_pydantic_model(
+            demo_pb2.NestedMessage, parse_msg_desc_method="ignore", lazy=True, use_cache=False
+        )
+        # The model is resolved on the first access of `__fields__`
+        assert model.__fields__["user_pay"].type_.__name__ == "UserPayMessage"
+        assert "_lazy_resolver" not in model.__dict__
+        assert model.__fields__ is model.__dict__["__fields__"]
+
+    def test_lazy_import_schema(self) -> None:
+        class Demo(BaseModel):
+            info: "CacheInfo"  # type: ignore[name-defined]  # noqa: F821
+
+        assert Demo.__fields__["info"].type_.__class__.__name__ == "ForwardRef"
+        set_lazy_import(Demo, None, {"CacheInfo": "protobuf_to_pydantic.util"})
+        assert Demo.schema()["properties"]["info"]["title"] == "Info"
+        assert Demo.__fields__["info"].type_.__name__ == "CacheInfo"
+
+    def test_lazy_param_in_cache_key(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore")
+        assert msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", lazy=True) is not model
+
+
+class TestEnumCache:
+    def setup_method(self) -> None:
+        clear_model_cache()
+
+    def teardown_method(self) -> None:
+        clear_model_cache()
+
+    def test_enum_class_shared_by_models(self) -> None:
+        user_model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore")
+        other_user_model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", local_dict={})
+        map_model = msg_to_pydantic_model(demo_pb2.MapMessage, parse_msg_desc_method="ignore")
+        sex_enum = user_model.__fields__["sex"].type_
+        assert other_user_model.__fields__["sex"].type_ is sex_enum
+        assert map_model.__fields__["user_map"].type_.__fields__["sex"].type_ is sex_enum
+        assert sex_enum.__name__ == "SexType"
+        # The model that does not use the model cache does not share the enum classes
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", use_cache=False)
+        assert model.__fields__["demo"].type_ is not user_model.__fields__["demo"].type_
+        assert model.__fields__["demo"].type_.__name__ == "ExampleExampleProtoCommonSingleDemoEnum"
+
+    def test_clear_enum_cache(self) -> None:
+        sex_enum = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore").__fields__["sex"].type_
+        clear_model_cache()
+        model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore")
+        assert model.__fields__["sex"].type_ is not sex_enum
+
+    def test_count_created_enum_class(self) -> None:
+        model_list = [
+            msg_to_pydantic_model(message, parse_msg_desc_method="ignore")
+            for message in (
+                demo_pb2.UserMessage,
+                demo_pb2.MapMessage,
+                demo_pb2.RepeatedMessage,
+                demo_pb2.NestedMessage,
+                demo_pb2.AfterReferMessage,
+            )
+        ]
+        enum_class_dict: Dict[str, Set[type]] = {}
+
+        def _collect_enum_class(model: Type[BaseModel]) -> None:
+            for field in model.__fields__.values():
+                for type_ in [field.type_, *(sub_field.type_ for sub_field in field.sub_fields or [])]:
+                    if inspect.isclass(type_) and issubclass(type_, IntEnum):
+                        enum_class_dict.setdefault(type_.__name__, set()).add(type_)
+                    elif inspect.isclass(type_) and issubclass(type_, BaseModel):
+                        _collect_enum_class(type_)
+
+        for model in model_list:
+            _collect_enum_class(model)
+        assert set(enum_class_dict.keys()) == {"SexType", "ExampleExampleProtoCommonSingleDemoEnum", "IncludeEnum"}
+        # Each protobuf enum maps to exactly one enum class
+        assert all(len(enum_class_set) == 1 for enum_class_set in enum_class_dict.values())
+
+    def test_gen_code_of_shared_nested_enum(self) -> None:
+        file_descriptor_proto = descriptor_pb2.FileDescriptorProto(
+            name="enum_cache.proto", package="enum_cache", syntax="proto3"
+        )
+        a_message = file_descriptor_proto.message_type.add(name="A")
+        status_enum = a_message.enum_type.add(name="Status")
+        status_enum.value.add(name="ZERO", number=0)
+        status_enum.value.add(name="ONE", number=1)
+        for message in (a_message, file_descriptor_proto.message_type.add(name="B")):
+            message.field.add(
+                name="status",
+                number=1,
+                type=descriptor_pb2.FieldDescriptorProto.TYPE_ENUM,
+                type_name=".enum_cache.A.Status",
+            )
+        pool = DescriptorPool()
+        pool.Add(file_descriptor_proto)
+        a_model = msg_to_pydantic_model(pool.FindMessageTypeByName("enum_cache.A"), parse_msg_desc_method="ignore")
+        b_model = msg_to_pydantic_model(pool.FindMessageTypeByName("enum_cache.B"), parse_msg_desc_method="ignore")
+        assert b_model.__fields__["status"].type_ is a_model.__fields__["status"].type_
+        # The nested enum of other message is generated as a module-level class
+        module_dict: dict = {}
+        exec(pydantic_model_to_py_code(b_model), module_dict)
+        assert module_dict["B"](status=1).status == module_dict["Status"].ONE
+
+    def test_enum_name_not_depend_on_use_order(self) -> None:
+        pool = DescriptorPool()
+        a_file_proto = descriptor_pb2.FileDescriptorProto(
+            name="enum_name/a.proto", package="enum_name", syntax="proto3"
+        )
+        a_file_proto.enum_type.add(name="E").value.add(name="ZERO", number=0)
+        b_file_proto = descriptor_pb2.FileDescriptorProto(
+            name="enum_name/b.proto", package="enum_name", syntax="proto3", dependency=["enum_name/a.proto"]
+        )
+        for file_proto, message_name in ((a_file_proto, "A"), (b_file_proto, "B")):
+            file_proto.message_type.add(name=message_name).field.add(
+                name="e", number=1, type=descriptor_pb2.FieldDescriptorProto.TYPE_ENUM, type_name=".enum_name.E"
+            )
+            pool.Add(file_proto)
+
+        enum_dict: Dict[str, Tuple[str, str]] = {}
+        for message_name_list in (["A", "B"], ["B", "A"]):
+            clear_model_cache()
+            for message_name in message_name_list:
+                model = msg_to_pydantic_model(
+                    pool.FindMessageTypeByName(f"enum_name.{message_name}"), parse_msg_desc_method="ignore"
+                )
+                enum_class = model.__fields__["e"].type_
+                assert enum_dict.setdefault(message_name, (enum_class.__name__, enum_class.__doc__)) == (
+                    enum_class.__name__,
+                    enum_class.__doc__,
+                )
+        assert enum_dict["A"][0] == "E"
+        assert enum_dict["B"][0] == "EnumNameAE"
+        assert "does not belong to the package" in enum_dict["B"][1]
+
+    def test_enum_cache_is_bounded(self) -> None:
+        assert _enum_cache.info().maxsize == 1024
+        try:
+            _enum_cache.set_maxsize(2)
+            for index in range(4):
+                # Each pool has its own enum descriptor, the enum classes of the old pools should be evicted
+                file_proto = descriptor_pb2.FileDescriptorProto(
+                    name=f"enum_bounded_{index}.proto", package="enum_bounded", syntax="proto3"
+                )
+                file_proto.enum_type.add(name="E").value.add(name="ZERO", number=0)
+                file_proto.message_type.add(name="A").field.add(
+                    name="e", number=1, type=descriptor_pb2.FieldDescriptorProto.TYPE_ENUM, type_name=".enum_bounded.E"
+                )
+                pool = DescriptorPool()
+                pool.Add(file_proto)
+                msg_to_pydantic_model(pool.FindMessageTypeByName("enum_bounded.A"), parse_msg_desc_method="ignore")
+                assert len(_enum_cache) == min(index + 1, 2)
+        finally:
+            _enum_cache.set_maxsize(1024)
+
+
+class TestLRUCache:
+    def test_lru_eviction(self) -> None:
+        cache: LRUCache[int] = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.info() == (1, 0, 2, 2)
+
+    def test_setdefault(self) -> None:
+        cache: LRUCache[int] = LRUCache(maxsize=None)
+        assert cache.setdefault("a", 1) == 1
+        assert cache.setdefault("a", 2) == 1
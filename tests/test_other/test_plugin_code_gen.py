@@ -0,0 +1,171 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from google.protobuf import __version__
+from google.protobuf.compiler.plugin_pb2 import CodeGeneratorRequest, CodeGeneratorResponse
+from google.protobuf.descriptor_pb2 import FileDescriptorProto
+
+if __version__ > "4.0.0":
+    from example.proto.example.example_proto.demo import demo_pb2
+else:
+    from example.proto_3_20.example.example_proto.demo import demo_pb2  # type: ignore[no-redef]
+
+project_path: str = str(Path(__file__).parent.parent.parent)
+
+
+def gen_request(file_descriptor: Any, parameter: str = "") -> CodeGeneratorRequest:
+    """Generate the request of protoc plugin, the dependencies are placed before the file"""
+    fd_dict: Dict[str, FileDescriptorProto] = {}
+
+    def _add_file(_file_descriptor: Any) -> None:
+        if _file_descriptor.name in fd_dict:
+            return
+        for dependency in _file_descriptor.dependencies:
+            _add_file(dependency)
+        fd = FileDescriptorProto()
+        _file_descriptor.CopyToProto(fd)
+        fd_dict[fd.name] = fd
+
+    _add_file(file_descriptor)
+    request = CodeGeneratorRequest(parameter=parameter, file_to_generate=[file_descriptor.name])
+    request.proto_file.extend(fd_dict.values())
+    return request
+
+
+def run_code_gen(request: CodeGeneratorRequest, cwd: Optional[str] = None) -> CodeGeneratorResponse:
+    """Run the plugin in a subprocess like protoc
+    (the protos of plugin can not be imported together with the protos of example)"""
+    env: dict = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([project_path, env.get("PYTHONPATH", "")])
+    output: bytes = subprocess.run(
+        [sys.executable, "-m", "protobuf_to_pydantic.plugin"],
+        input=request.SerializeToString(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        cwd=cwd,
+        check=True,
+    ).stdout
+    response = CodeGeneratorResponse()
+    response.ParseFromString(output)
+    return response
+
+
+class TestCodeGenCache:
+    def test_cache_dir(self, tmp_path: Path) -> None:
+        no_cache_response = run_code_gen(gen_request(demo_pb2.DESCRIPTOR))
+        request = gen_request(demo_pb2.DESCRIPTOR, parameter=f"cache_dir={tmp_path}")
+        response = run_code_gen(request)
+        assert response == no_cache_response
+        cache_file_list: List[Path] = list(tmp_path.iterdir())
+        assert len(cache_file_list) == 1
+
+        # Read from cache
+        cache_file_list[0].write_text("# cache content")
+        response = run_code_gen(request)
+        assert response.file[0].content == "# cache content"
+
+        # The change of dependency will invalidate the cache
+        for fd in request.proto_file:
+            if fd.name.endswith("single.proto"):
+                fd.message_type[0].field[0].name = "new_name"
+        response = run_code_gen(request)
+        assert response.file[0].content == no_cache_response.file[0].content
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_cache_key_ignore_param(self, tmp_path: Path) -> None:
+        request = gen_request(demo_pb2.DESCRIPTOR, parameter=f"cache_dir={tmp_path}")
+        run_code_gen(request)
+        cache_file_list: List[Path] = list(tmp_path.iterdir())
+        cache_file_list[0].write_text("# cache content")
+
+        # The parameters that do not affect the generated content will still hit the cache
+        request.parameter = f"workers=2,cache_dir={tmp_path}"
+        response = run_code_gen(request)
+        assert response.file[0].content == "# cache content"
+        assert len(list(tmp_path.iterdir())) == 1
+
+
+class TestCodeGenWorkers:
+    def test_workers(self) -> None:
+        request = gen_request(demo_pb2.DESCRIPTOR)
+        # Generate all the files in the request
+        request.file_to_generate.extend([i.name for i in request.proto_file if not i.name.startswith("google")][:-1])
+        response = run_code_gen(request)
+        assert len(response.file) == 2
+
+        request.parameter = "workers=2"
+        assert run_code_gen(request) == response
+
+
+class TestCodeGenComment:
+    def test_parse_comment(self, tmp_path: Path) -> None:
+        from tests.test_other.test_source_code_info import gen_file_descriptor_proto
+
+        request = gen_request(demo_pb2.DESCRIPTOR)
+        for index, fd in enumerate(request.proto_file):
+            if fd.name == demo_pb2.DESCRIPTOR.name:
+                request.proto_file[index].CopyFrom(gen_file_descriptor_proto())
+        # The comments are not parsed by default
+        content: str = run_code_gen(request).file[0].content
+        assert 'uid: str = Field(default="")' in content
+
+        # The config module needs to be imported through the work dir
+        config_file = tmp_path / "comment_config.py"
+        config_file.write_text("parse_comment = True\n")
+        request.parameter = f"config_path={config_file}"
+        content = run_code_gen(request, cwd=str(tmp_path)).file[0].content
+        assert 'uid: str = Field(default="", example="10086", title="UID")' in content
+        assert "age: int = Field(default=0, ge=0)" in content
+        assert 'bank_number: str = Field(default="", title="bank number")' in content
+
+
+class TestCodeGenLazyImport:
+    def test_lazy_import(self, tmp_path: Path) -> None:
+        request = gen_request(demo_pb2.DESCRIPTOR)
+        request.file_to_generate.extend(
+            [i.name for i in demo_pb2.DESCRIPTOR.dependencies if not i.name.startswith("google")]
+        )
+        config_file = tmp_path / "lazy_import_config.py"
+        config_file.write_text("lazy_import = True\n")
+        request.parameter = f"config_path={config_file}"
+        content_dict: Dict[str, str] = {
+            file.name: file.content for file in run_code_gen(request, cwd=str(tmp_path)).file
+        }
+        assert sorted(content_dict) == [
+            "example/example_proto/common/__init__.py",
+            "example/example_proto/common/single_p2p.py",
+            "example/example_proto/demo/__init__.py",
+            "example/example_proto/demo/demo_p2p.py",
+        ]
+        demo_content: str = content_dict["example/example_proto/demo/demo_p2p.py"]
+        assert "from ..common.single_p2p import" not in demo_content
+        assert 'demo_message: "DemoMessage" = Field()' in demo_content
+        assert (
+            'set_lazy_import(UserMessage, __package__, {"DemoEnum": "..common.single_p2p",'
+            ' "DemoMessage": "..common.single_p2p"})'
+        ) in demo_content
+        assert '"UserMessage": ".demo_p2p",' in content_dict["example/example_proto/demo/__init__.py"]
+
+        # The models are only imported when they are used
+        for file_name, content in content_dict.items():
+            file_path: Path = tmp_path / "lazy_import_example" / file_name
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(content)
+        sys.path.insert(0, str(tmp_path))
+        try:
+            from lazy_import_example.example.example_proto import demo  # type: ignore
+
+            assert "lazy_import_example.example.example_proto.demo.demo_p2p" not in sys.modules
+            user_model: Any = demo.UserMessage
+            assert "lazy_import_example.example.example_proto.common.single_p2p" not in sys.modules
+            user = user_model(demo_message={"earth": "e"}, demo=1)
+            assert user.demo_message.earth == "e"
+            assert "lazy_import_example.example.example_proto.common.single_p2p" in sys.modules
+        finally:
+            sys.path.remove(str(tmp_path))
+            for module_name in [i for i in sys.modules if i.startswith("lazy_import_example")]:
+                sys.modules.pop(module_name)
@@ -0,0 +1,160 @@
+from typing import Any, List, Set
+
+import pytest
+from google.protobuf import __version__, descriptor_pb2
+
+if __version__ > "4.0.0":
+    from example.proto.example.example_proto.common import validate_pb2
+    from example.proto.example.example_proto.demo import demo_pb2
+else:
+    from example.proto_3_20.example.example_proto.common import validate_pb2  # type: ignore[no-redef]
+    from example.proto_3_20.example.example_proto.demo import demo_pb2  # type: ignore[no-redef]
+
+from protobuf_to_pydantic import gen_model, msg_to_pydantic_model, pool_to_pydantic_models
+from protobuf_to_pydantic.get_desc import get_desc_from_file_descriptor_proto
+from protobuf_to_pydantic.grpc_types import Descriptor, FileDescriptorSet, get_default_descriptor_pool
+
+
+def _gen_file_descriptor_set(file_descriptor: Descriptor) -> FileDescriptorSet:
+    file_descriptor_set: FileDescriptorSet = descriptor_pb2.FileDescriptorSet()
+    file_name_set: Set[str] = set()
+
+    def _add_file(_file_descriptor: Descriptor) -> None:
+        if _file_descriptor.name in file_name_set:
+            return
+        file_name_set.add(_file_descriptor.name)
+        for dependency in _file_descriptor.dependencies:
+            _add_file(dependency)
+        _file_descriptor.CopyToProto(file_descriptor_set.file.add())
+
+    _add_file(file_descriptor)
+    return file_descriptor_set
+
+
+def _gen_circular_file_descriptor_set(
+    a_list_label: int = descriptor_pb2.FieldDescriptorProto.LABEL_REPEATED,
+) -> FileDescriptorSet:
+    field_descriptor_proto = descriptor_pb2.FieldDescriptorProto
+    file_descriptor_set: FileDescriptorSet = descriptor_pb2.FileDescriptorSet()
+    file_descriptor_proto = file_descriptor_set.file.add(name="circular.proto", package="circular", syntax="proto3")
+    a_message = file_descriptor_proto.message_type.add(name="A")
+    a_message.field.add(name="b", number=1, type=field_descriptor_proto.TYPE_MESSAGE, type_name=".circular.B")
+    a_message.field.add(name="name", number=2, type=field_descriptor_proto.TYPE_STRING)
+    b_message = file_descriptor_proto.message_type.add(name="B")
+    b_message.field.add(
+        name="a_list",
+        number=1,
+        type=field_descriptor_proto.TYPE_MESSAGE,
+        type_name=".circular.A",
+        label=a_list_label,
+    )
+    b_message.field.add(name="node", number=2, type=field_descriptor_proto.TYPE_MESSAGE, type_name=".circular.B.Node")
+    # The nested message references the message that contains it
+    b_message.nested_type.add(name="Node").field.add(
+        name="parent",
+        number=1,
+        type=field_descriptor_proto.TYPE_MESSAGE,
+        type_name=".circular.B",
+        label=field_descriptor_proto.LABEL_REPEATED,
+    )
+    return file_descriptor_set
+
+
+class TestPoolToPydanticModels:
+    def test_file_descriptor_set(self) -> None:
+        registry = pool_to_pydantic_models(
+            _gen_file_descriptor_set(demo_pb2.DESCRIPTOR), packages=["user"], parse_msg_desc_method="ignore"
+        )
+        assert "user.NestedMessage" in registry
+        assert "user.NestedMessage.UserPayMessage" in registry
+        # The referenced message of other package is also created
+        assert "single.DemoMessage" in registry
+        assert "google.protobuf.Timestamp" not in registry
+
+        user_model = registry["user.UserMessage"]
+        # Each message is only created once and shared by the models that reference it
+        assert registry["user.RepeatedMessage"].__fields__["user_list"].type_ is user_model
+        assert registry["user.MapMessage"].__fields__["user_map"].type_ is user_model
+        assert user_model.__fields__["demo_message"].type_ is registry["single.DemoMessage"]
+        assert (
+            registry["user.NestedMessage"].__fields__["user_pay"].type_ is registry["user.NestedMessage.UserPayMessage"]
+        )
+
+        message = demo_pb2.UserMessage(uid="1", demo_message={"earth": "e"})
+        assert (
+            user_model.from_protobuf(message, validate=False).dict()  # type: ignore[attr-defined]
+            == msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method="ignore", use_cache=False)
+            .from_protobuf(message, validate=False)  # type: ignore[attr-defined]
+            .dict()
+        )
+
+    def test_circular_reference(self) -> None:
+        registry = pool_to_pydantic_models(_gen_circular_file_descriptor_set(), parse_msg_desc_method="ignore")
+        assert list(registry) == ["circular.B.Node", "circular.B", "circular.A"]
+        a_model = registry["circular.A"]
+        b_model = registry["circular.B"]
+        assert a_model.__fields__["b"].type_ is b_model
+        assert b_model.__fields__["a_list"].type_ is a_model
+        assert b_model.__fields__["node"].type_ is registry["circular.B.Node"]
+        assert registry["circular.B.Node"].__fields__["parent"].type_ is b_model
+
+        instance = a_model(
+            name="x", b={"a_list": [{"name": "y", "b": {"a_list": [], "node": {"parent": []}}}], "node": {"parent": []}}
+        )
+        assert isinstance(instance.b.a_list[0], a_model)
+        assert instance.b.a_list[0].name == "y"
+
+    def test_mutual_recursion(self) -> None:
+        # The desc of messages is parsed from the Options of Message(the default `parse_msg_desc_method`)
+        registry = pool_to_pydantic_models(
+            _gen_circular_file_descriptor_set(a_list_label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL)
+        )
+        a_model = registry["circular.A"]
+        b_model = registry["circular.B"]
+        assert a_model.__fields__["b"].type_ is b_model
+        assert b_model.__fields__["a_list"].type_ is a_model
+        assert set(a_model.schema()["definitions"]) == {"B", "A", "Node"}
+
+        registry = pool_to_pydantic_models(_gen_circular_file_descriptor_set())
+        assert registry["circular.B"].__fields__["a_list"].type_ is registry["circular.A"]
+
+    def test_mutual_recursion_of_include_imports(self) -> None:
+        # Same as `protoc --include_imports`, descriptor.proto is included,
+        # and the rules of validate.proto reference each other
+        registry = pool_to_pydantic_models(_gen_file_descriptor_set(validate_pb2.DESCRIPTOR))
+        assert "google.protobuf.DescriptorProto" in registry
+        field_rules_model = registry["validate.FieldRules"]
+        repeated_rules_model = registry["validate.RepeatedRules"]
+        assert field_rules_model.__fields__["repeated"].type_ is repeated_rules_model
+        assert repeated_rules_model.__fields__["items"].type_ is field_rules_model
+
+    def test_parse_source_code_info_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        file_descriptor_set = _gen_circular_file_descriptor_set()
+        # A.name
+        file_descriptor_set.file[0].source_code_info.location.add(
+            path=[4, 0, 2, 1], leading_comments=' p2p: {"min_length": 1}'
+        )
+        call_list: List[str] = []
+
+        def _get_desc_from_file_descriptor_proto(fd: Any, comment_prefix: str) -> Any:
+            call_list.append(fd.name)
+            return get_desc_from_file_descriptor_proto(fd, comment_prefix)
+
+        monkeypatch.setattr(gen_model, "get_desc_from_file_descriptor_proto", _get_desc_from_file_descriptor_proto)
+        registry = pool_to_pydantic_models(file_descriptor_set, parse_msg_desc_method=file_descriptor_set)
+        assert call_list == ["circular.proto"]
+        assert registry["circular.A"].__fields__["name"].field_info.min_length == 1
+
+    def test_descriptor_pool(self) -> None:
+        with pytest.raises(ValueError):
+            pool_to_pydantic_models(get_default_descriptor_pool())
+
+        registry = pool_to_pydantic_models(
+            get_default_descriptor_pool(), file_names=[demo_pb2.DESCRIPTOR.name], parse_msg_desc_method="ignore"
+        )
+        assert registry.pool is get_default_descriptor_pool()
+        assert "user.InvoiceItem" in registry
+
+    def test_msg_to_pydantic_model_by_descriptor(self) -> None:
+        model = msg_to_pydantic_model(demo_pb2.UserMessage.DESCRIPTOR, parse_msg_desc_method="ignore", use_cache=False)
+        assert model.__name__ == "UserMessage"
@@ -0,0 +1,70 @@
+import os
+from pathlib import Path
+
+from protobuf_to_pydantic.contrib.proto_parser import get_parser, parse_from_file
+from protobuf_to_pydantic.get_desc import from_proto_file, get_desc_from_proto_file, preload_proto_dir
+
+proto_content: str = """syntax = "proto3";
+package demo;
+
+message Demo {
+  // p2p: {"title": "UID"}
+  string uid = 1;
+}
+"""
+
+
+def _touch(file: Path, content: str) -> None:
+    # Make sure the mtime is changed even if the file system has a coarse timestamp
+    stat = file.stat()
+    file.write_text(content)
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestProtoParser:
+    def test_get_parser(self) -> None:
+        assert get_parser() is get_parser()
+
+    def test_parse_from_file_cache(self, tmp_path: Path) -> None:
+        proto_file = tmp_path / "demo.proto"
+        proto_file.write_text(proto_content)
+        result = parse_from_file(str(proto_file))
+        assert result is not None
+        assert list(result.messages) == ["Demo"]
+        assert parse_from_file(str(proto_file)) is result
+
+        _touch(proto_file, proto_content.replace("Demo", "NewDemo"))
+        new_result = parse_from_file(str(proto_file))
+        assert new_result is not result
+        assert new_result is not None
+        assert list(new_result.messages) == ["NewDemo"]
+
+    def test_get_desc_from_proto_file_cache(self, tmp_path: Path) -> None:
+        proto_file = tmp_path / "demo.proto"
+        proto_file.write_text(proto_content)
+        desc_dict = get_desc_from_proto_file(str(proto_file), "p2p")
+        assert desc_dict["Demo"]["message"]["uid"] == {"title": "UID"}
+        assert get_desc_from_proto_file(str(proto_file), "p2p") is desc_dict
+        # The comment prefix is a part of the cache key
+        assert get_desc_from_proto_file(str(proto_file), "other")["Demo"]["message"]["uid"] == {}
+
+        _touch(proto_file, proto_content.replace("UID", "User ID"))
+        assert get_desc_from_proto_file(str(proto_file), "p2p")["Demo"]["message"]["uid"] == {"title": "User ID"}
+
+
+class TestPreloadProtoDir:
+    def test_preload_proto_dir(self, tmp_path: Path) -> None:
+        (tmp_path / "a").mkdir()
+        (tmp_path / "demo.proto").write_text(proto_content)
+        (tmp_path / "a" / "demo.proto").write_text(proto_content.replace("UID", "A UID"))
+        (tmp_path / "a" / "broken.proto").write_text('syntax = "proto2";')
+        (tmp_path / "a" / "demo.txt").write_text(proto_content)
+
+        for workers in (2, 1):
+            from_proto_file._filename_desc_dict.clear()
+            result_dict = preload_proto_dir(str(tmp_path), workers=workers)
+            # The key is the same as the filename used by `M2P`
+            assert sorted(result_dict) == [f"{tmp_path}/a/demo.proto", f"{tmp_path}/demo.proto"]
+            assert result_dict[f"{tmp_path}/a/demo.proto"]["Demo"]["message"]["uid"] == {"title": "A UID"}
+            for filename, desc_dict in result_dict.items():
+                assert get_desc_from_proto_file(filename, "p2p") is desc_dict
@@ -0,0 +1,50 @@
+from google.protobuf import __version__
+from google.protobuf.descriptor_pb2 import FileDescriptorProto, FileDescriptorSet
+
+from protobuf_to_pydantic import msg_to_pydantic_model
+from protobuf_to_pydantic.get_desc import get_desc_from_file_descriptor_proto
+
+if __version__ > "4.0.0":
+    from example.proto.example.example_proto.demo import demo_pb2
+else:
+    from example.proto_3_20.example.example_proto.demo import demo_pb2  # type: ignore[no-redef]
+
+
+def gen_file_descriptor_proto() -> FileDescriptorProto:
+    """Generate the FileDescriptorProto of demo.proto with the `SourceCodeInfo` like protoc"""
+    fd = FileDescriptorProto()
+    demo_pb2.DESCRIPTOR.CopyToProto(fd)
+    message_index_dict = {message.name: index for index, message in enumerate(fd.message_type)}
+    # UserMessage.uid
+    location = fd.source_code_info.location.add(path=[4, message_index_dict["UserMessage"], 2, 0])
+    location.leading_comments = ' p2p: {"title": "UID"}\n p2p: {"example": "10086"}\n'
+    # UserMessage.age
+    location = fd.source_code_info.location.add(path=[4, message_index_dict["UserMessage"], 2, 1])
+    location.trailing_comments = ' p2p: {"ge": 0}\n'
+    # NestedMessage.UserPayMessage.bank_number
+    location = fd.source_code_info.location.add(path=[4, message_index_dict["NestedMessage"], 3, 0, 2, 0])
+    location.leading_comments = ' p2p: {"title": "bank number"}\n'
+    return fd
+
+
+class TestSourceCodeInfo:
+    def test_get_desc_from_file_descriptor_proto(self) -> None:
+        desc_dict = get_desc_from_file_descriptor_proto(gen_file_descriptor_proto(), "p2p")
+        assert desc_dict["UserMessage"]["message"]["uid"] == {"title": "UID", "example": "10086"}
+        assert desc_dict["UserMessage"]["message"]["age"] == {"ge": 0}
+        assert desc_dict["UserMessage"]["message"]["height"] == {}
+        assert desc_dict["NestedMessage"]["nested"]["UserPayMessage"]["message"]["bank_number"] == {  # type: ignore
+            "title": "bank number"
+        }
+
+    def test_msg_to_pydantic_model(self) -> None:
+        fd = gen_file_descriptor_proto()
+        for parse_msg_desc_method in (fd, FileDescriptorSet(file=[fd])):
+            model = msg_to_pydantic_model(demo_pb2.UserMessage, parse_msg_desc_method=parse_msg_desc_method)
+            assert model.__fields__["uid"].field_info.title == "UID"
+            assert model.__fields__["uid"].field_info.extra["example"] == "10086"
+            assert model.__fields__["age"].field_info.ge == 0
+
+            model = msg_to_pydantic_model(demo_pb2.NestedMessage, parse_msg_desc_method=parse_msg_desc_method)
+            user_pay_model = model.__fields__["user_pay"].type_
+            assert user_pay_model.__fields__["bank_number"].field_info.title == "bank number"